@@ -1,8 +1,10 @@
-from wtforms import Form, PasswordField, StringField
-from wtforms.validators import InputRequired
+from wtforms import Form, IntegerField, PasswordField, StringField
+from wtforms.validators import InputRequired, NumberRange
 
 
 class SiteCreateForm(Form):
     address = StringField("Address", validators=[InputRequired()])
     username = StringField("Wp Username", validators=[InputRequired()])
     password = PasswordField("Wp Password", validators=[InputRequired()])
+    min_connections_limit = IntegerField("Min connections", default=1, validators=[NumberRange(min=1)])
+    max_connections_limit = IntegerField("Max connections", default=5, validators=[NumberRange(min=1)])
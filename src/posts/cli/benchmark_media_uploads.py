@@ -0,0 +1,145 @@
+import argparse
+import asyncio
+import multiprocessing
+import os
+import resource
+import tempfile
+import time
+
+import aiofiles
+import uvicorn
+from fastapi import FastAPI, Request
+
+from posts.cli.benchmark_wordpress_clients import free_port, wait_for_server
+from posts.dto.site import Site
+from posts.services.wordpress_service.clients import WordpressClients
+from posts.services.wordpress_service.config import WordpressClientsConfig
+from posts.services.wordpress_service.retry import RetryPolicy
+from posts.services.wordpress_service.service import WordpressService
+
+
+def create_fake_wordpress() -> FastAPI:
+    """Медиатеки нескольких WordPress сайтов на одном сервере: сайт определяется первым сегментом пути."""
+    app = FastAPI()
+
+    @app.post("/{site}/wp-json/wp/v2/media", status_code=201)
+    async def media(site: str, request: Request):
+        async for _ in request.stream():
+            pass
+        return {"id": 1}
+
+    return app
+
+
+def serve(port: int) -> None:
+    uvicorn.run(create_fake_wordpress(), host="127.0.0.1", port=port, log_level="warning")
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss в Linux - в килобайтах
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+async def upload_images(mode: str, port: int, paths: list[str], n_sites: int, concurrency: int) -> tuple:
+    """
+    Загружает каждое изображение на каждый сайт, по concurrency одновременных загрузок на сайт.
+    mode bytes - изображение читается в память, stream - отправляется потоком из файла.
+    Возвращает пиковый RSS процесса до и после загрузок и количество загрузок в секунду.
+    """
+    config = WordpressClientsConfig()
+    clients = WordpressClients(config)
+    wordpress_service = WordpressService(
+        clients=clients,
+        retry_policy=RetryPolicy(
+            attempts=config.WORDPRESS_RETRY_ATTEMPTS,
+            base_delay=config.WORDPRESS_RETRY_BASE_DELAY,
+            max_delay=config.WORDPRESS_RETRY_MAX_DELAY,
+        ),
+    )
+    sites = [
+        Site(
+            id=i,
+            username="benchmark",
+            password="benchmark",
+            address=f"http://127.0.0.1:{port}/site{i}",
+            max_connections_limit=concurrency,
+            min_connections_limit=concurrency,
+        )
+        for i in range(n_sites)
+    ]
+
+    async def upload(site: Site, path: str) -> None:
+        async with wordpress_service.limiter(site):
+            if mode == "bytes":
+                async with aiofiles.open(path, "rb") as file:
+                    image = await file.read()
+                result = await wordpress_service.send_post_image(site, os.path.basename(path), image, "benchmark")
+            else:
+                image = await asyncio.to_thread(open, path, "rb")
+                try:
+                    result = await wordpress_service.send_post_image(site, os.path.basename(path), image, "benchmark")
+                finally:
+                    image.close()
+        if not result.success:
+            raise RuntimeError(result.error_message)
+
+    baseline = peak_rss_mb()
+    try:
+        start = time.perf_counter()
+        await asyncio.gather(*(upload(site, path) for site in sites for path in paths))
+        elapsed = time.perf_counter() - start
+    finally:
+        await clients.aclose()
+
+    return baseline, peak_rss_mb(), len(sites) * len(paths) / elapsed
+
+
+def measure(mode: str, port: int, paths: list[str], n_sites: int, concurrency: int, results) -> None:
+    results.put(asyncio.run(upload_images(mode, port, paths, n_sites, concurrency)))
+
+
+async def main():
+    parser = argparse.ArgumentParser(
+        description="Пиковая память процесса при загрузке изображений на локальный фейковый WordPress: "
+        "изображения в памяти против потоковой загрузки из файлов"
+    )
+    parser.add_argument("--sites", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=10, help="одновременных загрузок на сайт")
+    parser.add_argument("--images", type=int, default=20)
+    parser.add_argument("--image-kb", type=int, default=1024)
+    args = parser.parse_args()
+
+    port = free_port()
+    server = multiprocessing.Process(target=serve, args=(port,), daemon=True)
+    server.start()
+    # каждый режим измеряется в отдельном процессе: ru_maxrss - пик за всё время жизни процесса
+    context = multiprocessing.get_context("spawn")
+    try:
+        await wait_for_server(port)
+        with tempfile.TemporaryDirectory() as images_dir:
+            paths = []
+            for i in range(args.images):
+                path = os.path.join(images_dir, f"{i}.jpg")
+                with open(path, "wb") as file:
+                    file.write(os.urandom(args.image_kb * 1024))
+                paths.append(path)
+
+            for mode in ("bytes", "stream"):
+                results = context.Queue()
+                process = context.Process(
+                    target=measure, args=(mode, port, paths, args.sites, args.concurrency, results)
+                )
+                process.start()
+                baseline, peak, uploads_per_sec = await asyncio.to_thread(results.get)
+                process.join()
+                print(
+                    f"{mode}: peak RSS {peak:.0f} MB (+{peak - baseline:.0f} MB over {baseline:.0f} MB), "
+                    f"{uploads_per_sec:.0f} uploads/sec"
+                )
+    finally:
+        server.terminate()
+        server.join()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
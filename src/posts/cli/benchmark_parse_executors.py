@@ -0,0 +1,70 @@
+import argparse
+import asyncio
+import glob
+import os
+import time
+
+from posts.usecases.posts.parsing.config import ParseConfig
+from posts.usecases.posts.parsing.executor import (
+    create_parser_executor,
+    get_parse_batch,
+    warm_up_executor,
+)
+
+
+def load_htmls(data_dir: str, n_files: int) -> list[str]:
+    paths = sorted(glob.glob(os.path.join(data_dir, "*.htm*")))
+    if not paths:
+        raise ValueError(f"no html files in '{data_dir}'")
+
+    htmls = []
+    for path in paths:
+        with open(path, encoding="utf-8", errors="ignore") as f:
+            htmls.append(f.read())
+
+    return [htmls[i % len(htmls)] for i in range(n_files)]
+
+
+async def run_benchmark(config: ParseConfig, htmls: list[str]) -> float:
+    executor = create_parser_executor(config)
+    loop = asyncio.get_running_loop()
+    parse_batch = get_parse_batch(config)
+    try:
+        await warm_up_executor(executor, config)
+
+        chunk_size = config.PARSER_CHUNK_SIZE
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(
+                loop.run_in_executor(executor, parse_batch, htmls[i : i + chunk_size])
+                for i in range(0, len(htmls), chunk_size)
+            )
+        )
+        elapsed = time.perf_counter() - start
+    finally:
+        executor.shutdown(wait=True)
+
+    return len(htmls) / elapsed
+
+
+async def main():
+    parser = argparse.ArgumentParser(
+        description="Сравнение скорости парсинга HTML в пуле потоков и пуле процессов, bs4 и lxml"
+    )
+    parser.add_argument("--data-dir", default="../tests/data/articles")
+    parser.add_argument("--files", type=int, default=2000)
+    parser.add_argument("--chunk-size", type=int, default=ParseConfig().PARSER_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    htmls = load_htmls(args.data_dir, args.files)
+    print(f"Файлов: {len(htmls)}, ядер: {os.cpu_count()}")
+
+    for extractor in ("bs4", "lxml"):
+        for kind in ("threads", "processes"):
+            config = ParseConfig(PARSER_EXECUTOR=kind, PARSER_CHUNK_SIZE=args.chunk_size, HTML_EXTRACTOR=extractor)
+            files_per_sec = await run_benchmark(config, htmls)
+            print(f"{extractor}, {kind}: {files_per_sec:.1f} files/sec")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,52 @@
+import argparse
+import random
+import time
+import tracemalloc
+from array import array
+from collections.abc import Callable, Container
+
+from posts.usecases.posts.parsing.post_ids_index import PostIdsIndex
+
+
+def measure_memory(build: Callable[[], Container[int]]) -> tuple[Container[int], int]:
+    tracemalloc.start()
+    container = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return container, size
+
+
+def measure_lookup(container: Container[int], probes: list[int]) -> float:
+    start = time.perf_counter()
+    for post_id in probes:
+        post_id in container  # noqa: B015
+
+    return (time.perf_counter() - start) / len(probes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Память и скорость проверки id для list, set и PostIdsIndex")
+    parser.add_argument("--ids", type=int, default=1_000_000)
+    parser.add_argument("--probes", type=int, default=100_000)
+    parser.add_argument("--list-probes", type=int, default=200)
+    args = parser.parse_args()
+
+    # id в базе идут с пропусками, как после удаления постов. Исходные id хранятся в array,
+    # чтобы list и set создавали свои объекты int, как при загрузке из базы
+    ids = array("q", sorted(random.sample(range(args.ids * 2), args.ids)))
+    probes = [random.randrange(args.ids * 2) for _ in range(args.probes)]
+
+    print(f"id: {args.ids}")
+    for name, build, n_probes in (
+        ("list", lambda: list(ids), args.list_probes),
+        ("set", lambda: set(ids), args.probes),
+        ("PostIdsIndex", lambda: PostIdsIndex.from_ids(ids), args.probes),
+    ):
+        container, size = measure_memory(build)
+        lookup = measure_lookup(container, probes[:n_probes])
+        print(f"{name}: {size / args.ids:.1f} bytes/id, {lookup * 1e6:.2f} us/lookup")
+
+
+if __name__ == "__main__":
+    main()
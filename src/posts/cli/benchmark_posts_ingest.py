@@ -0,0 +1,100 @@
+import argparse
+import asyncio
+import time
+from datetime import datetime
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from posts.dto.parse_posts import ParsedPostDTO, ParsedPostTagDTO
+from posts.dto.post_tag_relation import PostTagRelation
+from posts.persistence.data_mappers.post_data_mapper import PostDataMapper
+from posts.persistence.data_mappers.tag_data_mapper import TagDataMapper
+from posts.persistence.db.db_config import DbConfig
+from posts.persistence.models import PostOrm
+
+
+def make_posts(first_id: int, n_posts: int, content_bytes: int, tags: list[ParsedPostTagDTO]) -> list[ParsedPostDTO]:
+    content = "x" * content_bytes
+    return [
+        ParsedPostDTO(
+            title=f"post {post_id}",
+            id=post_id,
+            description="description",
+            published=datetime(2015, 1, 1),
+            h1=f"post {post_id}",
+            image="/image.jpg",
+            content=content,
+            content2=content,
+            slug=f"post-{post_id}",
+            tags=tags,
+            active=True,
+        )
+        for post_id in range(first_id, first_id + n_posts)
+    ]
+
+
+async def ingest(session: AsyncSession, path: str, batches: list[list[ParsedPostDTO]], tags_dict: dict[str, int]):
+    post_data_mapper = PostDataMapper(session=session)
+    tag_data_mapper = TagDataMapper(session=session)
+
+    for batch in batches:
+        relations = [
+            PostTagRelation(post_id=post.id, tag_id=tags_dict[tag.slug]) for post in batch for tag in post.tags
+        ]
+        if path == "orm":
+            await post_data_mapper.bulk_save(batch)
+            await tag_data_mapper.bulk_save_post_relations(relations)
+            await session.flush()
+        else:
+            await post_data_mapper.bulk_insert(batch)
+            await tag_data_mapper.bulk_insert_post_relations(relations)
+
+
+async def run_benchmark(database_url: str, path: str, n_posts: int, batch_size: int, content_bytes: int) -> float:
+    """Вставляет посты и связи в транзакции, которая в конце откатывается. Возвращает строк в секунду."""
+    engine = create_async_engine(database_url)
+    try:
+        async with engine.connect() as connection:
+            transaction = await connection.begin()
+            session = AsyncSession(bind=connection, expire_on_commit=False)
+
+            tags = [ParsedPostTagDTO(slug=f"benchmark-tag-{i}", name=f"tag {i}") for i in range(3)]
+            tags_dict = {tag.slug: tag.id for tag in await TagDataMapper(session=session).bulk_upsert(tags)}
+
+            first_id = ((await session.execute(select(func.max(PostOrm.id)))).scalar() or 0) + 1
+            posts = make_posts(first_id, n_posts, content_bytes, tags)
+            batches = [posts[i : i + batch_size] for i in range(0, len(posts), batch_size)]
+
+            start = time.perf_counter()
+            await ingest(session, path, batches, tags_dict)
+            elapsed = time.perf_counter() - start
+
+            await session.close()
+            await transaction.rollback()
+    finally:
+        await engine.dispose()
+
+    return n_posts * (1 + len(tags)) / elapsed
+
+
+async def main():
+    parser = argparse.ArgumentParser(
+        description="Скорость вставки постов и связей с тегами: ORM против COPY (PostgreSQL) / Core insert. "
+        "Данные вставляются в транзакции, которая откатывается."
+    )
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--posts", type=int, default=20000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--content-bytes", type=int, default=20000)
+    args = parser.parse_args()
+
+    database_url = args.database_url or DbConfig().DATABASE_URL
+
+    for path in ("orm", "bulk_insert"):
+        rows_per_sec = await run_benchmark(database_url, path, args.posts, args.batch_size, args.content_bytes)
+        print(f"{path}: {rows_per_sec:.0f} rows/sec")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
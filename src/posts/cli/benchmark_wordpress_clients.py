@@ -0,0 +1,153 @@
+import argparse
+import asyncio
+import multiprocessing
+import socket
+import time
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from posts.dto.site import Site
+from posts.dto.wordpress_post import WordpressPostDTO
+from posts.services.wordpress_service.clients import WordpressClients
+from posts.services.wordpress_service.config import WordpressClientsConfig
+from posts.services.wordpress_service.retry import RetryPolicy
+from posts.services.wordpress_service.service import WordpressService
+
+
+def create_fake_wordpress(latency: float) -> FastAPI:
+    """Минимальный WordPress REST API: принимает посты, теги и изображения, отвечая через latency секунд."""
+    app = FastAPI()
+
+    @app.post("/wp-json/jwt-auth/v1/token")
+    async def token():
+        return {"token": "benchmark"}
+
+    @app.get("/wp-json/wp/v2/tags")
+    async def tags():
+        return []
+
+    @app.post("/wp-json/wp/v2/tags", status_code=201)
+    async def create_tag(request: Request):
+        data = await request.json()
+        await asyncio.sleep(latency)
+        return {"id": 1, "slug": data["slug"], "name": data["name"]}
+
+    @app.post("/wp-json/wp/v2/media", status_code=201)
+    async def media(request: Request):
+        await request.body()
+        await asyncio.sleep(latency)
+        return {"id": 1}
+
+    @app.post("/wp-json/wp/v2/posts")
+    async def posts(request: Request):
+        await request.json()
+        await asyncio.sleep(latency)
+        return JSONResponse(status_code=201, content={"id": 1})
+
+    return app
+
+
+def serve(port: int, latency: float) -> None:
+    uvicorn.run(create_fake_wordpress(latency), host="127.0.0.1", port=port, log_level="warning")
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def wait_for_server(port: int) -> None:
+    for _ in range(100):
+        try:
+            _, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.close()
+            await writer.wait_closed()
+            return
+        except OSError:
+            await asyncio.sleep(0.1)
+
+    raise RuntimeError("fake WordPress server did not start")
+
+
+async def run_benchmark(site: Site, pooled: bool, n_posts: int, image_bytes: int) -> float:
+    """
+    Отправляет n_posts постов с изображениями, ограничивая одновременные отправки окном AdaptiveLimiter сайта,
+    как PostsSender. Возвращает постов в секунду.
+    """
+    config = WordpressClientsConfig(WORDPRESS_POOLED_CLIENTS=pooled)
+    clients = WordpressClients(config)
+    wordpress_service = WordpressService(
+        clients=clients,
+        retry_policy=RetryPolicy(
+            attempts=config.WORDPRESS_RETRY_ATTEMPTS,
+            base_delay=config.WORDPRESS_RETRY_BASE_DELAY,
+            max_delay=config.WORDPRESS_RETRY_MAX_DELAY,
+        ),
+    )
+    image = b"x" * image_bytes
+
+    async def send(i: int) -> None:
+        async with wordpress_service.limiter(site):
+            image_result = await wordpress_service.send_post_image(site, f"{i}.jpg", image, access_token="benchmark")
+            post = WordpressPostDTO(
+                title=f"post {i}",
+                content="content " * 500,
+                description="description",
+                featured_media=image_result.data,
+                image_name=f"{i}.jpg",
+                tags=[1],
+                date="2015-01-01T00:00:00",
+                h1=f"post {i}",
+                slug=f"post-{i}",
+                meta={},
+            )
+            result = await wordpress_service.send_post(site, post, access_token="benchmark")
+            if not result.success:
+                raise RuntimeError(result.error_message)
+
+    try:
+        start = time.perf_counter()
+        await asyncio.gather(*(send(i) for i in range(n_posts)))
+        elapsed = time.perf_counter() - start
+    finally:
+        await clients.aclose()
+
+    return n_posts / elapsed
+
+
+async def main():
+    parser = argparse.ArgumentParser(
+        description="Скорость отправки постов на локальный фейковый WordPress: новый httpx клиент на каждый запрос "
+        "против keep-alive клиента сайта"
+    )
+    parser.add_argument("--posts", type=int, default=500)
+    parser.add_argument("--connections", type=int, default=5, help="max_connections_limit сайта")
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="время ответа фейкового сервера")
+    parser.add_argument("--image-bytes", type=int, default=50000)
+    args = parser.parse_args()
+
+    port = free_port()
+    server = multiprocessing.Process(target=serve, args=(port, args.latency_ms / 1000), daemon=True)
+    server.start()
+    try:
+        await wait_for_server(port)
+        site = Site(
+            id=1,
+            username="benchmark",
+            password="benchmark",
+            address=f"http://127.0.0.1:{port}",
+            max_connections_limit=args.connections,
+        )
+        for pooled in (False, True):
+            posts_per_sec = await run_benchmark(site, pooled, args.posts, args.image_bytes)
+            print(f"{'pooled' if pooled else 'client per request'}: {posts_per_sec:.0f} posts/sec")
+    finally:
+        server.terminate()
+        server.join()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,45 @@
+import argparse
+import asyncio
+from zipfile import ZipFile
+
+from posts.di import get_container
+from posts.usecases.posts.parse_and_send.parse_from_tar import (
+    ParsePostsFromTarAndSendToSites,
+)
+from posts.usecases.posts.parse_and_send.parse_from_zip import (
+    ParsePostsFromZIPAndSendToSites,
+)
+from posts.usecases.posts.parsing.file_discoverers.archive_format import (
+    detect_archive_file_format,
+)
+
+
+async def main():
+    parser = argparse.ArgumentParser(
+        description="Парсинг постов из архива zip, tar, tar.gz, tar.bz2, tar.xz или tar.zst без распаковки на диск"
+    )
+    parser.add_argument("path")
+    parser.add_argument("--no-send", action="store_true", help="не отправлять посты на сайты")
+    args = parser.parse_args()
+
+    container = await get_container()
+
+    async with container() as request_container:
+        print("Начало парсинга...")
+        if detect_archive_file_format(args.path) == "zip":
+            parse_posts = await request_container.get(ParsePostsFromZIPAndSendToSites)
+            with ZipFile(args.path) as zip_file:
+                parse_response = await parse_posts(zip_file, send=not args.no_send)
+        else:
+            parse_posts = await request_container.get(ParsePostsFromTarAndSendToSites)
+            parse_response = await parse_posts(args.path, send=not args.no_send)
+        print(f"Пропущено постов (дубликаты): {parse_response.skipped}")
+        print(f"Добавлено постов: {parse_response.inserted}")
+        print(f"Неправильных постов: {parse_response.invalid}")
+
+    # закрывает HTTP-клиенты сайтов
+    await container.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
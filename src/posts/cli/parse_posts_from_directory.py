@@ -1,4 +1,6 @@
+import argparse
 import asyncio
+import signal
 
 from posts.di import get_container
 from posts.usecases.posts.parse_and_send.parse_from_dir import (
@@ -7,16 +9,48 @@ from posts.usecases.posts.parse_and_send.parse_from_dir import (
 
 
 async def main():
+    parser = argparse.ArgumentParser(description="Парсинг постов из DATA_DIR и отправка на сайты")
+    parser.add_argument(
+        "--resume",
+        type=int,
+        default=None,
+        metavar="RUN_ID",
+        help="продолжить прерванный запуск парсинга, пропустив уже сохранённые файлы",
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="обработать все файлы DATA_DIR, а не только новые и изменённые с прошлого запуска",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="не завершаться, а парсить новые файлы DATA_DIR каждые WATCH_INTERVAL секунд до SIGINT/SIGTERM",
+    )
+    parser.add_argument("--no-send", action="store_true", help="не отправлять посты на сайты")
+    args = parser.parse_args()
+
     container = await get_container()
 
     async with container() as request_container:
         parse_posts = await request_container.get(ParsePostsFromDirctoryAndSendToSites)
         print("Начало парсинга...")
-        parse_response = await parse_posts()
+        if args.watch:
+            stop = asyncio.Event()
+            loop = asyncio.get_running_loop()
+            for sig in (signal.SIGINT, signal.SIGTERM):
+                loop.add_signal_handler(sig, stop.set)
+
+            parse_response = await parse_posts.watch(stop, send=not args.no_send, run_id=args.resume)
+        else:
+            parse_response = await parse_posts(send=not args.no_send, run_id=args.resume, full=args.full)
         print(f"Пропущено постов (дубликаты): {parse_response.skipped}")
         print(f"Добавлено постов: {parse_response.inserted}")
         print(f"Неправильных постов: {parse_response.invalid}")
 
+    # закрывает HTTP-клиенты сайтов
+    await container.close()
+
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -22,6 +22,9 @@ async def main():
         await send_posts(site_ids=site_ids)
         print("Синхронизация окончена")
 
+    # закрывает HTTP-клиенты сайтов
+    await container.close()
+
 
 if __name__ == "__main__":
     asyncio.run(main())
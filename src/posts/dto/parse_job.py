@@ -0,0 +1,14 @@
+from dataclasses import dataclass, field
+from typing import Literal
+
+from posts.dto.parse_posts import ParseProgress
+
+ParseJobStatus = Literal["queued", "running", "finished", "failed"]
+
+
+@dataclass
+class ParseJob:
+    id: str
+    status: ParseJobStatus
+    progress: ParseProgress = field(default_factory=ParseProgress)
+    error: str | None = None
@@ -1,5 +1,6 @@
 from dataclasses import dataclass
 from datetime import time
+from pathlib import Path
 
 
 @dataclass
@@ -11,6 +12,17 @@ class ParsedPostTagDTO:
         return hash(self.slug)
 
 
+@dataclass
+class SourceFileDTO:
+    # путь относительно DATA_DIR или имя файла в архиве
+    name: str
+    # абсолютный путь, mtime, размер и хеш содержимого файла из директории для манифеста source_files
+    path: str | None = None
+    mtime_ns: int | None = None
+    size: int | None = None
+    hash: str | None = None
+
+
 @dataclass
 class ParsedPostDTO:
     title: str
@@ -24,6 +36,15 @@ class ParsedPostDTO:
     slug: str
     tags: list[ParsedPostTagDTO]
     active: bool
+    # файл, из которого получен пост, для манифестов запуска парсинга и директории
+    source_file: SourceFileDTO | None = None
+
+
+@dataclass
+class DiscoveredFileDTO:
+    file: SourceFileDTO
+    # содержимое файла или путь к нему, если файл читает сам ParserWorker
+    source: str | Path
 
 
 @dataclass
@@ -31,3 +52,15 @@ class ParseUsecaseResponse:
     skipped: int
     inserted: int
     invalid: int
+
+
+@dataclass
+class ParseProgress:
+    """Текущие счётчики парсинга и отправки постов на сайты."""
+
+    discovered: int = 0
+    parsed: int = 0
+    inserted: int = 0
+    skipped: int = 0
+    invalid: int = 0
+    sent: int = 0
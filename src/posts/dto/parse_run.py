@@ -0,0 +1,14 @@
+from dataclasses import dataclass
+from typing import Literal
+
+ParseRunStatus = Literal["running", "finished", "failed"]
+
+
+@dataclass(frozen=True)
+class ParseRun:
+    id: int
+    source: str
+    status: ParseRunStatus
+    skipped: int = 0
+    inserted: int = 0
+    invalid: int = 0
@@ -7,4 +7,5 @@ class Site:
     username: str
     password: str
     address: str
-    max_connections_limit: int = 1
+    max_connections_limit: int = 5
+    min_connections_limit: int = 1
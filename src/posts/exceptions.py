@@ -32,3 +32,11 @@ class TagNotFoundError(RecordNotFoundError):
 
 class PostAlreadyHasTagError(Exception):
     pass
+
+
+class UnsupportedArchiveError(Exception):
+    pass
+
+
+class SiteUnavailableError(Exception):
+    pass
@@ -9,8 +9,10 @@ from sqlalchemy.ext.asyncio import (
 )
 
 from posts.persistence.data_mappers.error_log_data_mapper import ErrorLogDataMapper
+from posts.persistence.data_mappers.parse_run_data_mapper import ParseRunDataMapper
 from posts.persistence.data_mappers.post_data_mapper import PostDataMapper
 from posts.persistence.data_mappers.site_post_data_mapper import SitePostDataMapper
+from posts.persistence.data_mappers.source_file_data_mapper import SourceFileDataMapper
 from posts.persistence.data_mappers.tag_data_mapper import TagDataMapper
 from posts.persistence.data_mappers.user_data_mapper import UserDataMapper
 from posts.persistence.db.db_config import DbConfig
@@ -29,7 +31,9 @@ class DbProvider(Provider):
     async def get_session_maker(self, engine: AsyncEngine) -> async_sessionmaker:
         return async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
 
-    @provide(scope=Scope.APP)
+    # SESSION пропускается при входе в скоуп, поэтому каждый container() (HTTP-запрос, задача импорта, команда CLI)
+    # получает свою сессию: AsyncSession нельзя использовать из нескольких задач одновременно
+    @provide(scope=Scope.SESSION)
     async def get_session(self, session_maker: async_sessionmaker[AsyncSession]) -> AsyncIterable[AsyncSession]:
         async with session_maker() as session:
             yield session
@@ -53,3 +57,11 @@ class DbProvider(Provider):
     @provide(scope=Scope.SESSION)
     async def get_site_post_data_mapper(self, session: AsyncSession) -> SitePostDataMapper:
         return SitePostDataMapper(session=session)
+
+    @provide(scope=Scope.SESSION)
+    async def get_parse_run_data_mapper(self, session: AsyncSession) -> ParseRunDataMapper:
+        return ParseRunDataMapper(session=session)
+
+    @provide(scope=Scope.SESSION)
+    async def get_source_file_data_mapper(self, session: AsyncSession) -> SourceFileDataMapper:
+        return SourceFileDataMapper(session=session)
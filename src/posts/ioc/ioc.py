@@ -1,6 +1,5 @@
 from collections.abc import AsyncIterable
 
-import httpx
 from dishka import Provider, Scope, from_context, provide
 from fastapi import FastAPI
 from redis import Redis  # type: ignore
@@ -11,8 +10,10 @@ from posts.admin.auth.backend import AdminAuth
 from posts.admin.auth.login_factory.dishka_login_factory import DishkaLoginFactory
 from posts.admin.config import AdminConfig
 from posts.persistence.data_mappers.error_log_data_mapper import ErrorLogDataMapper
+from posts.persistence.data_mappers.parse_run_data_mapper import ParseRunDataMapper
 from posts.persistence.data_mappers.post_data_mapper import PostDataMapper
 from posts.persistence.data_mappers.site_post_data_mapper import SitePostDataMapper
+from posts.persistence.data_mappers.source_file_data_mapper import SourceFileDataMapper
 from posts.persistence.data_mappers.tag_data_mapper import TagDataMapper
 from posts.persistence.data_mappers.user_data_mapper import UserDataMapper
 from posts.persistence.redis_config import RedisConfig
@@ -21,9 +22,13 @@ from posts.services.get_site_access_token import GetSiteAccessToken
 from posts.services.images_loader.config import PostsImagsLoaderConfig
 from posts.services.images_loader.images_loader import PostImagesLoader
 from posts.services.logger import DbLogger
+from posts.services.posts_sender.config import PostsSenderConfig
 from posts.services.posts_sender.posts_sender import PostsSender
 from posts.services.posts_sender.send_single_post import SendSinglePostToSite
+from posts.services.wordpress_service.clients import WordpressClients
+from posts.services.wordpress_service.config import WordpressClientsConfig
 from posts.services.wordpress_service.fetch_tags import FetchWordpressTags
+from posts.services.wordpress_service.retry import RetryPolicy
 from posts.services.wordpress_service.service import WordpressService
 from posts.usecases.create_user import CreateUser
 from posts.usecases.posts.activate import ActivatePost
@@ -31,6 +36,9 @@ from posts.usecases.posts.deavtivate import DeactivatePost
 from posts.usecases.posts.parse_and_send.parse_from_dir import (
     ParsePostsFromDirctoryAndSendToSites,
 )
+from posts.usecases.posts.parse_and_send.parse_from_tar import (
+    ParsePostsFromTarAndSendToSites,
+)
 from posts.usecases.posts.parse_and_send.parse_from_zip import (
     ParsePostsFromZIPAndSendToSites,
 )
@@ -42,11 +50,14 @@ from posts.usecases.posts.parsing.file_discoverers.directory_discoverer.config i
 from posts.usecases.posts.parsing.file_discoverers.directory_discoverer.directory_discoverer import (
     DirectoryDiscoverer,
 )
+from posts.usecases.posts.parsing.file_discoverers.tar_archive_discoverer import (
+    TarDiscoverer,
+)
 from posts.usecases.posts.parsing.parsers.directory_parser import (
     ParsePostsFromDirectory,
 )
+from posts.usecases.posts.parsing.parsers.tar_parser import ParsePostsFromTar
 from posts.usecases.posts.parsing.parsers.zip_parser import ParsePostsFromZIP
-from posts.usecases.posts.persist_posts import PersistPosts
 from posts.usecases.posts.send_to_site.adapter import WordpressPostAdapter
 from posts.usecases.posts.send_to_site.usecase import SendPostsToSites
 from posts.usecases.posts.update import UpdatePost
@@ -74,7 +85,11 @@ class UsecasesProvider(Provider):
     def get_directory_discoverer(
         self, directory_discoverer_config: DirectoryDiscovererConfig, parse_config: ParseConfig
     ) -> DirectoryDiscoverer:
-        return DirectoryDiscoverer(config=directory_discoverer_config, n_parser_workers=parse_config.N_PARSER_WORKERS)
+        return DirectoryDiscoverer(
+            config=directory_discoverer_config,
+            n_parser_workers=parse_config.N_PARSER_WORKERS,
+            read_in_workers=parse_config.READ_FILES_IN_WORKERS,
+        )
 
     @provide(scope=Scope.SESSION)
     def get_db_logger(self, error_log_data_mapper: ErrorLogDataMapper, session_maker: async_sessionmaker) -> DbLogger:
@@ -85,6 +100,9 @@ class UsecasesProvider(Provider):
         self,
         parse_config: ParseConfig,
         tag_data_mapper: TagDataMapper,
+        post_data_mapper: PostDataMapper,
+        parse_run_data_mapper: ParseRunDataMapper,
+        source_file_data_mapper: SourceFileDataMapper,
         directory_discoverer: DirectoryDiscoverer,
         transaction: AsyncSession,
         db_worker: DbWriterWorker,
@@ -93,6 +111,9 @@ class UsecasesProvider(Provider):
         return ParsePostsFromDirectory(
             config=parse_config,
             tag_data_mapper=tag_data_mapper,
+            post_data_mapper=post_data_mapper,
+            parse_run_data_mapper=parse_run_data_mapper,
+            source_file_data_mapper=source_file_data_mapper,
             directory_discoverer=directory_discoverer,
             transaction=transaction,
             db_worker=db_worker,
@@ -101,15 +122,60 @@ class UsecasesProvider(Provider):
 
     @provide(scope=Scope.REQUEST)
     def get_parse_from_directory_and_send_posts(
-        self, parse_posts: ParsePostsFromDirectory, send_posts_to_sites: SendPostsToSites
+        self, parse_posts: ParsePostsFromDirectory, send_posts_to_sites: SendPostsToSites, parse_config: ParseConfig
     ) -> ParsePostsFromDirctoryAndSendToSites:
-        return ParsePostsFromDirctoryAndSendToSites(parse_posts=parse_posts, send_posts=send_posts_to_sites)
+        return ParsePostsFromDirctoryAndSendToSites(
+            parse_posts=parse_posts,
+            send_posts=send_posts_to_sites,
+            send_while_parsing=parse_config.SEND_WHILE_PARSING,
+        )
 
     @provide(scope=Scope.REQUEST)
     async def get_parse_from_zip_and_send_posts(
-        self, parse_posts: ParsePostsFromZIP, send_posts_to_sites: SendPostsToSites
+        self, parse_posts: ParsePostsFromZIP, send_posts_to_sites: SendPostsToSites, parse_config: ParseConfig
     ) -> ParsePostsFromZIPAndSendToSites:
-        return ParsePostsFromZIPAndSendToSites(parse_posts=parse_posts, send_posts=send_posts_to_sites)
+        return ParsePostsFromZIPAndSendToSites(
+            parse_posts=parse_posts,
+            send_posts=send_posts_to_sites,
+            send_while_parsing=parse_config.SEND_WHILE_PARSING,
+        )
+
+    @provide(scope=Scope.REQUEST)
+    def get_tar_archive_discoverer(self, parse_config: ParseConfig) -> TarDiscoverer:
+        return TarDiscoverer(n_parser_workers=parse_config.N_PARSER_WORKERS, chunk_size=parse_config.PARSER_CHUNK_SIZE)
+
+    @provide(scope=Scope.REQUEST)
+    def get_parse_posts_from_tar(
+        self,
+        parse_config: ParseConfig,
+        tag_data_mapper: TagDataMapper,
+        post_data_mapper: PostDataMapper,
+        parse_run_data_mapper: ParseRunDataMapper,
+        tar_discoverer: TarDiscoverer,
+        transaction: AsyncSession,
+        db_worker: DbWriterWorker,
+        logger: DbLogger,
+    ) -> ParsePostsFromTar:
+        return ParsePostsFromTar(
+            config=parse_config,
+            tag_data_mapper=tag_data_mapper,
+            post_data_mapper=post_data_mapper,
+            parse_run_data_mapper=parse_run_data_mapper,
+            tar_discoverer=tar_discoverer,
+            transaction=transaction,
+            db_worker=db_worker,
+            logger=logger,
+        )
+
+    @provide(scope=Scope.REQUEST)
+    def get_parse_from_tar_and_send_posts(
+        self, parse_posts: ParsePostsFromTar, send_posts_to_sites: SendPostsToSites, parse_config: ParseConfig
+    ) -> ParsePostsFromTarAndSendToSites:
+        return ParsePostsFromTarAndSendToSites(
+            parse_posts=parse_posts,
+            send_posts=send_posts_to_sites,
+            send_while_parsing=parse_config.SEND_WHILE_PARSING,
+        )
 
     @provide(scope=Scope.SESSION)
     async def get_create_user(
@@ -121,10 +187,14 @@ class UsecasesProvider(Provider):
     def get_images_loadr_config(self) -> PostsImagsLoaderConfig:
         return PostsImagsLoaderConfig()
 
-    @provide(scope=Scope.REQUEST)
-    async def get_images_loader(self, config: PostsImagsLoaderConfig) -> PostImagesLoader:
+    @provide(scope=Scope.APP)
+    def get_images_loader(self, config: PostsImagsLoaderConfig) -> PostImagesLoader:
         return PostImagesLoader(config=config)
 
+    @provide(scope=Scope.APP)
+    def get_posts_sender_config(self) -> PostsSenderConfig:
+        return PostsSenderConfig()
+
     @provide(scope=Scope.REQUEST)
     async def get_posts_sender(
         self,
@@ -133,8 +203,10 @@ class UsecasesProvider(Provider):
         images_loader: PostImagesLoader,
         send_single_post: SendSinglePostToSite,
         session_maker: async_sessionmaker[AsyncSession],
+        config: PostsSenderConfig,
     ) -> PostsSender:
         return PostsSender(
+            config=config,
             session_maker=session_maker,
             images_loader=images_loader,
             send_single_post=send_single_post,
@@ -175,14 +247,8 @@ class UsecasesProvider(Provider):
         )
 
     @provide(scope=Scope.SESSION)
-    def get_persist_posts(self, post_data_mapper: PostDataMapper, tag_data_mapper: TagDataMapper) -> PersistPosts:
-        return PersistPosts(post_data_mapper=post_data_mapper, tag_data_mapper=tag_data_mapper)
-
-    @provide(scope=Scope.SESSION)
-    def get_db_worker(
-        self, post_data_mapper: PostDataMapper, config: ParseConfig, persist_posts: PersistPosts
-    ) -> DbWriterWorker:
-        return DbWriterWorker(post_data_mapper=post_data_mapper, config=config, persist_posts=persist_posts)
+    def get_db_worker(self, config: ParseConfig, session_maker: async_sessionmaker) -> DbWriterWorker:
+        return DbWriterWorker(config=config, session_maker=session_maker)
 
     @provide(scope=Scope.REQUEST)
     def get_all_tags(self, tag_data_mapper: TagDataMapper) -> FilterTags:
@@ -206,10 +272,23 @@ class UsecasesProvider(Provider):
     def get_wordpress_post_adapter(self) -> WordpressPostAdapter:
         return WordpressPostAdapter()
 
-    @provide(scope=Scope.REQUEST)
-    async def get_https_session(self) -> AsyncIterable[httpx.AsyncClient]:
-        async with httpx.AsyncClient(timeout=60) as session:
-            yield session
+    @provide(scope=Scope.APP)
+    def get_wordpress_clients_config(self) -> WordpressClientsConfig:
+        return WordpressClientsConfig()
+
+    @provide(scope=Scope.APP)
+    def get_wordpress_retry_policy(self, config: WordpressClientsConfig) -> RetryPolicy:
+        return RetryPolicy(
+            attempts=config.WORDPRESS_RETRY_ATTEMPTS,
+            base_delay=config.WORDPRESS_RETRY_BASE_DELAY,
+            max_delay=config.WORDPRESS_RETRY_MAX_DELAY,
+        )
+
+    @provide(scope=Scope.APP)
+    async def get_wordpress_clients(self, config: WordpressClientsConfig) -> AsyncIterable[WordpressClients]:
+        clients = WordpressClients(config=config)
+        yield clients
+        await clients.aclose()
 
     @provide(scope=Scope.APP)
     def get_redis_config(self) -> RedisConfig:
@@ -224,8 +303,8 @@ class UsecasesProvider(Provider):
         return GetSiteAccessToken(wordpress_service=wordpress_service, redis=redis)
 
     @provide(scope=Scope.REQUEST)
-    def get_wordpress_service(self) -> WordpressService:
-        return WordpressService()
+    def get_wordpress_service(self, clients: WordpressClients, retry_policy: RetryPolicy) -> WordpressService:
+        return WordpressService(clients=clients, retry_policy=retry_policy)
 
     @provide(scope=Scope.REQUEST)
     def get_send_single_post(
@@ -249,8 +328,13 @@ class UsecasesProvider(Provider):
         )
 
     @provide(scope=Scope.REQUEST)
-    def get_ftch_wordpress_tags(self, wordpress_service: WordpressService) -> FetchWordpressTags:
-        return FetchWordpressTags(wordpress_service=wordpress_service)
+    def get_ftch_wordpress_tags(
+        self,
+        wordpress_service: WordpressService,
+        session_maker: async_sessionmaker[AsyncSession],
+        config: WordpressClientsConfig,
+    ) -> FetchWordpressTags:
+        return FetchWordpressTags(wordpress_service=wordpress_service, session_maker=session_maker, config=config)
 
     @provide(scope=Scope.REQUEST)
     def get_send_posts_to_sites(
@@ -260,6 +344,7 @@ class UsecasesProvider(Provider):
         site_post_data_mapper: SitePostDataMapper,
         posts_sender: PostsSender,
         transaction: AsyncSession,
+        session_maker: async_sessionmaker[AsyncSession],
     ) -> SendPostsToSites:
         return SendPostsToSites(
             site_post_data_mapper=site_post_data_mapper,
@@ -267,6 +352,7 @@ class UsecasesProvider(Provider):
             fetch_wordpress_tags=fetch_wordpress_tags,
             posts_sender=posts_sender,
             transaction=transaction,
+            session_maker=session_maker,
         )
 
     @provide(scope=Scope.REQUEST)
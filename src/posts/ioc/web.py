@@ -1,8 +1,13 @@
-from dishka import Provider, Scope, provide
+from collections.abc import AsyncIterable
+
+from dishka import AsyncContainer, Provider, Scope, provide
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from posts.persistence.data_mappers.parse_run_data_mapper import ParseRunDataMapper
+from posts.persistence.data_mappers.post_data_mapper import PostDataMapper
 from posts.persistence.data_mappers.tag_data_mapper import TagDataMapper
 from posts.services.logger import DbLogger
+from posts.usecases.posts.parse_and_send.job_runner import ParseJobRunner
 from posts.usecases.posts.parsing.config import ParseConfig
 from posts.usecases.posts.parsing.db_writer_worker import DbWriterWorker
 from posts.usecases.posts.parsing.file_discoverers.zip_archive_discoverer import (
@@ -12,9 +17,23 @@ from posts.usecases.posts.parsing.parsers.zip_parser import ParsePostsFromZIP
 
 
 class WebProvider(Provider):
+    @provide(scope=Scope.APP)
+    async def get_parse_job_runner(
+        self, container: AsyncContainer, parse_config: ParseConfig
+    ) -> AsyncIterable[ParseJobRunner]:
+        job_runner = ParseJobRunner(
+            container=container, max_jobs=parse_config.MAX_PARSE_JOBS, history_size=parse_config.PARSE_JOBS_HISTORY
+        )
+        yield job_runner
+        await job_runner.close()
+
     @provide(scope=Scope.REQUEST)
     def get_zip_archive_discoverer(self, parse_config: ParseConfig) -> ZIPDiscoverer:
-        return ZIPDiscoverer(n_parser_workers=parse_config.N_PARSER_WORKERS)
+        return ZIPDiscoverer(
+            n_parser_workers=parse_config.N_PARSER_WORKERS,
+            n_readers=parse_config.N_ZIP_READERS,
+            chunk_size=parse_config.PARSER_CHUNK_SIZE,
+        )
 
     @provide(scope=Scope.REQUEST)
     def get_web_parse_posts(
@@ -23,6 +42,8 @@ class WebProvider(Provider):
         parse_config: ParseConfig,
         db_worker: DbWriterWorker,
         tag_data_mapper: TagDataMapper,
+        post_data_mapper: PostDataMapper,
+        parse_run_data_mapper: ParseRunDataMapper,
         zip_archive_discoverer: ZIPDiscoverer,
         logger: DbLogger,
     ) -> ParsePostsFromZIP:
@@ -30,6 +51,8 @@ class WebProvider(Provider):
             config=parse_config,
             db_worker=db_worker,
             tag_data_mapper=tag_data_mapper,
+            post_data_mapper=post_data_mapper,
+            parse_run_data_mapper=parse_run_data_mapper,
             zip_discoverer=zip_archive_discoverer,
             transaction=session,
             logger=logger,
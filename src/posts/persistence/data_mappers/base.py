@@ -1,6 +1,27 @@
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import AsyncSession
 
 
 class BaseDataMapper:
     def __init__(self, session: AsyncSession) -> None:
         self._session = session
+
+    @property
+    def _is_postgresql(self) -> bool:
+        return self._session.bind.dialect.name == "postgresql"
+
+    def _insert(self, model):
+        """insert с поддержкой ON CONFLICT для диалекта текущей сессии (PostgreSQL или SQLite)."""
+        if self._is_postgresql:
+            return postgresql.insert(model)
+
+        return sqlite.insert(model)
+
+    async def _copy_records(self, table_name: str, columns: list[str], records: list[tuple]) -> None:
+        """
+        COPY записей в таблицу через asyncpg в соединении и транзакции текущей сессии.
+        Только для PostgreSQL.
+        """
+        connection = await self._session.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(table_name, records=records, columns=columns)
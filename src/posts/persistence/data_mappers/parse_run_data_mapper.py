@@ -0,0 +1,66 @@
+from datetime import datetime
+
+import pytz
+from sqlalchemy import select, update
+
+from posts.dto.parse_run import ParseRun, ParseRunStatus
+from posts.persistence.data_mappers.base import BaseDataMapper
+from posts.persistence.models import ParseRunFileOrm, ParseRunOrm
+
+
+class ParseRunDataMapper(BaseDataMapper):
+    """Запуски парсинга и манифест уже обработанных в них файлов (путей в директории или имён в архиве)."""
+
+    async def create(self, source: str) -> int:
+        run = ParseRunOrm(source=source, status="running")
+
+        self._session.add(run)
+        await self._session.flush()
+
+        return run.id
+
+    async def get(self, id: int) -> ParseRun | None:
+        result = await self._session.execute(select(ParseRunOrm).where(ParseRunOrm.id == id))
+
+        run = result.scalar()
+        if run is None:
+            return None
+
+        return ParseRun(
+            id=run.id,
+            source=run.source,
+            status=run.status,
+            skipped=run.skipped or 0,
+            inserted=run.inserted or 0,
+            invalid=run.invalid or 0,
+        )
+
+    async def finish(self, id: int, status: ParseRunStatus, skipped: int, inserted: int, invalid: int) -> None:
+        """Сохраняет статус запуска и прибавляет счётчики: при продолжении запуска они накапливаются."""
+        await self._session.execute(
+            update(ParseRunOrm)
+            .where(ParseRunOrm.id == id)
+            .values(
+                status=status,
+                skipped=ParseRunOrm.skipped + skipped,
+                inserted=ParseRunOrm.inserted + inserted,
+                invalid=ParseRunOrm.invalid + invalid,
+                finished_at=datetime.now(pytz.timezone("Europe/Moscow")),
+            )
+        )
+
+    async def processed_files(self, run_id: int) -> set[str]:
+        results = await self._session.execute(select(ParseRunFileOrm.name).where(ParseRunFileOrm.run_id == run_id))
+
+        return set(results.scalars().all())
+
+    async def add_files(self, run_id: int, names: list[str]) -> None:
+        if not names:
+            return
+
+        await self._session.execute(
+            self._insert(ParseRunFileOrm).on_conflict_do_nothing(
+                index_elements=[ParseRunFileOrm.run_id, ParseRunFileOrm.name]
+            ),
+            [{"run_id": run_id, "name": name} for name in names],
+        )
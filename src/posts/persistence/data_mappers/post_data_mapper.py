@@ -1,6 +1,7 @@
-from dataclasses import asdict
+from collections.abc import AsyncIterator
+from datetime import datetime
 
-from sqlalchemy import select, update
+from sqlalchemy import select, text, update
 from sqlalchemy.orm import joinedload, selectinload
 
 from posts.dto.parse_posts import ParsedPostDTO
@@ -37,11 +38,23 @@ class PostDataMapper(BaseDataMapper):
         ids = results.scalars().all()
         return ids
 
-    async def bulk_save(self, batch: list[ParsedPostDTO]) -> list[Post]:
-        records = []
-        for r in batch:
-            records.append(asdict(r))
+    async def iter_id_chunks(self, chunk_size: int) -> AsyncIterator[list[int]]:
+        """Id всех постов по возрастанию, чанками по chunk_size (keyset-пагинация по первичному ключу)."""
+        last_id = None
+        while True:
+            query = select(PostOrm.id).order_by(PostOrm.id).limit(chunk_size)
+            if last_id is not None:
+                query = query.where(PostOrm.id > last_id)
+
+            results = await self._session.execute(query)
+            ids = list(results.scalars().all())
+            if not ids:
+                return
+
+            yield ids
+            last_id = ids[-1]
 
+    async def bulk_save(self, batch: list[ParsedPostDTO]) -> list[Post]:
         posts = []
         for post in batch:
             posts.append(
@@ -63,3 +76,70 @@ class PostDataMapper(BaseDataMapper):
         await self._session.flush()
 
         return posts
+
+    _INGEST_COLUMNS = [
+        "id",
+        "title",
+        "description",
+        "published",
+        "h1",
+        "image",
+        "content",
+        "content2",
+        "slug",
+        "active",
+    ]
+
+    @staticmethod
+    def _to_record(post: ParsedPostDTO) -> tuple:
+        published = post.published.date() if isinstance(post.published, datetime) else post.published
+        return (
+            post.id,
+            post.title,
+            post.description,
+            published,
+            post.h1,
+            post.image,
+            post.content,
+            post.content2,
+            post.slug,
+            post.active,
+        )
+
+    async def bulk_insert(self, batch: list[ParsedPostDTO]) -> list[int]:
+        """
+        Пакетная вставка постов без ORM unit of work. Возвращает id вставленных постов.
+
+        Уже существующие посты (в том числе вставленные параллельно другим импортом) пропускаются
+        через ON CONFLICT (id) DO NOTHING и не попадают в результат.
+        В PostgreSQL посты загружаются через COPY во временную staging-таблицу и переносятся
+        в posts одним INSERT ... SELECT ... RETURNING id. В остальных диалектах выполняется
+        Core insert (executemany) с RETURNING id.
+        """
+        if not batch:
+            return []
+
+        records = [self._to_record(post) for post in batch]
+
+        if not self._is_postgresql:
+            results = await self._session.execute(
+                self._insert(PostOrm).on_conflict_do_nothing(index_elements=[PostOrm.id]).returning(PostOrm.id),
+                [dict(zip(self._INGEST_COLUMNS, record)) for record in records],
+            )
+            return list(results.scalars().all())
+
+        columns = ", ".join(self._INGEST_COLUMNS)
+        await self._session.execute(
+            text("CREATE TEMP TABLE IF NOT EXISTS posts_staging (LIKE posts INCLUDING DEFAULTS) ON COMMIT DELETE ROWS")
+        )
+        await self._copy_records("posts_staging", columns=self._INGEST_COLUMNS, records=records)
+        results = await self._session.execute(
+            text(
+                f"INSERT INTO posts ({columns}) SELECT {columns} FROM posts_staging "
+                "ON CONFLICT (id) DO NOTHING RETURNING id"
+            )
+        )
+        inserted_ids = list(results.scalars().all())
+        await self._session.execute(text("TRUNCATE posts_staging"))
+
+        return inserted_ids
@@ -9,21 +9,25 @@ from posts.persistence.models import PostOrm, PostTagOrm, SiteOrm, SitePostOrm
 
 
 class SitePostDataMapper(BaseDataMapper):
+    @staticmethod
+    def _to_site(site: SiteOrm) -> Site:
+        # у сайтов, добавленных до появления ограничений, они не заполнены
+        return Site(
+            id=site.id,
+            username=site.username,
+            password=site.password,
+            address=site.address,
+            max_connections_limit=site.max_connections_limit or Site.max_connections_limit,
+            min_connections_limit=site.min_connections_limit or Site.min_connections_limit,
+        )
+
     async def all_sites(self) -> list[Site]:
         result = await self._session.execute(select(SiteOrm))
-        return [
-            Site(
-                id=site.id,
-                username=site.username,
-                password=site.password,
-                address=site.address,
-            )
-            for site in result.scalars().all()
-        ]
-
-    async def filter_sites(self, ids: list[int]) -> list[SiteOrm]:
+        return [self._to_site(site) for site in result.scalars().all()]
+
+    async def filter_sites(self, ids: list[int]) -> list[Site]:
         result = await self._session.execute(select(SiteOrm).where(SiteOrm.id.in_(ids)))
-        return result.scalars().all()
+        return [self._to_site(site) for site in result.scalars().all()]
 
     async def get_site(self, id: int) -> SiteOrm:
         result = await self._session.get(SiteOrm, id)
@@ -55,6 +59,16 @@ class SitePostDataMapper(BaseDataMapper):
 
         return [from_orm_to_post_with_tags(post) for post in posts]
 
+    async def filter_posts_by_ids(self, ids: list[int], active: bool = True) -> list[PostWithTags]:
+        results = await self._session.execute(
+            select(PostOrm)
+            .options(selectinload(PostOrm.tags).joinedload(PostTagOrm.tag), selectinload(PostOrm.siteposts))
+            .where(PostOrm.id.in_(ids), PostOrm.active == active)
+        )
+
+        posts = results.scalars().unique()
+        return [from_orm_to_post_with_tags(post) for post in posts]
+
     async def filter_posts(self, site_id: int, sended: bool = False, active: bool = True) -> list[PostWithTags]:
         results = await self._session.execute(
             select(PostOrm)
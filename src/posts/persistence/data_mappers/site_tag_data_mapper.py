@@ -0,0 +1,52 @@
+from datetime import datetime
+
+from sqlalchemy import delete, func, select, update
+
+from posts.dto.post import Tag
+from posts.persistence.data_mappers.base import BaseDataMapper
+from posts.persistence.models import SiteOrm, SiteTagOrm
+
+
+class SiteTagDataMapper(BaseDataMapper):
+    """Зеркало тегов WordPress сайтов: id и имена тегов на сайте по slug."""
+
+    async def tags(self, site_id: int) -> list[Tag]:
+        results = await self._session.execute(
+            select(SiteTagOrm.tag_id, SiteTagOrm.name, SiteTagOrm.slug).where(SiteTagOrm.site_id == site_id)
+        )
+
+        return [Tag(id=tag_id, name=name, slug=slug) for tag_id, name, slug in results.all()]
+
+    async def max_tag_id(self, site_id: int) -> int | None:
+        result = await self._session.execute(select(func.max(SiteTagOrm.tag_id)).where(SiteTagOrm.site_id == site_id))
+
+        return result.scalar()
+
+    async def synced_at(self, site_id: int) -> datetime | None:
+        """Время последней полной синхронизации зеркала сайта."""
+        result = await self._session.execute(select(SiteOrm.tags_synced_at).where(SiteOrm.id == site_id))
+
+        return result.scalar()
+
+    async def upsert(self, site_id: int, tags: list[Tag], seen_at: datetime) -> None:
+        if not tags:
+            return
+
+        query = self._insert(SiteTagOrm)
+        await self._session.execute(
+            query.on_conflict_do_update(
+                index_elements=[SiteTagOrm.site_id, SiteTagOrm.slug],
+                set_={"tag_id": query.excluded.tag_id, "name": query.excluded.name, "seen_at": query.excluded.seen_at},
+            ),
+            [
+                {"site_id": site_id, "tag_id": tag.id, "name": tag.name, "slug": tag.slug, "seen_at": seen_at}
+                for tag in tags
+            ],
+        )
+
+    async def finish_full_sync(self, site_id: int, synced_at: datetime) -> None:
+        """Удаляет теги, которых не было на сайте при полной синхронизации, начатой в synced_at."""
+        await self._session.execute(
+            delete(SiteTagOrm).where(SiteTagOrm.site_id == site_id, SiteTagOrm.seen_at < synced_at)
+        )
+        await self._session.execute(update(SiteOrm).where(SiteOrm.id == site_id).values(tags_synced_at=synced_at))
@@ -0,0 +1,39 @@
+from sqlalchemy import select
+
+from posts.dto.parse_posts import SourceFileDTO
+from posts.persistence.data_mappers.base import BaseDataMapper
+from posts.persistence.models import SourceFileOrm
+
+
+class SourceFileDataMapper(BaseDataMapper):
+    """Манифест файлов директории: mtime, размер и хеш содержимого уже обработанных файлов по абсолютному пути."""
+
+    async def manifest(self, prefix: str) -> dict[str, SourceFileDTO]:
+        """Записи манифеста для файлов внутри директории prefix."""
+        results = await self._session.execute(
+            select(SourceFileOrm.path, SourceFileOrm.mtime_ns, SourceFileOrm.size, SourceFileOrm.hash).where(
+                SourceFileOrm.path.startswith(prefix, autoescape=True)
+            )
+        )
+
+        return {
+            path: SourceFileDTO(name=path, path=path, mtime_ns=mtime_ns, size=size, hash=hash)
+            for path, mtime_ns, size, hash in results.all()
+        }
+
+    async def upsert(self, files: list[SourceFileDTO]) -> None:
+        if not files:
+            return
+
+        query = self._insert(SourceFileOrm)
+        await self._session.execute(
+            query.on_conflict_do_update(
+                index_elements=[SourceFileOrm.path],
+                set_={
+                    "mtime_ns": query.excluded.mtime_ns,
+                    "size": query.excluded.size,
+                    "hash": query.excluded.hash,
+                },
+            ),
+            [{"path": file.path, "mtime_ns": file.mtime_ns, "size": file.size, "hash": file.hash} for file in files],
+        )
@@ -1,4 +1,4 @@
-from sqlalchemy import delete, or_, select
+from sqlalchemy import delete, insert, or_, select
 from sqlalchemy.orm import selectinload
 
 from posts.dto.parse_posts import ParsedPostTagDTO
@@ -52,6 +52,29 @@ class TagDataMapper(BaseDataMapper):
         await self._session.flush()
         return [from_orm_to_tag(tag) for tag in tags_orm]
 
+    async def bulk_upsert(self, tags: list[ParsedPostTagDTO]) -> list[Tag]:
+        """
+        Создаёт теги, которых ещё нет в базе, и возвращает все переданные теги с id одним запросом.
+
+        INSERT ... ON CONFLICT (slug) DO UPDATE ... RETURNING возвращает строку и для уже существующего тега,
+        в том числе созданного параллельно другой транзакцией. Обновление холостое: имя существующего тега не меняется.
+        Строки вставляются в порядке slug: параллельные транзакции блокируют пересекающиеся теги в одном порядке
+        и не попадают во взаимную блокировку (deadlock) в PostgreSQL.
+        """
+        tags_by_slug = {tag.slug: tag for tag in tags}
+        if not tags_by_slug:
+            return []
+
+        insert_tags = self._insert(TagOrm).values(
+            [{"name": tag.name, "slug": tag.slug} for _, tag in sorted(tags_by_slug.items())]
+        )
+        results = await self._session.execute(
+            insert_tags.on_conflict_do_update(
+                index_elements=[TagOrm.slug], set_={"slug": insert_tags.excluded.slug}
+            ).returning(TagOrm.id, TagOrm.name, TagOrm.slug)
+        )
+        return [Tag(id=row.id, name=row.name, slug=row.slug) for row in results.all()]
+
     async def get_relation(self, tag_id: int, post_id: int) -> PostTagRelation | None:
         result = await self._session.execute(
             select(PostTagOrm).where(PostTagOrm.tag_id == tag_id, PostTagOrm.post_id == post_id)
@@ -69,6 +92,23 @@ class TagDataMapper(BaseDataMapper):
 
         self._session.add_all(relations_orm)
 
+    async def bulk_insert_post_relations(self, relations: list[PostTagRelation]) -> None:
+        """Пакетная вставка связей пост-тег: COPY в PostgreSQL, Core insert (executemany) в остальных диалектах."""
+        if not relations:
+            return
+
+        if self._is_postgresql:
+            await self._copy_records(
+                "posttags",
+                columns=["post_id", "tag_id"],
+                records=[(relation.post_id, relation.tag_id) for relation in relations],
+            )
+            return
+
+        await self._session.execute(
+            insert(PostTagOrm), [{"post_id": relation.post_id, "tag_id": relation.tag_id} for relation in relations]
+        )
+
     async def delete_post_tag_relation(self, post_id: int, tag_id: int) -> None:
         await self._session.execute(
             delete(PostTagOrm).where(PostTagOrm.tag_id == tag_id, PostTagOrm.post_id == post_id)
@@ -3,6 +3,7 @@ from datetime import datetime
 import pytz
 from sqlalchemy import (
     TIMESTAMP,
+    BigInteger,
     Boolean,
     Column,
     Date,
@@ -11,6 +12,7 @@ from sqlalchemy import (
     SmallInteger,
     String,
     Text,
+    UniqueConstraint,
 )
 from sqlalchemy.orm import relationship
 
@@ -96,6 +98,9 @@ class SiteOrm(Model):
     password = Column(String)
     address = Column(String)
     max_connections_limit = Column(SmallInteger, default=5)
+    min_connections_limit = Column(SmallInteger, default=1)
+    # время последней полной синхронизации зеркала тегов сайта
+    tags_synced_at = Column(TIMESTAMP(timezone=True), nullable=True)
 
     siteposts = relationship("SitePostOrm", back_populates="site")
 
@@ -114,3 +119,57 @@ class SitePostOrm(Model):
     site = relationship(SiteOrm, back_populates="siteposts")
 
     sended = Column(Boolean, server_default="false")
+
+
+class SiteTagOrm(Model):
+    """Зеркало тегов WordPress сайта: id тега на сайте по slug."""
+
+    __tablename__ = "site_tags"
+    __table_args__ = (UniqueConstraint("site_id", "slug"),)
+
+    id = Column(Integer, index=True, primary_key=True)
+    site_id = Column(Integer, ForeignKey("sites.id", ondelete="CASCADE"), index=True)
+    tag_id = Column(Integer)
+    name = Column(String)
+    slug = Column(String)
+    # время синхронизации, в которую тег последний раз был на сайте
+    seen_at = Column(TIMESTAMP(timezone=True))
+
+
+class ParseRunOrm(Model):
+    __tablename__ = "parse_runs"
+
+    id = Column(Integer, index=True, primary_key=True)
+    source = Column(String)
+    status = Column(String, server_default="running")
+    skipped = Column(Integer, server_default="0")
+    inserted = Column(Integer, server_default="0")
+    invalid = Column(Integer, server_default="0")
+    started_at = Column(TIMESTAMP(timezone=True), default=lambda: datetime.now(pytz.timezone("Europe/Moscow")))
+    finished_at = Column(TIMESTAMP(timezone=True), nullable=True)
+
+    files = relationship("ParseRunFileOrm", back_populates="run")
+
+    def __str__(self):
+        return f"{self.id}: {self.source}"
+
+
+class ParseRunFileOrm(Model):
+    __tablename__ = "parse_run_files"
+    __table_args__ = (UniqueConstraint("run_id", "name"),)
+
+    id = Column(Integer, index=True, primary_key=True)
+    run_id = Column(Integer, ForeignKey("parse_runs.id", ondelete="CASCADE"), index=True)
+    run = relationship(ParseRunOrm, back_populates="files")
+
+    name = Column(String)
+
+
+class SourceFileOrm(Model):
+    __tablename__ = "source_files"
+
+    id = Column(Integer, index=True, primary_key=True)
+    path = Column(String, unique=True)
+    mtime_ns = Column(BigInteger)
+    size = Column(BigInteger)
+    hash = Column(String, nullable=True)
@@ -4,6 +4,8 @@ from pydantic_settings import BaseSettings
 
 class PostsImagsLoaderConfig(BaseSettings):
     images_dir: str = Field(alias="POST_IMAGES_DIR")
+    # индекс изображений перечитывается, если в нём нет изображения поста, не чаще раза в столько секунд
+    index_ttl: float = Field(default=300.0, alias="POST_IMAGES_INDEX_TTL")
 
     class Config:
         extra = "allow"
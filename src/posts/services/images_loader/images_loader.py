@@ -1,39 +1,53 @@
 import asyncio
 import os
-
-import aiofiles
+import time
 
 from posts.services.images_loader.config import PostsImagsLoaderConfig
 
 
 class PostImagesLoader:
-    def __init__(self, config: PostsImagsLoaderConfig) -> None:
-        self._config = config
-        self._semaphore = asyncio.Semaphore(50)
-
-    async def read_file(self, filename: str, post_ids: list[int], images_dict: dict[int, bytes]) -> None:
-        post_id_string = os.path.splitext(filename)[0]
-        if not post_id_string.isdigit():
-            return
-
-        post_id = int(post_id_string)
-        if post_id not in post_ids:
-            return
-
-        path = os.path.join(self._config.images_dir, filename)
-        async with aiofiles.open(path, "rb") as file:
-            data = await file.read()
+    """
+    Изображения постов из POST_IMAGES_DIR, файл изображения называется по id поста (4162.jpg).
 
-        images_dict[post_id] = data
+    Индекс id поста -> имя файла строится одним обходом директории и перечитывается, только когда в нём нет
+    изображения поста, не чаще раза в POST_IMAGES_INDEX_TTL секунд. Индекс общий для всех сайтов и запросов
+    процесса, а сами изображения отправляются на сайты потоком из файлов, без чтения в память.
+    """
 
-    async def limited_read(self, filename: str, post_ids: list[int], images_dict: dict[int, bytes]) -> None:
-        async with self._semaphore:
-            await self.read_file(filename, post_ids, images_dict)
-
-    async def __call__(self, post_ids: list[int]) -> dict[int, bytes]:
-        files = os.listdir(self._config.images_dir)
-
-        images_dict: dict[int, bytes] = dict()
-
-        await asyncio.gather(*(self.limited_read(filename, post_ids, images_dict) for filename in files))
-        return images_dict
+    def __init__(self, config: PostsImagsLoaderConfig) -> None:
+        self._config = config
+        self._index: dict[int, str] = dict()
+        self._indexed_at: float | None = None
+        self._index_lock = asyncio.Lock()
+
+    def _scan(self) -> dict[int, str]:
+        images: dict[int, str] = dict()
+        with os.scandir(self._config.images_dir) as entries:
+            for entry in entries:
+                post_id_string = os.path.splitext(entry.name)[0]
+                if post_id_string.isdigit():
+                    images[int(post_id_string)] = entry.name
+
+        return images
+
+    async def _refresh_index(self) -> None:
+        async with self._index_lock:
+            if self._indexed_at is not None and time.monotonic() - self._indexed_at < self._config.index_ttl:
+                return
+            self._index = await asyncio.to_thread(self._scan)
+            self._indexed_at = time.monotonic()
+
+    async def path(self, post_id: int) -> str | None:
+        """Путь к изображению поста или None, если его нет."""
+        if post_id not in self._index:
+            await self._refresh_index()
+
+        filename = self._index.get(post_id)
+        if filename is None:
+            return None
+
+        return os.path.join(self._config.images_dir, filename)
+
+    def forget(self, post_id: int) -> None:
+        """Убирает изображение поста из индекса, например если его файл удалён: следующий поиск перечитает директорию."""
+        self._index.pop(post_id, None)
@@ -0,0 +1,16 @@
+from pydantic_settings import BaseSettings
+
+
+class PostsSenderConfig(BaseSettings):
+    # размер очередей между стадиями отправки
+    SENDER_QUEUE_SIZE: int = 100
+    # количество параллельных задач стадий создания тегов и поиска файлов изображений
+    SENDER_TAG_WORKERS: int = 4
+    SENDER_IMAGE_READERS: int = 4
+    # статус отправленных постов сохраняется батчем, когда он заполнен или ждёт дольше SENDER_COMMIT_MAX_WAIT мс
+    SENDER_COMMIT_BATCH_SIZE: int = 50
+    SENDER_COMMIT_MAX_WAIT: int = 1000
+
+    class Config:
+        extra = "allow"
+        env_file = ".env"
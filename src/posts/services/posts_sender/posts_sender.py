@@ -1,5 +1,9 @@
 import asyncio
-from functools import lru_cache
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any
 
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
@@ -9,27 +13,43 @@ from posts.dto.site import Site
 from posts.interfaces.logger import Logger
 from posts.persistence.data_mappers.site_post_data_mapper import SitePostDataMapper
 from posts.services.images_loader.images_loader import PostImagesLoader
+from posts.services.posts_sender.config import PostsSenderConfig
 from posts.services.posts_sender.send_single_post import SendSinglePostToSite
 from posts.services.wordpress_service.service import WordpressService
+from posts.services.wordpress_service.tag_catalog import TagCatalog
+
+
+@dataclass
+class _PostJob:
+    post: PostWithTags
+    image_path: str | None = None
+    featured_media: Any | None = None
 
 
 class PostsSender:
     """
     Отправляет список постов на указанный WordPress-сайт и сохраняет в бд статус отправленных постов
 
-    Класс выполняет следющую задачу:
-      - загружает изображения для переданных постов;
-      - вызывает SendSinglePostToSite для каждого поста;
-      - собирает результаты и возвращает PostsSenderResponse.
+    Посты проходят конвейер стадий, связанных ограниченными очередями:
+      - создание недостающих тегов (каждый тег создаётся один раз, посты с ним ждут его создания);
+      - поиск файла изображения поста;
+      - загрузка изображения в медиатеку сайта потоком из файла, не читая его в память;
+      - создание поста;
+      - сохранение статуса отправленных постов батчами в отдельной сессии.
+
+    У каждой стадии своя параллельность: стадии запросов к сайту держат до max_connections_limit задач,
+    а число одновременных запросов ограничивает адаптивный лимитер сайта. Так медленный запрос задерживает
+    только свой пост, а окно соединений с сайтом остаётся заполненным.
 
     Используется внутри юзкейсов, отвечающих за массовую отправку постов постов.
 
     Параметры:
-        - images_loader (PostImagesLoader): асинхронный сервис, который по списку id возвращает dict {id: bytes}.
+        - images_loader (PostImagesLoader): сервис чтения изображений постов.
         - send_single_post (SendSinglePostToSite): сервис, отправляющий один пост на сайт.
         - logger (Logger): логер ошибок
         - wordpress_service (WordpressService): - сервис для работы с WordPress RestAPI
-        - transaction (Transaction): - транзакция базы данных
+        - session_maker (async_sessionmaker): - фабрика сессий для сохранения статуса отправки
+        - config (PostsSenderConfig): - размеры очередей, параллельность стадий и батч сохранения статуса
     """
 
     def __init__(
@@ -39,123 +59,174 @@ class PostsSender:
         logger: Logger,
         wordpress_service: WordpressService,
         session_maker: async_sessionmaker[AsyncSession],
+        config: PostsSenderConfig,
     ) -> None:
         self._images_loader = images_loader
         self._send_single_post = send_single_post
         self._logger = logger
         self._wordpress_service = wordpress_service
-        self._batch_size = 50
         self._session_maker = session_maker
-        self._lock = asyncio.Lock()
-
-    @staticmethod
-    @lru_cache
-    def get_semaphore(site: Site) -> asyncio.Semaphore:
-        return asyncio.Semaphore(value=site.max_connections_limit)
+        self._config = config
+        # количество успешно отправленных постов за время жизни сервиса
+        self.sent = 0
 
-    async def send_tag_task(self, site: Site, tag: Tag, access_token: str, wordpress_tags: list[Tag]) -> None:
-        async with self.get_semaphore(site):
+    async def send_tag_task(self, site: Site, tag: Tag, access_token: str, wordpress_tags: TagCatalog) -> None:
+        async with self._wordpress_service.limiter(site):
             tag_response = await self._wordpress_service.send_tag(site, tag, access_token=access_token)
-            if tag_response.success:
-                async with self._lock:
-                    wordpress_tags.append(tag_response.data)
-            else:
-                await self._logger.log(
-                    title=f"Ошибка при отправлении тэга с id='{tag.id}' на сайт '{site.address}'",
-                    message=tag_response.error_message,
-                )
+        if tag_response.success:
+            wordpress_tags.add(tag_response.data)
+        else:
+            await self._logger.log(
+                title=f"Ошибка при отправлении тэга с id='{tag.id}' на сайт '{site.address}'",
+                message=tag_response.error_message,
+            )
 
-    async def send_post_task(
-        self,
-        post: PostWithTags,
-        site: Site,
-        error_sended_posts_ids: list[int],
-        post_image: bytes,
-        access_token: str,
-        success_sended_posts_ids: list[int],
-        wordpress_tags: list[Tag],
+    @staticmethod
+    async def _stage(
+        handler: Callable[[_PostJob], Awaitable[Any]],
+        in_q: asyncio.Queue,
+        out_q: asyncio.Queue,
+        workers: int,
+        next_workers: int,
     ) -> None:
-        async with self.get_semaphore(site):
-            response = await self._send_single_post(
-                site=site, post=post, image=post_image, wordpress_tags=wordpress_tags, access_token=access_token
-            )
-            async with self._lock:
-                if response.success:
-                    success_sended_posts_ids.append(post.id)
-                else:
-                    error_sended_posts_ids.append(post.id)
+        """Обрабатывает задания из in_q в workers задач и передаёт результаты, кроме None, в out_q."""
 
-    async def send_posts_batch(
-        self,
-        batch_posts: list[PostWithTags],
-        images_dict: dict[str, bytes],
-        site: Site,
-        wordpress_tags: list[Tag],
-        access_token: str,
-    ):
-        """
-        Метод, который отправляет батч постов на сайт и фиксирует успешные отправки
-        в состоянии бд, для лучшей констистентности данных, чтоб не зависеть от результата
-        выполнения отправки других батчей
-        """
-
-        success_sended_posts_ids: list[int] = []
-        error_sended_posts_ids: list[int] = []
-
-        tasks = []
-
-        for post in batch_posts:
-            post_image = images_dict.get(post.id)
-            tasks.append(
-                self.send_post_task(
-                    post=post,
-                    site=site,
-                    success_sended_posts_ids=success_sended_posts_ids,
-                    error_sended_posts_ids=error_sended_posts_ids,
-                    post_image=post_image,
-                    access_token=access_token,
-                    wordpress_tags=wordpress_tags,
-                )
-            )
+        async def worker() -> None:
+            while (job := await in_q.get()) is not None:
+                result = await handler(job)
+                if result is not None:
+                    await out_q.put(result)
+
+        await asyncio.gather(*(worker() for _ in range(workers)))
+        for _ in range(next_workers):
+            await out_q.put(None)
 
-        await asyncio.gather(*tasks)
+    async def _commit_sended(self, site: Site, post_ids: list[int]) -> None:
         async with self._session_maker() as session:
-            data_mapper = SitePostDataMapper(session=session)
-            print(success_sended_posts_ids, "ids")
-            await data_mapper.change_sended(site.id, post_ids=success_sended_posts_ids)
+            await SitePostDataMapper(session=session).change_sended(site.id, post_ids=post_ids)
             await session.commit()
 
+    async def _commit_stage(self, site: Site, in_q: asyncio.Queue, sended_ids: list[int]) -> None:
+        """Сохраняет статус отправленных постов батчами: полный батч или по истечении SENDER_COMMIT_MAX_WAIT."""
+        max_wait = self._config.SENDER_COMMIT_MAX_WAIT / 1000
+        batch: list[int] = []
+        deadline = 0.0
+        done = False
+        while not done:
+            timed_out = False
+            try:
+                post_id = await asyncio.wait_for(in_q.get(), max(deadline - time.monotonic(), 0) if batch else None)
+            except TimeoutError:
+                timed_out = True
+            else:
+                if post_id is None:
+                    done = True
+                else:
+                    if not batch:
+                        deadline = time.monotonic() + max_wait
+                    batch.append(post_id)
+
+            if batch and (done or timed_out or len(batch) >= self._config.SENDER_COMMIT_BATCH_SIZE):
+                await self._commit_sended(site, batch)
+                sended_ids.extend(batch)
+                batch = []
+
     async def __call__(
-        self, site: Site, posts: list[PostWithTags], wordpress_tags: list[Tag], access_token: str
+        self, site: Site, posts: list[PostWithTags], wordpress_tags: TagCatalog, access_token: str
     ) -> PostsSenderResponse:
-        for i in range(0, len(posts), self._batch_size):
-            batch_posts = posts[i : i + self._batch_size]
-            print(len(batch_posts), "batched_posts")
-
-            send_tags_tasks = []
-
-            for post in batch_posts:
-                for tag in post.tags:
-                    if tag not in wordpress_tags:
-                        send_tags_tasks.append(
-                            self.send_tag_task(site, tag, access_token=access_token, wordpress_tags=wordpress_tags)
-                        )
-
-            print("start send tags")
-            await asyncio.gather(*send_tags_tasks)
-            print("sended tags")
-
-            post_ids = [post.id for post in batch_posts]
-            print("getting images")
-            images_dict = await self._images_loader(post_ids)
-            print("successfully load images")
-
-            await self.send_posts_batch(
-                batch_posts=batch_posts,
-                images_dict=images_dict,
-                site=site,
-                access_token=access_token,
-                wordpress_tags=wordpress_tags,
+        start = time.perf_counter()
+        tag_tasks: dict[str, asyncio.Task] = dict()
+        error_ids: list[int] = []
+        sended_ids: list[int] = []
+
+        async def ensure_tags(job: _PostJob) -> _PostJob:
+            for tag in job.post.tags:
+                if tag.slug not in tag_tasks and tag not in wordpress_tags:
+                    tag_tasks[tag.slug] = asyncio.create_task(
+                        self.send_tag_task(site, tag, access_token=access_token, wordpress_tags=wordpress_tags)
+                    )
+            await asyncio.gather(*(tag_tasks[tag.slug] for tag in job.post.tags if tag.slug in tag_tasks))
+            return job
+
+        async def find_image(job: _PostJob) -> _PostJob:
+            job.image_path = await self._images_loader.path(job.post.id)
+            return job
+
+        async def upload_image(job: _PostJob) -> _PostJob | None:
+            if job.image_path is None:
+                return job
+            try:
+                image = await asyncio.to_thread(open, job.image_path, "rb")
+            except OSError as e:
+                # файл удалён или переименован после построения индекса: пост отправляется без изображения
+                self._images_loader.forget(job.post.id)
+                await self._logger.log(
+                    title=f"Не удалось открыть изображение поста с id='{job.post.id}'", message=str(e)
+                )
+                return job
+            async with self._wordpress_service.limiter(site):
+                try:
+                    response = await self._send_single_post.upload_image(site, job.post, image, access_token)
+                finally:
+                    image.close()
+            if not response.success:
+                error_ids.append(job.post.id)
+                return None
+            job.featured_media = response.data
+            return job
+
+        async def create_post(job: _PostJob) -> int | None:
+            async with self._wordpress_service.limiter(site):
+                response = await self._send_single_post.create_post(
+                    site,
+                    job.post,
+                    wordpress_tags=wordpress_tags,
+                    access_token=access_token,
+                    featured_media=job.featured_media,
+                )
+            if not response.success:
+                error_ids.append(job.post.id)
+                return None
+            self.sent += 1
+            return job.post.id
+
+        site_workers = site.max_connections_limit
+        queue_size = self._config.SENDER_QUEUE_SIZE
+        tags_q, images_q, upload_q, create_q, commit_q = (asyncio.Queue(maxsize=queue_size) for _ in range(5))
+
+        async def feed() -> None:
+            for post in posts:
+                await tags_q.put(_PostJob(post=post))
+            for _ in range(self._config.SENDER_TAG_WORKERS):
+                await tags_q.put(None)
+
+        tasks = [
+            asyncio.create_task(coroutine)
+            for coroutine in (
+                feed(),
+                self._stage(
+                    ensure_tags, tags_q, images_q, self._config.SENDER_TAG_WORKERS, self._config.SENDER_IMAGE_READERS
+                ),
+                self._stage(find_image, images_q, upload_q, self._config.SENDER_IMAGE_READERS, site_workers),
+                self._stage(upload_image, upload_q, create_q, site_workers, site_workers),
+                self._stage(create_post, create_q, commit_q, site_workers, 1),
+                self._commit_stage(site, commit_q, sended_ids),
             )
-
-        return PostsSenderResponse(success_sended_posts_ids=[], error_sended_posts_ids=[])
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            # упавшая стадия больше не читает свою очередь, остальные стадии остановятся только отменой
+            for task in [*tasks, *tag_tasks.values()]:
+                task.cancel()
+            raise
+
+        logging.info(
+            "Sent %d of %d posts to %s in %.3f s",
+            len(sended_ids),
+            len(posts),
+            site.address,
+            time.perf_counter() - start,
+        )
+
+        return PostsSenderResponse(success_sended_posts_ids=sended_ids, error_sended_posts_ids=error_ids)
@@ -1,8 +1,11 @@
-from posts.dto.operation_result import BaseOperationResult
-from posts.dto.post import PostWithTags, Tag
+from typing import BinaryIO
+
+from posts.dto.operation_result import BaseOperationResult, OperationResult
+from posts.dto.post import PostWithTags
 from posts.dto.site import Site
 from posts.interfaces.logger import Logger
 from posts.services.wordpress_service.service import WordpressService
+from posts.services.wordpress_service.tag_catalog import TagCatalog
 from posts.usecases.posts.send_to_site.adapter import WordpressPostAdapter
 
 
@@ -26,23 +29,15 @@ class SendSinglePostToSite:
         self._adapter = adapter
         self._logger = logger
 
-    async def __call__(
-        self, site: Site, post: PostWithTags, wordpress_tags: list[Tag], access_token: str, image: bytes | None = None
-    ) -> BaseOperationResult:
-        featured_media = None
-
-        if image is not None:
-            image_name = f"{post.id}.jpg"
-
-            featured_media_response = await self._wordpress_service.send_post_image(
-                site, image_name, image, access_token=access_token
-            )
-
-            if featured_media_response.success:
-                featured_media = featured_media_response.data
-            else:
-                return BaseOperationResult(success=False)
+    async def upload_image(
+        self, site: Site, post: PostWithTags, image: bytes | BinaryIO, access_token: str
+    ) -> OperationResult:
+        """Загружает изображение поста (байты или открытый файл) в медиатеку сайта, data результата - id медиафайла."""
+        return await self._wordpress_service.send_post_image(site, f"{post.id}.jpg", image, access_token=access_token)
 
+    async def create_post(
+        self, site: Site, post: PostWithTags, wordpress_tags: TagCatalog, access_token: str, featured_media=None
+    ) -> BaseOperationResult:
         wordpress_post = self._adapter.execute(post=post, wp_tags=wordpress_tags, featured_media=featured_media)
 
         response = await self._wordpress_service.send_post(post=wordpress_post, site=site, access_token=access_token)
@@ -55,3 +50,25 @@ class SendSinglePostToSite:
                 message=response.error_message,
             )
             return BaseOperationResult(success=False)
+
+    async def __call__(
+        self,
+        site: Site,
+        post: PostWithTags,
+        wordpress_tags: TagCatalog,
+        access_token: str,
+        image: bytes | BinaryIO | None = None,
+    ) -> BaseOperationResult:
+        featured_media = None
+
+        if image is not None:
+            featured_media_response = await self.upload_image(site, post, image, access_token=access_token)
+
+            if featured_media_response.success:
+                featured_media = featured_media_response.data
+            else:
+                return BaseOperationResult(success=False)
+
+        return await self.create_post(
+            site, post, wordpress_tags=wordpress_tags, access_token=access_token, featured_media=featured_media
+        )
@@ -0,0 +1,96 @@
+import asyncio
+import logging
+import time
+
+
+class AdaptiveLimiter:
+    """
+    Ограничение количества одновременных запросов к сайту с окном по AIMD, как в TCP.
+
+    Каждый быстрый успешный ответ увеличивает окно на 1/window, то есть примерно на единицу за окно ответов.
+    Ответ 429, 5xx или медленнее target_latency, а также таймаут и ошибка соединения уменьшают окно в backoff_factor раз, но не чаще раза
+    за cooldown секунд, чтобы одна пачка ошибок не сбрасывала окно до минимума. Окно держится
+    между floor и ceiling, начинается с floor, и каждое изменение его целой части пишется в лог.
+
+    Args:
+        name (str): Имя для логов (адрес сайта).
+        floor (int): Минимальное количество одновременных запросов.
+        ceiling (int): Максимальное количество одновременных запросов.
+        target_latency (float): Время ответа в секундах, начиная с которого сайт считается перегруженным.
+        backoff_factor (float): Во сколько раз уменьшается окно при перегрузке.
+        cooldown (float): Минимальный интервал между уменьшениями окна, с.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        floor: int,
+        ceiling: int,
+        target_latency: float,
+        backoff_factor: float = 0.5,
+        cooldown: float = 1.0,
+    ) -> None:
+        self._name = name
+        self._floor = max(floor, 1)
+        self._ceiling = max(ceiling, self._floor)
+        self._target_latency = target_latency
+        self._backoff_factor = backoff_factor
+        self._cooldown = cooldown
+        self._window = float(self._floor)
+        self._in_flight = 0
+        self._last_decrease = 0.0
+        self._condition = asyncio.Condition()
+
+    @property
+    def window(self) -> int:
+        """Текущее количество разрешённых одновременных запросов."""
+        return int(self._window)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    async def __aenter__(self) -> None:
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._in_flight < self.window)
+            self._in_flight += 1
+
+    async def __aexit__(self, *exc_info) -> None:
+        async with self._condition:
+            self._in_flight -= 1
+            self._condition.notify_all()
+
+    async def record(self, status_code: int, latency: float) -> None:
+        """Учитывает ответ сайта и пересчитывает окно."""
+        overloaded = status_code == 429 or status_code >= 500 or latency > self._target_latency
+        await self._update(overloaded, f"status {status_code}", latency)
+
+    async def record_error(self, error: Exception, latency: float) -> None:
+        """Учитывает таймаут или ошибку соединения как перегрузку сайта: ответа, который увидел бы record, нет."""
+        await self._update(True, type(error).__name__, latency)
+
+    async def _update(self, overloaded: bool, outcome: str, latency: float) -> None:
+        previous = self.window
+        if overloaded:
+            now = time.monotonic()
+            if now - self._last_decrease < self._cooldown:
+                return
+            self._last_decrease = now
+            self._window = max(self._window * self._backoff_factor, self._floor)
+        else:
+            self._window = min(self._window + 1 / self._window, self._ceiling)
+
+        if self.window == previous:
+            return
+
+        logging.info(
+            "Site %s concurrency window %d -> %d (%s, latency %.3f s)",
+            self._name,
+            previous,
+            self.window,
+            outcome,
+            latency,
+        )
+        if self.window > previous:
+            async with self._condition:
+                self._condition.notify_all()
@@ -0,0 +1,74 @@
+import logging
+import time
+from typing import Literal
+
+from posts.exceptions import SiteUnavailableError
+
+CircuitState = Literal["closed", "open", "half_open"]
+
+
+class CircuitBreaker:
+    """
+    Автоматический выключатель запросов к сайту.
+
+    После failure_threshold неудачных запросов подряд (сетевая ошибка или 5xx после всех повторов) выключатель
+    размыкается, и запросы к сайту сразу завершаются SiteUnavailableError, не дожидаясь таймаутов.
+    Через reset_timeout секунд к сайту пропускается один пробный запрос: успех замыкает выключатель,
+    неудача снова размыкает его на reset_timeout. Смена состояния пишется в лог.
+
+    Args:
+        name (str): Имя для логов и ошибок (адрес сайта).
+        failure_threshold (int): Количество неудачных запросов подряд до размыкания.
+        reset_timeout (float): Через сколько секунд после размыкания пропускается пробный запрос.
+    """
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float) -> None:
+        self._name = name
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._state: CircuitState = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+
+    @property
+    def state(self) -> CircuitState:
+        return self._state
+
+    def _set_state(self, state: CircuitState) -> None:
+        if state != self._state:
+            logging.info("Site %s circuit %s -> %s", self._name, self._state, state)
+        self._state = state
+
+    def acquire(self) -> bool:
+        """Разрешает запрос или бросает SiteUnavailableError. Возвращает True для пробного запроса."""
+        if self._state == "open":
+            if time.monotonic() - self._opened_at < self._reset_timeout:
+                raise SiteUnavailableError(f"Сайт {self._name} недоступен, запросы приостановлены")
+            self._set_state("half_open")
+
+        if self._state == "half_open":
+            if self._probing:
+                raise SiteUnavailableError(f"Сайт {self._name} недоступен, выполняется пробный запрос")
+            self._probing = True
+            return True
+
+        return False
+
+    def release(self, probe: bool, success: bool | None) -> None:
+        """Учитывает исход запроса: True - сайт ответил, False - сайт недоступен, None - исход неизвестен."""
+        if probe:
+            self._probing = False
+
+        if success is None:
+            return
+
+        if success:
+            self._failures = 0
+            self._set_state("closed")
+            return
+
+        self._failures += 1
+        if self._state == "half_open" or self._failures >= self._failure_threshold:
+            self._opened_at = time.monotonic()
+            self._set_state("open")
@@ -0,0 +1,111 @@
+import importlib.util
+import logging
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+import httpx
+
+from posts.dto.site import Site
+from posts.services.wordpress_service.adaptive_limiter import AdaptiveLimiter
+from posts.services.wordpress_service.circuit_breaker import CircuitBreaker
+from posts.services.wordpress_service.config import WordpressClientsConfig
+
+
+class WordpressClients:
+    """
+    Реестр HTTP-клиентов WordPress сайтов: по одному httpx.AsyncClient, AdaptiveLimiter и CircuitBreaker
+    на адрес сайта.
+
+    Клиент держит keep-alive соединения, поэтому запросы к сайту не повторяют DNS, TCP и TLS handshake.
+    Размер пула соединений равен max_connections_limit сайта. Клиенты живут, пока живёт реестр (APP-скоуп
+    контейнера), и закрываются в aclose. С WORDPRESS_POOLED_CLIENTS=false на каждый запрос создаётся
+    и закрывается свой клиент, как раньше.
+
+    Каждый ответ клиента сайта (статус и время до заголовков) передаётся в его AdaptiveLimiter,
+    окно которого ограничено min_connections_limit и max_connections_limit сайта. Запросы без ответа
+    (таймауты и ошибки соединения) хук ответа не видит, их учитывает WordpressService._send.
+    """
+
+    def __init__(self, config: WordpressClientsConfig, transport: httpx.AsyncBaseTransport | None = None) -> None:
+        self._config = config
+        # транспорт клиентов, подменяется в тестах (httpx.MockTransport)
+        self._transport = transport
+        self._clients: dict[str, httpx.AsyncClient] = {}
+        self._limiters: dict[str, AdaptiveLimiter] = {}
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._http2 = config.WORDPRESS_HTTP2
+        if self._http2 and importlib.util.find_spec("h2") is None:
+            logging.warning("WORDPRESS_HTTP2 requires the h2 package, falling back to HTTP/1.1")
+            self._http2 = False
+
+    def limiter(self, site: Site) -> AdaptiveLimiter:
+        limiter = self._limiters.get(site.address)
+        if limiter is None:
+            limiter = self._limiters[site.address] = AdaptiveLimiter(
+                name=site.address,
+                floor=site.min_connections_limit,
+                ceiling=site.max_connections_limit,
+                target_latency=self._config.WORDPRESS_TARGET_LATENCY,
+                backoff_factor=self._config.WORDPRESS_BACKOFF_FACTOR,
+                cooldown=self._config.WORDPRESS_BACKOFF_COOLDOWN,
+            )
+
+        return limiter
+
+    def breaker(self, site: Site) -> CircuitBreaker:
+        breaker = self._breakers.get(site.address)
+        if breaker is None:
+            breaker = self._breakers[site.address] = CircuitBreaker(
+                name=site.address,
+                failure_threshold=self._config.WORDPRESS_BREAKER_THRESHOLD,
+                reset_timeout=self._config.WORDPRESS_BREAKER_RESET_TIMEOUT,
+            )
+
+        return breaker
+
+    def _create(self, site: Site) -> httpx.AsyncClient:
+        limits = httpx.Limits(
+            max_connections=site.max_connections_limit,
+            max_keepalive_connections=site.max_connections_limit,
+            keepalive_expiry=self._config.WORDPRESS_KEEPALIVE_EXPIRY,
+        )
+        limiter = self.limiter(site)
+
+        async def on_request(request: httpx.Request) -> None:
+            request.extensions["started_at"] = time.perf_counter()
+
+        async def on_response(response: httpx.Response) -> None:
+            latency = time.perf_counter() - response.request.extensions["started_at"]
+            await limiter.record(response.status_code, latency)
+
+        return httpx.AsyncClient(
+            timeout=self._config.WORDPRESS_TIMEOUT,
+            limits=limits,
+            http2=self._http2,
+            transport=self._transport,
+            event_hooks={"request": [on_request], "response": [on_response]},
+        )
+
+    def get(self, site: Site) -> httpx.AsyncClient:
+        client = self._clients.get(site.address)
+        if client is None:
+            client = self._clients[site.address] = self._create(site)
+
+        return client
+
+    @asynccontextmanager
+    async def session(self, site: Site) -> AsyncIterator[httpx.AsyncClient]:
+        """Клиент для запросов к сайту. Общий клиент не закрывается после запроса."""
+        if not self._config.WORDPRESS_POOLED_CLIENTS:
+            async with self._create(site) as client:
+                yield client
+            return
+
+        yield self.get(site)
+
+    async def aclose(self) -> None:
+        clients = list(self._clients.values())
+        self._clients.clear()
+        for client in clients:
+            await client.aclose()
@@ -0,0 +1,26 @@
+from pydantic_settings import BaseSettings
+
+
+class WordpressClientsConfig(BaseSettings):
+    # держать на каждый сайт keep-alive клиент с пулом соединений, false - новый клиент на каждый запрос
+    WORDPRESS_POOLED_CLIENTS: bool = True
+    # HTTP/2 к сайтам, нужен пакет h2 (httpx[http2]), без него используется HTTP/1.1
+    WORDPRESS_HTTP2: bool = False
+    WORDPRESS_TIMEOUT: float = 60.0
+    # сколько секунд простаивающее соединение остаётся в пуле
+    WORDPRESS_KEEPALIVE_EXPIRY: float = 30.0
+    # адаптивное окно одновременных запросов к сайту (AdaptiveLimiter): ответ медленнее WORDPRESS_TARGET_LATENCY
+    # секунд, 429 или 5xx уменьшает окно в WORDPRESS_BACKOFF_FACTOR раз, не чаще раза в WORDPRESS_BACKOFF_COOLDOWN секунд
+    WORDPRESS_TARGET_LATENCY: float = 5.0
+    WORDPRESS_BACKOFF_FACTOR: float = 0.5
+    WORDPRESS_BACKOFF_COOLDOWN: float = 1.0
+    # повторы запросов (RetryPolicy): количество попыток и границы экспоненциальной задержки, с
+    WORDPRESS_RETRY_ATTEMPTS: int = 4
+    WORDPRESS_RETRY_BASE_DELAY: float = 0.5
+    WORDPRESS_RETRY_MAX_DELAY: float = 10.0
+    # автоматический выключатель сайта (CircuitBreaker): неудачных запросов подряд до размыкания
+    # и через сколько секунд пропускается пробный запрос
+    WORDPRESS_BREAKER_THRESHOLD: int = 5
+    WORDPRESS_BREAKER_RESET_TIMEOUT: float = 30.0
+    # зеркало тегов сайта (таблица site_tags) обновляется новыми тегами сайта, а полностью - раз в столько секунд
+    WORDPRESS_TAGS_FULL_SYNC_INTERVAL: float = 86400.0
@@ -1,26 +1,68 @@
 import asyncio
+import logging
+from datetime import datetime
 
-from posts.dto.post import Tag
+import pytz
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from posts.dto.operation_result import OperationResult
 from posts.dto.site import Site
+from posts.persistence.data_mappers.site_tag_data_mapper import SiteTagDataMapper
+from posts.services.wordpress_service.config import WordpressClientsConfig
 from posts.services.wordpress_service.service import WordpressService
+from posts.services.wordpress_service.tag_catalog import TagCatalog
 
 
 class FetchWordpressTags:
-    def __init__(self, wordpress_service: WordpressService) -> None:
+    """
+    Теги WordPress сайтов из зеркала site_tags.
+
+    Перед чтением зеркало сайта дополняется тегами, созданными на сайте после последней синхронизации
+    (обычно это один запрос), а пустое или старше WORDPRESS_TAGS_FULL_SYNC_INTERVAL секунд зеркало синхронизируется
+    полностью: теги, удалённые с сайта, удаляются и из зеркала. Если сайт не ответил, используется зеркало.
+    """
+
+    def __init__(
+        self,
+        wordpress_service: WordpressService,
+        session_maker: async_sessionmaker[AsyncSession],
+        config: WordpressClientsConfig,
+    ) -> None:
         self._wordpress_service = wordpress_service
-        self._lock = asyncio.Lock()
+        self._session_maker = session_maker
+        self._config = config
+
+    async def _site_tags(self, site: Site) -> TagCatalog:
+        timezone = pytz.timezone("Europe/Moscow")
+        now = datetime.now(timezone)
+
+        async with self._session_maker() as session:
+            data_mapper = SiteTagDataMapper(session=session)
+
+            synced_at = await data_mapper.synced_at(site.id)
+            if synced_at is not None and synced_at.tzinfo is None:
+                synced_at = timezone.localize(synced_at)
+            full_sync = (
+                synced_at is None or (now - synced_at).total_seconds() > self._config.WORDPRESS_TAGS_FULL_SYNC_INTERVAL
+            )
+
+            if full_sync:
+                tags = await self._wordpress_service.all_tags(site)
+            else:
+                tags = await self._wordpress_service.new_tags(site, after_id=await data_mapper.max_tag_id(site.id) or 0)
 
-    async def _get_tags_task(self, tags: dict[str, list[Tag]], site: Site):
-        new_tags = await self._wordpress_service.all_tags(site)
-        async with self._lock:
-            tags[site.address] = new_tags
+            if isinstance(tags, OperationResult):
+                logging.warning("Failed to sync tags of site %s: %s", site.address, tags.error_message)
+            else:
+                await data_mapper.upsert(site.id, tags, seen_at=now)
+                if full_sync:
+                    await data_mapper.finish_full_sync(site.id, synced_at=now)
+                await session.commit()
+                logging.info("Synced %d tags of site %s (%s)", len(tags), site.address, "full" if full_sync else "new")
 
-    async def __call__(self, sites: list[Site]) -> dict[str, list[Tag]]:
-        tags: dict[str, list[Tag]] = dict()
-        tasks = []
+            return TagCatalog(await data_mapper.tags(site.id))
 
-        for site in sites:
-            tasks.append(self._get_tags_task(tags, site))
+    async def __call__(self, sites: list[Site]) -> dict[str, TagCatalog]:
+        catalogs = await asyncio.gather(*(self._site_tags(site) for site in sites))
 
-        await asyncio.gather(*tasks)
-        return tags
+        return {site.address: catalog for site, catalog in zip(sites, catalogs)}
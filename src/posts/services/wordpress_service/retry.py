@@ -0,0 +1,42 @@
+import random
+from collections.abc import Iterator
+
+import httpx
+
+# ответы, после которых запрос имеет смысл повторить
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+# ответы, с которыми сайт точно не выполнил запрос: такой запрос можно повторить, даже если он не идемпотентный
+REJECTED_STATUSES = frozenset({429, 503})
+
+
+class RetryPolicy:
+    """
+    Повторы запросов с экспоненциальной задержкой и полным джиттером: перед n-м повтором ждём случайное время
+    от 0 до min(max_delay, base_delay * 2**n), чтобы параллельные запросы к сайту не повторялись разом.
+
+    Args:
+        attempts (int): Максимальное количество попыток, включая первую.
+        base_delay (float): Базовая задержка, с.
+        max_delay (float): Максимальная задержка, с. Ограничивает и Retry-After.
+    """
+
+    def __init__(self, attempts: int, base_delay: float, max_delay: float) -> None:
+        self._attempts = attempts
+        self._base_delay = base_delay
+        self._max_delay = max_delay
+
+    def delays(self) -> Iterator[float]:
+        for n in range(self._attempts - 1):
+            yield random.uniform(0, min(self._max_delay, self._base_delay * 2**n))
+
+    def retry_after(self, response: httpx.Response, delay: float) -> float:
+        """Задержка из заголовка Retry-After (в секундах), если сайт его прислал."""
+        try:
+            return min(max(float(response.headers["Retry-After"]), delay), self._max_delay)
+        except (KeyError, ValueError):
+            return delay
+
+
+def is_unsent(error: httpx.TransportError) -> bool:
+    """Ошибка до отправки запроса: сайт его не получил, и повтор безопасен."""
+    return isinstance(error, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout))
@@ -1,8 +1,12 @@
+import asyncio
 import json
 import sys
+import time
 import traceback
+from collections.abc import Awaitable, Callable
 from dataclasses import asdict
-from urllib.parse import unquote
+from typing import BinaryIO
+from urllib.parse import quote, unquote
 
 import httpx
 
@@ -10,38 +14,195 @@ from posts.dto.operation_result import OperationResult
 from posts.dto.post import Post, Tag
 from posts.dto.site import Site
 from posts.dto.wordpress_post import WordpressPostDTO
+from posts.exceptions import SiteUnavailableError
+from posts.services.wordpress_service.adaptive_limiter import AdaptiveLimiter
+from posts.services.wordpress_service.clients import WordpressClients
+from posts.services.wordpress_service.retry import (
+    REJECTED_STATUSES,
+    RETRY_STATUSES,
+    RetryPolicy,
+    is_unsent,
+)
 
 
 class WordpressService:
+    """
+    Запросы к WordPress REST API сайтов.
+
+    Все запросы идут через _request: ответы 429 и 5xx и сетевые ошибки повторяются по RetryPolicy, а запросы
+    к сайту, который перестал отвечать, сразу завершаются через его CircuitBreaker. Неидемпотентные запросы
+    (создание постов, тегов и изображений) повторяются, только если сайт их точно не выполнил.
+    """
+
+    def __init__(self, clients: WordpressClients, retry_policy: RetryPolicy) -> None:
+        self._clients = clients
+        self._retry_policy = retry_policy
+
+    def limiter(self, site: Site) -> AdaptiveLimiter:
+        """Адаптивное ограничение одновременных операций с сайтом."""
+        return self._clients.limiter(site)
+
+    async def _send(
+        self,
+        site: Site,
+        method: str,
+        url: str,
+        idempotent: bool,
+        applied: Callable[[], Awaitable[bool]] | None,
+        **kwargs,
+    ) -> httpx.Response | None:
+        delays = self._retry_policy.delays()
+        while True:
+            started_at = time.perf_counter()
+            try:
+                async with self._clients.session(site) as session:
+                    response = await session.request(method, url, **kwargs)
+            except httpx.TransportError as e:
+                await self.limiter(site).record_error(e, time.perf_counter() - started_at)
+                delay = next(delays, None)
+                if delay is None:
+                    raise
+                if not (idempotent or is_unsent(e)):
+                    if applied is None:
+                        raise
+                    if await applied():
+                        return None
+            else:
+                if response.status_code not in RETRY_STATUSES:
+                    return response
+
+                delay = next(delays, None)
+                if delay is None:
+                    return response
+                if not (idempotent or response.status_code in REJECTED_STATUSES):
+                    if applied is None:
+                        return response
+                    if await applied():
+                        return None
+                delay = self._retry_policy.retry_after(response, delay)
+
+            await asyncio.sleep(delay)
+
+    async def _request(
+        self,
+        site: Site,
+        method: str,
+        url: str,
+        idempotent: bool,
+        applied: Callable[[], Awaitable[bool]] | None = None,
+        **kwargs,
+    ) -> httpx.Response | None:
+        """
+        Запрос к сайту с повторами и автоматическим выключателем.
+
+        Неидемпотентный запрос после неоднозначной ошибки (502, 504, обрыв соединения) повторяется, только если
+        applied подтверждает, что он не выполнен. Если applied вернул True, возвращается None.
+        Бросает SiteUnavailableError, если выключатель сайта разомкнут.
+        """
+        breaker = self._clients.breaker(site)
+        probe = breaker.acquire()
+        success: bool | None = None
+        try:
+            response = await self._send(site, method, url, idempotent=idempotent, applied=applied, **kwargs)
+            success = response is None or response.status_code < 500
+            return response
+        except httpx.TransportError:
+            success = False
+            raise
+        finally:
+            breaker.release(probe, success)
+
     async def fetch_access_token(self, site: Site) -> str:
-        async with httpx.AsyncClient(timeout=60) as session:
-            response = await session.post(
-                f"{site.address}/wp-json/jwt-auth/v1/token", json={"username": site.username, "password": site.password}
+        # получение токена ничего не меняет на сайте, его можно повторять
+        response = await self._request(
+            site,
+            "POST",
+            f"{site.address}/wp-json/jwt-auth/v1/token",
+            idempotent=True,
+            json={"username": site.username, "password": site.password},
+        )
+        data = response.json()
+
+        return data["token"]
+
+    @staticmethod
+    def _is_past_last_page(response: httpx.Response) -> bool:
+        if response.status_code != 400:
+            return False
+        try:
+            return response.json().get("code") == "rest_post_invalid_page_number"
+        except Exception:
+            return False
+
+    async def _tags_page(self, site: Site, page: int, order: str = "asc") -> tuple[list[Tag], int | None]:
+        """Страница тегов по возрастанию или убыванию id и количество страниц из заголовка X-WP-TotalPages."""
+        async with self.limiter(site):
+            response = await self._request(
+                site,
+                "GET",
+                f"{site.address}/wp-json/wp/v2/tags?per_page=100&orderby=id&order={order}&page={page}",
+                idempotent=True,
+                timeout=30,
             )
-            data = response.json()
+        if response.status_code != 200:
+            # за последней страницей WordPress отвечает 400 rest_post_invalid_page_number, это конец списка,
+            # а любой другой ответ - ошибка: неполный список тегов нельзя принимать за все теги сайта
+            if self._is_past_last_page(response):
+                return [], None
+            raise httpx.HTTPStatusError(
+                f"Unexpected status {response.status_code} for tags page {page}",
+                request=response.request,
+                response=response,
+            )
+
+        total_pages = response.headers.get("X-WP-TotalPages", "")
+        tags = [
+            Tag(id=json_tag["id"], name=json_tag["name"], slug=unquote(json_tag["slug"]))
+            for json_tag in response.json()
+        ]
 
-            return data["token"]
+        return tags, int(total_pages) if total_pages.isdigit() else None
 
     async def all_tags(self, site: Site) -> list[Tag]:
+        """
+        Все теги сайта. Количество страниц берётся из заголовков первой страницы, и остальные страницы запрашиваются
+        параллельно в пределах окна сайта. Без заголовка страницы читаются по очереди до пустой.
+        """
         try:
-            async with httpx.AsyncClient(timeout=30) as session:
-                tags: list[Tag] = []
-                page = 1
-                while True:
-                    response = await session.get(f"{site.address}/wp-json/wp/v2/tags?per_page=100&page={page}")
+            tags, total_pages = await self._tags_page(site, page=1)
+            if total_pages is None:
+                page = 2
+                while page_tags := (await self._tags_page(site, page=page))[0]:
+                    tags.extend(page_tags)
                     page += 1
-                    try:
-                        data = response.json()
-                        if not data:
-                            return tags
-                    except:
-                        return tags
-                    tags.extend(
-                        [
-                            Tag(id=json_tag["id"], name=json_tag["name"], slug=unquote(json_tag["slug"]))
-                            for json_tag in data
-                        ]
-                    )
+                return tags
+
+            pages = await asyncio.gather(*(self._tags_page(site, page=page) for page in range(2, total_pages + 1)))
+            for page_tags, _ in pages:
+                tags.extend(page_tags)
+
+            return tags
+        except SiteUnavailableError as e:
+            return OperationResult(success=False, error_message=str(e))
+        except Exception:
+            type, value, tb = sys.exc_info()
+            traceback_str = "".join(traceback.format_exception(type, value, tb))
+
+            return OperationResult(success=False, error_message=f"Ошибка сервера: {traceback_str}")
+
+    async def new_tags(self, site: Site, after_id: int) -> list[Tag]:
+        """Теги сайта с id больше after_id: страницы по убыванию id читаются, пока не встретится известный тег."""
+        try:
+            tags: list[Tag] = []
+            page = 1
+            while True:
+                page_tags, _ = await self._tags_page(site, page=page, order="desc")
+                tags.extend(tag for tag in page_tags if tag.id > after_id)
+                if not page_tags or page_tags[-1].id <= after_id:
+                    return tags
+                page += 1
+        except SiteUnavailableError as e:
+            return OperationResult(success=False, error_message=str(e))
         except Exception:
             type, value, tb = sys.exc_info()
             traceback_str = "".join(traceback.format_exception(type, value, tb))
@@ -50,27 +211,31 @@ class WordpressService:
 
     async def get_post_by_slug(self, site: Site, post: Post) -> Post:
         try:
-            async with httpx.AsyncClient(timeout=60) as session:
-                response = await session.get(
-                    f"{site.address}/wp-json/wp/v2/posts?slug={WordpressPostDTO.generate_slug(post)}"
-                )
-                data = response.json()
-
-                if not data:
-                    return None
-                post = data[0]
-                return Post(
-                    id=post["id"],
-                    title=post["title"],
-                    description="",
-                    published=post["date"],
-                    h1="",
-                    image="",
-                    content="",
-                    content2="",
-                    slug="",
-                    active=post["status"],
-                )
+            response = await self._request(
+                site,
+                "GET",
+                f"{site.address}/wp-json/wp/v2/posts?slug={WordpressPostDTO.generate_slug(post)}",
+                idempotent=True,
+            )
+            data = response.json()
+
+            if not data:
+                return None
+            post = data[0]
+            return Post(
+                id=post["id"],
+                title=post["title"],
+                description="",
+                published=post["date"],
+                h1="",
+                image="",
+                content="",
+                content2="",
+                slug="",
+                active=post["status"],
+            )
+        except SiteUnavailableError as e:
+            return OperationResult(success=False, error_message=str(e))
         except Exception:
             type, value, tb = sys.exc_info()
             traceback_str = "".join(traceback.format_exception(type, value, tb))
@@ -79,11 +244,15 @@ class WordpressService:
 
     async def delete_post(self, site: Site, post_id: int, access_token: str) -> None:
         try:
-            async with httpx.AsyncClient(timeout=60) as session:
-                await session.delete(
-                    f"{site.address}/wp-json/wp/v2/posts/{post_id}",
-                    headers={"Content-Type": "application/json", "Authorization": f"Bearer {access_token}"},
-                )
+            await self._request(
+                site,
+                "DELETE",
+                f"{site.address}/wp-json/wp/v2/posts/{post_id}",
+                idempotent=True,
+                headers={"Content-Type": "application/json", "Authorization": f"Bearer {access_token}"},
+            )
+        except SiteUnavailableError as e:
+            return OperationResult(success=False, error_message=str(e))
         except Exception:
             type, value, tb = sys.exc_info()
             traceback_str = "".join(traceback.format_exception(type, value, tb))
@@ -92,65 +261,98 @@ class WordpressService:
 
     async def send_tag(self, site: Site, tag: Tag, access_token: str) -> OperationResult:
         try:
-            async with httpx.AsyncClient(timeout=60) as session:
-                response = await session.post(
-                    f"{site.address}/wp-json/wp/v2/tags",
-                    json=asdict(tag),
-                    headers={"Content-Type": "application/json", "Authorization": f"Bearer {access_token}"},
-                )
+            response = await self._request(
+                site,
+                "POST",
+                f"{site.address}/wp-json/wp/v2/tags",
+                idempotent=False,
+                json=asdict(tag),
+                headers={"Content-Type": "application/json", "Authorization": f"Bearer {access_token}"},
+            )
 
-                data = response.json()
-                #     print(data)
-                if response.status_code == 201:
-                    return OperationResult(
-                        success=True, data=Tag(id=data["id"], slug=unquote(data["slug"]), name=data["name"])
-                    )
+            data = response.json()
+            #     print(data)
+            if response.status_code == 201:
+                return OperationResult(
+                    success=True, data=Tag(id=data["id"], slug=unquote(data["slug"]), name=data["name"])
+                )
 
-                error_message = json.dumps(data, indent=2, ensure_ascii=False)
+            error_message = json.dumps(data, indent=2, ensure_ascii=False)
 
-                return OperationResult(success=False, error_message=f"Лог ошибки с сайта Wordpress: {error_message}")
+            return OperationResult(success=False, error_message=f"Лог ошибки с сайта Wordpress: {error_message}")
+        except SiteUnavailableError as e:
+            return OperationResult(success=False, error_message=str(e))
         except Exception:
             type, value, tb = sys.exc_info()
             traceback_str = "".join(traceback.format_exception(type, value, tb))
 
             return OperationResult(success=False, error_message=f"Ошибка сервера: {traceback_str}")
 
-    async def send_post_image(self, site: Site, image_name: str, image: bytes, access_token: str) -> OperationResult:
+    async def send_post_image(
+        self, site: Site, image_name: str, image: bytes | BinaryIO, access_token: str
+    ) -> OperationResult:
+        """
+        Загружает изображение в медиатеку сайта. Файл, открытый в бинарном режиме, отправляется частями по 64 КБ
+        без чтения в память, а перед повтором запроса перематывается в начало.
+        """
         try:
-            async with httpx.AsyncClient(timeout=60) as session:
-                upload_response = await session.post(
-                    f"{site.address}/wp-json/wp/v2/media",
-                    headers={"Authorization": f"Bearer {access_token}"},
-                    files={"file": (image_name, image, "image/jpeg")},
-                )
+            upload_response = await self._request(
+                site,
+                "POST",
+                f"{site.address}/wp-json/wp/v2/media",
+                idempotent=False,
+                headers={"Authorization": f"Bearer {access_token}"},
+                files={"file": (image_name, image, "image/jpeg")},
+            )
 
             f_id = upload_response.json()["id"]
             return OperationResult(success=True, data=f_id)
 
+        except SiteUnavailableError as e:
+            return OperationResult(success=False, error_message=str(e))
         except Exception:
             type, value, tb = sys.exc_info()
             traceback_str = "".join(traceback.format_exception(type, value, tb))
 
             return OperationResult(success=False, error_message=f"Ошибка сервера: {traceback_str}")
 
+    async def _post_exists(self, site: Site, slug: str, access_token: str) -> bool:
+        """Есть ли на сайте пост со slug, в том числе неопубликованный. Выполняется внутри запроса, мимо выключателя."""
+        response = await self._send(
+            site,
+            "GET",
+            f"{site.address}/wp-json/wp/v2/posts?slug={quote(slug)}&status=any",
+            idempotent=True,
+            applied=None,
+            headers={"Authorization": f"Bearer {access_token}"},
+        )
+
+        return response.status_code == 200 and bool(response.json())
+
     async def send_post(self, site: Site, post: WordpressPostDTO, access_token: str) -> OperationResult:
         try:
-            async with httpx.AsyncClient(timeout=60) as session:
-                #  print(post, "POST")
-                print(site.address, "address")
-                response = await session.post(
-                    f"{site.address}/wp-json/wp/v2/posts",
-                    json=asdict(post),
-                    headers={"Content-Type": "application/json", "Authorization": f"Bearer {access_token}"},
-                )
+            #  print(post, "POST")
+            print(site.address, "address")
+            # slug поста уникален: по нему проверяем, создан ли пост, перед повтором после 502/504 или обрыва
+            response = await self._request(
+                site,
+                "POST",
+                f"{site.address}/wp-json/wp/v2/posts",
+                idempotent=False,
+                applied=lambda: self._post_exists(site, post.slug, access_token),
+                json=asdict(post),
+                headers={"Content-Type": "application/json", "Authorization": f"Bearer {access_token}"},
+            )
 
-                if response.status_code == 201:
-                    return OperationResult(success=True)
+            if response is None or response.status_code == 201:
+                return OperationResult(success=True)
 
-                data = response.json()
-                error_message = json.dumps(data, indent=2, ensure_ascii=False)
+            data = response.json()
+            error_message = json.dumps(data, indent=2, ensure_ascii=False)
 
-                return OperationResult(success=False, error_message=f"Лог ошибки с сайта Wordpress: {error_message}")
+            return OperationResult(success=False, error_message=f"Лог ошибки с сайта Wordpress: {error_message}")
+        except SiteUnavailableError as e:
+            return OperationResult(success=False, error_message=str(e))
         except Exception:
             type, value, tb = sys.exc_info()
             traceback_str = "".join(traceback.format_exception(type, value, tb))
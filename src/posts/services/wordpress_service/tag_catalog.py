@@ -0,0 +1,28 @@
+from collections.abc import Iterable
+
+from posts.dto.post import Tag
+
+
+class TagCatalog:
+    """
+    Теги WordPress сайта: словарь slug -> id тега на сайте.
+
+    Заполняется тегами сайта перед отправкой и дополняется созданными при отправке тегами,
+    поэтому проверка тега поста и получение id тегов для поста не перебирают все теги сайта.
+    """
+
+    def __init__(self, tags: Iterable[Tag] = ()) -> None:
+        self._ids: dict[str, int] = {tag.slug: tag.id for tag in tags}
+
+    def __contains__(self, tag: Tag) -> bool:
+        return tag.slug in self._ids
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def add(self, tag: Tag) -> None:
+        self._ids[tag.slug] = tag.id
+
+    def ids(self, tags: Iterable[Tag]) -> list[int]:
+        """id на сайте для тегов, которые на нём есть."""
+        return [self._ids[tag.slug] for tag in tags if tag.slug in self._ids]
@@ -1,20 +1,55 @@
+import dataclasses
 import tracemalloc
+from collections.abc import Awaitable, Callable
 
+from posts.dto.parse_posts import ParseProgress, ParseUsecaseResponse
 from posts.usecases.posts.parsing.parsers.base import ParsePosts
 from posts.usecases.posts.send_to_site.usecase import SendPostsToSites
 
 
 class ParsePostsAndSendToSites:
-    def __init__(self, parse_posts: ParsePosts, send_posts: SendPostsToSites):
+    """
+    Парсинг постов с отправкой новых постов на сайты.
+
+    С send_while_parsing (ParseConfig.SEND_WHILE_PARSING) отправка идёт параллельно с парсингом: id постов
+    из каждого закоммиченного батча сразу передаются отправителям сайтов. Иначе посты отправляются после
+    окончания парсинга.
+    """
+
+    def __init__(self, parse_posts: ParsePosts, send_posts: SendPostsToSites, send_while_parsing: bool = False):
         self._parse_posts = parse_posts
         self._send_posts = send_posts
+        self._send_while_parsing = send_while_parsing
+
+    @property
+    def progress(self) -> ParseProgress:
+        return dataclasses.replace(self._parse_posts.progress, sent=self._send_posts.sent)
+
+    async def _parse_and_send(
+        self, parse: Callable[[], Awaitable[ParseUsecaseResponse]], send: bool
+    ) -> ParseUsecaseResponse:
+        if not send:
+            return await parse()
+
+        if not self._send_while_parsing:
+            parse_response = await parse()
+            print("Отправляем посты на сайты...")
+            await self._send_posts()
+            print("Все посты отправлены...")
+            return parse_response
+
+        await self._send_posts.open_stream()
+        self._parse_posts.bind_committed_callback(self._send_posts.publish)
+        try:
+            return await parse()
+        finally:
+            # уже закоммиченные посты отправляются и при ошибке парсинга
+            await self._send_posts.close_stream()
+            print("Все посты отправлены...")
 
-    async def __call__(self):
+    async def __call__(self, send: bool = True, **parse_kwargs):
         tracemalloc.start()
-        parse_response = await self._parse_posts()
-        print("Отправляем посты на сайты...")
-        await self._send_posts()
-        print("Все посты отправлены...")
+        parse_response = await self._parse_and_send(lambda: self._parse_posts(**parse_kwargs), send=send)
         current, peak = tracemalloc.get_traced_memory()
         print(f"Текущая память: {current / 1024 / 1024:.2f} MB; Пик: {peak / 1024 / 1024:.2f} MB")
         return parse_response
@@ -0,0 +1,116 @@
+import asyncio
+import logging
+import os
+import uuid
+from typing import BinaryIO
+from zipfile import ZipFile
+
+from dishka import AsyncContainer
+
+from posts.dto.parse_job import ParseJob
+from posts.usecases.posts.parse_and_send.base import ParsePostsAndSendToSites
+from posts.usecases.posts.parse_and_send.parse_from_tar import (
+    ParsePostsFromTarAndSendToSites,
+)
+from posts.usecases.posts.parse_and_send.parse_from_zip import (
+    ParsePostsFromZIPAndSendToSites,
+)
+from posts.usecases.posts.parsing.file_discoverers.archive_format import ArchiveFormat
+
+
+class ParseJobRunner:
+    """
+    Фоновый импорт архивов с постами: HTTP-запрос только ставит задачу, а парсинг и отправка на сайты
+    идут после ответа.
+
+    Одновременно выполняется не больше max_jobs импортов, остальные ждут в статусе queued. Каждый импорт
+    открывает свой скоуп контейнера: у него своя AsyncSession (она создаётся в скоупе SESSION, см. DbProvider),
+    свой пул парсинга и свои воркеры, а его счётчики читаются из юзкейса во время работы. Задачи хранятся в памяти процесса, из завершённых остаются последние history_size.
+
+    Args:
+        container (AsyncContainer): APP-контейнер, из которого открываются скоупы задач.
+        max_jobs (int): Максимальное количество одновременно выполняемых импортов.
+        history_size (int): Сколько завершённых задач хранить для опроса.
+    """
+
+    def __init__(self, container: AsyncContainer, max_jobs: int, history_size: int) -> None:
+        self._container = container
+        self._semaphore = asyncio.Semaphore(max_jobs)
+        self._history_size = history_size
+        self._jobs: dict[str, ParseJob] = {}
+        self._usecases: dict[str, ParsePostsAndSendToSites] = {}
+        self._tasks: set[asyncio.Task] = set()
+
+    def submit(self, archive: str | BinaryIO, archive_format: ArchiveFormat) -> ParseJob:
+        """
+        Ставит импорт архива в очередь. Архив (путь к временному файлу или открытый файл) принадлежит задаче:
+        после её завершения файл по пути удаляется, а открытый файл закрывается.
+        """
+        job = ParseJob(id=uuid.uuid4().hex, status="queued")
+        self._jobs[job.id] = job
+
+        task = asyncio.create_task(self._execute(job, archive, archive_format))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+        return job
+
+    def get(self, id: str) -> ParseJob | None:
+        job = self._jobs.get(id)
+        usecase = self._usecases.get(id)
+        if job is not None and usecase is not None:
+            job.progress = usecase.progress
+
+        return job
+
+    async def _parse(
+        self, container: AsyncContainer, job: ParseJob, archive: str | BinaryIO, archive_format: ArchiveFormat
+    ) -> None:
+        if archive_format == "zip":
+            zip_usecase = await container.get(ParsePostsFromZIPAndSendToSites)
+            self._usecases[job.id] = zip_usecase
+            with ZipFile(archive) as zip_file:
+                await zip_usecase(zip_file)
+            return
+
+        tar_usecase = await container.get(ParsePostsFromTarAndSendToSites)
+        self._usecases[job.id] = tar_usecase
+        await tar_usecase(archive)
+
+    async def _execute(self, job: ParseJob, archive: str | BinaryIO, archive_format: ArchiveFormat) -> None:
+        try:
+            async with self._semaphore:
+                job.status = "running"
+                try:
+                    async with self._container() as container:
+                        await self._parse(container, job, archive, archive_format)
+                    job.status = "finished"
+                except asyncio.CancelledError:
+                    job.status, job.error = "failed", "cancelled"
+                    raise
+                except Exception as e:
+                    logging.exception("Parse job %s failed", job.id)
+                    job.status, job.error = "failed", str(e)
+                finally:
+                    usecase = self._usecases.pop(job.id, None)
+                    if usecase is not None:
+                        job.progress = usecase.progress
+        finally:
+            if isinstance(archive, str):
+                os.unlink(archive)
+            else:
+                archive.close()
+            self._forget_finished()
+
+    def _forget_finished(self) -> None:
+        finished = [job.id for job in self._jobs.values() if job.status in ("finished", "failed")]
+        for id in finished[: max(len(finished) - self._history_size, 0)]:
+            del self._jobs[id]
+
+    async def close(self) -> None:
+        """Отменяет незавершённые задачи при остановке приложения."""
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -1,3 +1,5 @@
+import asyncio
+
 from posts.usecases.posts.parse_and_send.base import ParsePostsAndSendToSites
 from posts.usecases.posts.parsing.parsers.directory_parser import (
     ParsePostsFromDirectory,
@@ -6,5 +8,30 @@ from posts.usecases.posts.send_to_site.usecase import SendPostsToSites
 
 
 class ParsePostsFromDirctoryAndSendToSites(ParsePostsAndSendToSites):
-    def __init__(self, parse_posts: ParsePostsFromDirectory, send_posts: SendPostsToSites):
-        super().__init__(parse_posts=parse_posts, send_posts=send_posts)
+    def __init__(
+        self, parse_posts: ParsePostsFromDirectory, send_posts: SendPostsToSites, send_while_parsing: bool = False
+    ):
+        super().__init__(parse_posts=parse_posts, send_posts=send_posts, send_while_parsing=send_while_parsing)
+        self._sent_inserted = 0
+
+    async def _send_new_posts(self) -> None:
+        """Отправляет на сайты посты, записанные в базу с прошлой отправки."""
+        inserted = self._parse_posts.inserted
+        if inserted == self._sent_inserted:
+            return
+
+        self._sent_inserted = inserted
+        print("Отправляем новые посты на сайты...")
+        await self._send_posts()
+
+    async def watch(self, stop: asyncio.Event, send: bool = True, run_id: int | None = None):
+        if send and self._send_while_parsing:
+            return await self._parse_and_send(lambda: self._parse_posts.watch(stop, run_id=run_id), send=send)
+
+        parse_response = await self._parse_posts.watch(
+            stop, run_id=run_id, after_poll=self._send_new_posts if send else None
+        )
+        if send:
+            await self._send_new_posts()
+
+        return parse_response
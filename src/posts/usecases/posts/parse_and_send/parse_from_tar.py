@@ -0,0 +1,13 @@
+from typing import BinaryIO
+
+from posts.usecases.posts.parse_and_send.base import ParsePostsAndSendToSites
+from posts.usecases.posts.parsing.parsers.tar_parser import ParsePostsFromTar
+from posts.usecases.posts.send_to_site.usecase import SendPostsToSites
+
+
+class ParsePostsFromTarAndSendToSites(ParsePostsAndSendToSites):
+    def __init__(self, parse_posts: ParsePostsFromTar, send_posts: SendPostsToSites, send_while_parsing: bool = False):
+        super().__init__(parse_posts=parse_posts, send_posts=send_posts, send_while_parsing=send_while_parsing)
+
+    async def __call__(self, file: str | BinaryIO, send: bool = True, run_id: int | None = None):
+        return await self._parse_and_send(lambda: self._parse_posts(file, run_id=run_id), send=send)
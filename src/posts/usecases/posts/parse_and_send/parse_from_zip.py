@@ -6,13 +6,8 @@ from posts.usecases.posts.send_to_site.usecase import SendPostsToSites
 
 
 class ParsePostsFromZIPAndSendToSites(ParsePostsAndSendToSites):
-    def __init__(self, parse_posts: ParsePostsFromZIP, send_posts: SendPostsToSites):
-        super().__init__(parse_posts=parse_posts, send_posts=send_posts)
+    def __init__(self, parse_posts: ParsePostsFromZIP, send_posts: SendPostsToSites, send_while_parsing: bool = False):
+        super().__init__(parse_posts=parse_posts, send_posts=send_posts, send_while_parsing=send_while_parsing)
 
-    async def __call__(self, zip_file: ZipFile):
-        parse_response = await self._parse_posts(zip_file)
-        print("Отправляем посты на сайты...")
-        await self._send_posts()
-        print("Все посты отправлены...")
-
-        return parse_response
+    async def __call__(self, zip_file: ZipFile, send: bool = True):
+        return await self._parse_and_send(lambda: self._parse_posts(zip_file), send=send)
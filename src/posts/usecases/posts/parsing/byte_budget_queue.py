@@ -0,0 +1,65 @@
+import asyncio
+import sys
+from collections.abc import Callable
+from dataclasses import fields
+from typing import Any
+
+from posts.dto.parse_posts import DiscoveredFileDTO, ParsedPostDTO
+
+
+def estimate_size(item: Any) -> int:
+    """Примерный размер элемента очереди в байтах: учитываются строки, которые занимают основную память."""
+    if item is None or isinstance(item, int):
+        return 0
+
+    if isinstance(item, ParsedPostDTO):
+        return sum(
+            sys.getsizeof(value)
+            for value in (getattr(item, field.name) for field in fields(item))
+            if isinstance(value, str)
+        )
+
+    if isinstance(item, DiscoveredFileDTO):
+        return sys.getsizeof(item.file.name) + estimate_size(item.source)
+
+    return sys.getsizeof(item)
+
+
+class ByteBudgetQueue(asyncio.Queue):
+    """
+    asyncio.Queue, ограниченная не только количеством элементов, но и суммарным размером в байтах.
+
+    put() ждёт, пока в очереди не освободится место по обоим ограничениям. Элемент,
+    который сам больше max_bytes, принимается в пустую очередь, иначе он не прошёл бы никогда.
+
+    Attributes:
+        current_bytes (int): Текущий размер элементов в очереди.
+        peak_bytes (int): Максимальный размер очереди за всё время.
+    """
+
+    def __init__(self, maxsize: int = 0, max_bytes: int = 0, item_size: Callable[[Any], int] = estimate_size) -> None:
+        super().__init__(maxsize=maxsize)
+        self._max_bytes = max_bytes
+        self._item_size = item_size
+        self.current_bytes = 0
+        self.peak_bytes = 0
+
+    @property
+    def max_bytes(self) -> int:
+        return self._max_bytes
+
+    def full(self) -> bool:
+        if super().full():
+            return True
+
+        return 0 < self._max_bytes <= self.current_bytes
+
+    def _put(self, item) -> None:
+        super()._put(item)
+        self.current_bytes += self._item_size(item)
+        self.peak_bytes = max(self.peak_bytes, self.current_bytes)
+
+    def _get(self):
+        item = super()._get()
+        self.current_bytes -= self._item_size(item)
+        return item
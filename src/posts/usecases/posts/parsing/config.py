@@ -1,4 +1,5 @@
 import os
+from typing import Literal
 
 from pydantic_settings import BaseSettings
 
@@ -6,9 +7,43 @@ from pydantic_settings import BaseSettings
 class ParseConfig(BaseSettings):
     DATA_DIR: str = "C:/Users/tgors/Desktop/articles/articles"
     N_PARSER_WORKERS: int = min(32, (os.cpu_count() or 4) * 2)
+    # threads - ThreadPoolExecutor, processes - ProcessPoolExecutor,
+    # auto - процессы, если на машине больше одного ядра
+    PARSER_EXECUTOR: Literal["threads", "processes", "auto"] = "threads"
+    N_PARSER_PROCESSES: int = os.cpu_count() or 1
+    PARSER_CHUNK_SIZE: int = 16
+    # bs4 - BeautifulSoup (html_parser), lxml - XPath по дереву lxml (lxml_html_parser),
+    # разметка content и content2 у lxml не эквивалентна выводу BeautifulSoup, поэтому по умолчанию bs4
+    HTML_EXTRACTOR: Literal["bs4", "lxml"] = "bs4"
+    # DirectoryDiscoverer кладёт в file_q только пути, файлы читают ParserWorker в пуле
+    READ_FILES_IN_WORKERS: bool = True
+    # количество потоков распаковки ZIP, у каждого свой ZipFile над своей частью архива
+    N_ZIP_READERS: int = 4
+    # загружать id постов из базы перед парсингом: нужно для PRE_PARSE_DEDUP, дубликаты в базе
+    # без загрузки всё равно пропускаются при вставке (ON CONFLICT DO NOTHING)
+    PRELOAD_POST_IDS: bool = True
+    # отбрасывать уже сохранённые посты до парсинга по id из имени файла или ссылки на печать
+    PRE_PARSE_DEDUP: bool = True
+    SNIFF_WINDOW_BYTES: int = 4096
+    # сколько id постов загружается из базы одним запросом при построении PostIdsIndex
+    POST_IDS_CHUNK_SIZE: int = 50000
+    # количество воркеров записи в базу, у каждого своя сессия (соединение из пула engine)
+    N_DB_WRITERS: int = 4
     DB_POOL_MIN: int = 5
     DB_POOL_MAX: int = 20
     PARSED_QUEUE_MAX: int = 20000
     FILE_QUEUE_MAX: int = 20000
+    # ограничения очередей по суммарному размеру элементов в байтах, 0 - без ограничения
+    FILE_QUEUE_MAX_BYTES: int = 256 * 1024 * 1024
+    PARSED_QUEUE_MAX_BYTES: int = 256 * 1024 * 1024
     BATCH_SIZE: int = 1000
+    # максимальное время ожидания неполного батча перед записью в базу, мс
     BATCH_MAX_WAIT: float = 10000.0
+    # период обхода DATA_DIR в режиме watch, с; файлы моложе периода ждут следующего обхода
+    WATCH_INTERVAL: float = 5.0
+    # отправлять посты на сайты во время парсинга, по мере коммита батчей, а не после окончания парсинга
+    SEND_WHILE_PARSING: bool = True
+    # сколько импортов, загруженных через /posts/parse, выполняется одновременно в одном процессе
+    MAX_PARSE_JOBS: int = 1
+    # сколько завершённых импортов хранится для опроса через /posts/jobs/{id}
+    PARSE_JOBS_HISTORY: int = 100
@@ -1,73 +1,254 @@
 import asyncio
 import logging
+import time
 
-from posts.dto.parse_posts import ParsedPostDTO
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from posts.dto.parse_posts import ParsedPostDTO, SourceFileDTO
+from posts.persistence.data_mappers.parse_run_data_mapper import ParseRunDataMapper
 from posts.persistence.data_mappers.post_data_mapper import PostDataMapper
+from posts.persistence.data_mappers.source_file_data_mapper import SourceFileDataMapper
+from posts.persistence.data_mappers.tag_data_mapper import TagDataMapper
 from posts.usecases.posts.parsing.config import ParseConfig
 from posts.usecases.posts.persist_posts import PersistPosts
 
 
 class DbWriterWorker:
     """
-    Асинхронный воркер, выполняющий пакетную запись результатов парсинга в базу данных.
+    Асинхронный пул воркеров, выполняющих пакетную запись результатов парсинга в базу данных.
+
+    N_DB_WRITERS воркеров параллельно получают объекты ParsedPostDTO из общей очереди parsed_q,
+    накапливают их в батчи и сохраняют через PersistPosts, когда батч заполнен (BATCH_SIZE)
+    или самый старый пост в нём ждёт дольше BATCH_MAX_WAIT миллисекунд.
+    Размер и время записи каждого батча пишутся в лог.
+
+    Каждый воркер работает в своей сессии из session_maker и делает commit после каждого батча.
+    Если задан run_id, в той же транзакции имена файлов батча записываются в манифест запуска парсинга:
+    файлы из манифеста гарантированно сохранены, и продолжение запуска их пропускает.
+    Файлы директории так же записываются в манифест source_files (mtime, размер, хеш),
+    по которому следующий запуск пропускает неизменённые файлы.
+    SourceFileDTO в parsed_q - файл без поста для записи (невалидный файл или дубликат),
+    он попадает в манифесты вместе с ближайшим батчем.
+    Новые теги создаются до записи батча под общим замком в отдельной короткой транзакции:
+    так транзакции воркеров не вставляют одинаковые slug'и и не ждут друг друга на уникальном индексе.
 
-    Класс получает объекты ParsedPostDTO из очереди parsed_q, накапливает их в батчи
-    и сохраняет через PostDataMapper.
+    Если задан committed_callback, после коммита батча он получает id вставленных постов:
+    так посты отправляются на сайты, пока парсинг продолжается.
+    Если задан files_callback, после коммита батча он получает записанные в манифест source_files файлы директории.
+
+    Посты, уже сохранённые в базе, отсеивает ParserWorker по общему PostIdsIndex, а посты,
+    которых не было в индексе (например, вставленные параллельным импортом), пропускаются при вставке
+    через ON CONFLICT DO NOTHING и считаются как skipped.
 
     Args:
         parsed_q (asyncio.Queue): Очередь с готовыми результатами парсинга.
-        config (ParseConfig): Конфигурация, задающая размер батча, и количество парсеров.
-        posts_data_mapper (PostDataMapper): Класс для сохранения постов в базу данных.
+        config (ParseConfig): Конфигурация, задающая размер батча, максимальное ожидание батча и количество воркеров.
+        session_maker (async_sessionmaker): Фабрика сессий, по одной сессии на воркер.
     """
 
-    def __init__(self, config: ParseConfig, persist_posts: PersistPosts, post_data_mapper: PostDataMapper) -> None:
+    def __init__(self, config: ParseConfig, session_maker: async_sessionmaker[AsyncSession]) -> None:
         self._parsed_q: asyncio.Queue | None = None
         self._config = config
-        self._persist_posts = persist_posts
-        self._data_mapper = post_data_mapper
+        self._session_maker = session_maker
+        self._tags_lock = asyncio.Lock()
+        self.flushes = 0
+        self.max_flush_latency = 0.0
 
     def set_parsed_q(self, parsed_q: asyncio.Queue):
         self._parsed_q = parsed_q
 
-    async def __call__(self, tags_dict: dict[str, int], skipped_callback, inserted_callback) -> None:
+    @property
+    def parsed_q(self) -> asyncio.Queue:
         if self._parsed_q is None:
             raise ValueError("no parsed_q set")
+        return self._parsed_q
+
+    async def stop(self) -> None:
+        """Отправляет сигнал завершения каждому воркеру. Вызывается после завершения всех ParserWorker."""
+        for _ in range(self._config.N_DB_WRITERS):
+            await self.parsed_q.put(None)
+
+    async def _ensure_tags(self, batch: list[ParsedPostDTO], tags_dict: dict[str, int]) -> None:
+        if all(tag.slug in tags_dict for post in batch for tag in post.tags):
+            return
+
+        async with self._tags_lock:
+            new_tags = list({tag for post in batch for tag in post.tags if tag.slug not in tags_dict})
+            if not new_tags:
+                return
+
+            async with self._session_maker() as session:
+                tags = await TagDataMapper(session=session).bulk_upsert(new_tags)
+                await session.commit()
+
+            for tag in tags:
+                tags_dict[tag.slug] = tag.id
+
+    async def _flush(
+        self,
+        name: int,
+        session: AsyncSession,
+        persist_posts: PersistPosts,
+        batch: list[ParsedPostDTO],
+        files: list[SourceFileDTO],
+        tags_dict: dict[str, int],
+        skipped_callback,
+        inserted_callback,
+        run_id: int | None,
+        committed_callback,
+        files_callback,
+        reason: str,
+    ) -> None:
+        start = time.perf_counter()
+        inserted_ids: list[int] = []
+        if batch:
+            await self._ensure_tags(batch, tags_dict=tags_dict)
+            inserted_ids = await persist_posts(batch, tags_dict=tags_dict)
+        inserted = len(inserted_ids)
+        files.extend(post.source_file for post in batch if post.source_file is not None)
+        if run_id is not None:
+            await ParseRunDataMapper(session=session).add_files(run_id, [file.name for file in files])
+        source_files = [file for file in files if file.path is not None]
+        await SourceFileDataMapper(session=session).upsert(source_files)
+        await session.commit()
+        latency = time.perf_counter() - start
 
-        exist_posts = await self._data_mapper.all_ids()
+        self.flushes += 1
+        self.max_flush_latency = max(self.max_flush_latency, latency)
+        logging.info(
+            "DB writer %s flushed %d posts (%d inserted) in %.3f s (%s)", name, len(batch), inserted, latency, reason
+        )
+
+        await inserted_callback(value=inserted, in_lock=True)
+        if inserted < len(batch):
+            await skipped_callback(value=len(batch) - inserted, in_lock=True)
+        if committed_callback is not None and inserted_ids:
+            await committed_callback(inserted_ids)
+        if files_callback is not None and source_files:
+            await files_callback(source_files)
+        batch.clear()
+        files.clear()
+
+    async def _write(
+        self,
+        name: int,
+        tags_dict: dict[str, int],
+        skipped_callback,
+        inserted_callback,
+        run_id: int | None,
+        committed_callback,
+        files_callback,
+    ) -> None:
+        loop = asyncio.get_running_loop()
+        max_wait = self._config.BATCH_MAX_WAIT / 1000
         batch: list[ParsedPostDTO] = []
-        shutdown_signals = 0
-
-        while True:
-            item = await asyncio.wait_for(self._parsed_q.get(), timeout=None)
-
-            if item is None:
-                shutdown_signals += 1
-                self._parsed_q.task_done()
-
-                if shutdown_signals >= self._config.N_PARSER_WORKERS:
-                    if batch:
-                        try:
-                            await self._persist_posts(batch, tags_dict=tags_dict)
-                            print("send_in_db", len(batch))
-                            await inserted_callback(value=len(batch), in_lock=True)
-                            batch.clear()
-                        except Exception as e:
-                            print(e)
-                    logging.info("DB writer shutdown after %d signals", shutdown_signals)
+        files: list[SourceFileDTO] = []
+        batch_deadline = 0.0
+
+        async with self._session_maker() as session:
+            persist_posts = PersistPosts(
+                post_data_mapper=PostDataMapper(session=session), tag_data_mapper=TagDataMapper(session=session)
+            )
+
+            while True:
+                pending = len(batch) + len(files)
+                timeout = max(batch_deadline - loop.time(), 0) if pending else None
+                try:
+                    item = await asyncio.wait_for(self.parsed_q.get(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    await self._flush(
+                        name,
+                        session,
+                        persist_posts,
+                        batch,
+                        files,
+                        tags_dict,
+                        skipped_callback,
+                        inserted_callback,
+                        run_id,
+                        committed_callback,
+                        files_callback,
+                        reason="max wait",
+                    )
+                    continue
+
+                if item is None:
+                    self.parsed_q.task_done()
+
+                    # ошибка последнего батча не глотается: его файлы не попали в манифесты, и запуск должен
+                    # завершиться со статусом failed, чтобы его можно было продолжить
+                    if pending:
+                        await self._flush(
+                            name,
+                            session,
+                            persist_posts,
+                            batch,
+                            files,
+                            tags_dict,
+                            skipped_callback,
+                            inserted_callback,
+                            run_id,
+                            committed_callback,
+                            files_callback,
+                            reason="shutdown",
+                        )
+                    logging.info("DB writer %s shutdown", name)
                     break
-                continue
 
-            if item == 0:
-                self._parsed_q.task_done()
-            else:
-                if item.id not in exist_posts:
-                    batch.append(item)
+                if not pending:
+                    batch_deadline = loop.time() + max_wait
+                if isinstance(item, SourceFileDTO):
+                    files.append(item)
                 else:
-                    await skipped_callback(in_lock=True)
+                    batch.append(item)
+                self.parsed_q.task_done()
+
+                if len(batch) + len(files) >= self._config.BATCH_SIZE:
+                    await self._flush(
+                        name,
+                        session,
+                        persist_posts,
+                        batch,
+                        files,
+                        tags_dict,
+                        skipped_callback,
+                        inserted_callback,
+                        run_id,
+                        committed_callback,
+                        files_callback,
+                        reason="full",
+                    )
 
-                self._parsed_q.task_done()
+    async def __call__(
+        self,
+        tags_dict: dict[str, int],
+        skipped_callback,
+        inserted_callback,
+        run_id: int | None = None,
+        committed_callback=None,
+        files_callback=None,
+    ) -> None:
+        writers = [
+            asyncio.create_task(
+                self._write(
+                    name,
+                    tags_dict=tags_dict,
+                    skipped_callback=skipped_callback,
+                    inserted_callback=inserted_callback,
+                    run_id=run_id,
+                    committed_callback=committed_callback,
+                    files_callback=files_callback,
+                )
+            )
+            for name in range(self._config.N_DB_WRITERS)
+        ]
+        try:
+            await asyncio.gather(*writers)
+        except BaseException:
+            for writer in writers:
+                writer.cancel()
+            raise
 
-                if len(batch) >= self._config.BATCH_SIZE:
-                    await self._persist_posts(batch, tags_dict=tags_dict)
-                    print("send_in_db", len(batch))
-                    batch.clear()
+        logging.info(
+            "DB writers shutdown after %d flushes, max flush latency %.3f s", self.flushes, self.max_flush_latency
+        )
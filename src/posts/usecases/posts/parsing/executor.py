@@ -0,0 +1,51 @@
+import asyncio
+import os
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+from posts.usecases.posts.parsing.config import ParseConfig
+from posts.usecases.posts.parsing.html_parser import (
+    HtmlSource,
+    ParseHtmlResponse,
+    parse_html_batch,
+    warm_up_parser,
+)
+from posts.usecases.posts.parsing.lxml_html_parser import parse_html_lxml_batch
+
+
+def resolve_executor_kind(config: ParseConfig) -> str:
+    if config.PARSER_EXECUTOR == "auto":
+        return "processes" if (os.cpu_count() or 1) > 1 else "threads"
+
+    return config.PARSER_EXECUTOR
+
+
+def get_parse_batch(config: ParseConfig) -> Callable[[list[HtmlSource]], list[ParseHtmlResponse]]:
+    """Функция разбора чанка, выбранная в ParseConfig.HTML_EXTRACTOR. Функции модульные, поэтому передаются в пул процессов."""
+    if config.HTML_EXTRACTOR == "lxml":
+        return parse_html_lxml_batch
+
+    return parse_html_batch
+
+
+def create_parser_executor(config: ParseConfig) -> Executor:
+    """
+    Создаёт пул для выполнения parse_html.
+
+    BeautifulSoup держит GIL, поэтому пул потоков загружает только одно ядро.
+    Пул процессов обходит это ограничение: воркеры запускаются один раз на весь парсинг
+    и прогреваются через initializer (импорт парсера и разбор пустого документа).
+    """
+    if resolve_executor_kind(config) == "processes":
+        return ProcessPoolExecutor(max_workers=config.N_PARSER_PROCESSES, initializer=warm_up_parser)
+
+    return ThreadPoolExecutor(max_workers=config.N_PARSER_WORKERS)
+
+
+async def warm_up_executor(executor: Executor, config: ParseConfig) -> None:
+    """Запускает все процессы пула заранее, чтобы первые файлы не ждали старта воркеров."""
+    if not isinstance(executor, ProcessPoolExecutor):
+        return
+
+    loop = asyncio.get_running_loop()
+    await asyncio.gather(*(loop.run_in_executor(executor, warm_up_parser) for _ in range(config.N_PARSER_PROCESSES)))
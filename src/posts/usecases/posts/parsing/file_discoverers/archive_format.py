@@ -0,0 +1,41 @@
+import importlib.util
+from typing import BinaryIO, Literal
+
+from posts.exceptions import UnsupportedArchiveError
+
+ArchiveFormat = Literal["zip", "tar"]
+
+# сжатые потоки считаются tar-архивами: tar.gz, tar.bz2, tar.xz, tar.zst
+_TAR_COMPRESSION_MAGICS = (b"\x1f\x8b", b"BZh", b"\xfd7zXZ\x00", b"\x28\xb5\x2f\xfd")
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+# сигнатура ustar в заголовке первого файла несжатого tar
+_USTAR_OFFSET = 257
+HEADER_SIZE = 512
+
+
+def detect_archive_format(header: bytes) -> ArchiveFormat:
+    """Формат архива по первым HEADER_SIZE байтам."""
+    if header.startswith((b"PK\x03\x04", b"PK\x05\x06")):
+        return "zip"
+
+    # без zstandard tar.zst не прочитать: архив отклоняется сразу, а не падает фоновой задачей
+    if header.startswith(ZSTD_MAGIC) and importlib.util.find_spec("zstandard") is None:
+        raise UnsupportedArchiveError("для загрузки tar.zst архивов на сервере должен быть установлен пакет zstandard")
+
+    if header.startswith(_TAR_COMPRESSION_MAGICS) or header[_USTAR_OFFSET : _USTAR_OFFSET + 5] == b"ustar":
+        return "tar"
+
+    raise UnsupportedArchiveError(
+        "неподдерживаемый формат архива, ожидается zip, tar, tar.gz, tar.bz2, tar.xz или tar.zst"
+    )
+
+
+def detect_archive_file_format(file: str | BinaryIO) -> ArchiveFormat:
+    """Формат архива по пути или по открытому файлу, позиция которого возвращается в начало."""
+    if isinstance(file, str):
+        with open(file, "rb") as f:
+            return detect_archive_format(f.read(HEADER_SIZE))
+
+    header = file.read(HEADER_SIZE)
+    file.seek(0)
+    return detect_archive_format(header)
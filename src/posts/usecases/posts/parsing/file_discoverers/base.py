@@ -1,20 +1,112 @@
 import asyncio
+import hashlib
+import io
 from abc import ABC, abstractmethod
+from collections.abc import Awaitable, Callable, Container
+
+from posts.dto.parse_posts import DiscoveredFileDTO, SourceFileDTO
+from posts.usecases.posts.parsing.post_id_sniffer import (
+    sniff_post_id_from_filename,
+    sniff_post_id_from_html,
+)
 
 
 class FileDiscoverer(ABC):
     def __init__(self) -> None:
         self._file_q: asyncio.Queue | None = None
+        self._known_post_ids: Container[int] | None = None
+        self._skipped_callback: Callable[..., Awaitable[None]] | None = None
+        self._sniff_window = 4096
+        self._processed_files: Container[str] | None = None
+        # количество файлов, отправленных на парсинг
+        self.discovered = 0
 
     def bind_file_q(self, file_q: asyncio.Queue) -> None:
         self._file_q = file_q
 
+    def bind_known_post_ids(
+        self, known_post_ids: Container[int], skipped_callback: Callable[..., Awaitable[None]], sniff_window: int
+    ) -> None:
+        """
+        Включает фильтрацию до парсинга: файлы постов, id которых уже есть в known_post_ids,
+        не попадают в file_q и считаются пропущенными.
+        """
+        self._known_post_ids = known_post_ids
+        self._skipped_callback = skipped_callback
+        self._sniff_window = sniff_window
+
+    def bind_processed_files(self, processed_files: Container[str]) -> None:
+        """
+        Включает продолжение запуска парсинга: файлы из манифеста запуска уже записаны в базу
+        и не попадают в file_q. В счётчики они не входят, их учёл прерванный запуск.
+        """
+        self._processed_files = processed_files
+
     @property
     def file_q(self) -> asyncio.Queue:
         if self._file_q is None:
             raise ValueError("no file_q set")
         return self._file_q
 
+    async def put_file(self, file: DiscoveredFileDTO) -> None:
+        """Отправляет файл на парсинг."""
+        self.discovered += 1
+        await self.file_q.put(file)
+
+    async def files_committed(self, files: list[SourceFileDTO]) -> None:
+        """Получает файлы, записанные в манифест source_files закоммиченным батчем."""
+
+    async def file_not_read(self, file: SourceFileDTO) -> None:
+        """Получает файл, который ParserWorker не смог прочитать: он не попал в манифесты."""
+
+    def skip_processed(self, name: str) -> bool:
+        """Пропускает файл, уже обработанный в продолжаемом запуске парсинга."""
+        return self._processed_files is not None and name in self._processed_files
+
+    @staticmethod
+    def decode_html(content: bytes) -> str:
+        """Декодирование как при чтении в текстовом режиме: с игнорированием ошибок и универсальными переводами строк."""
+        return io.StringIO(content.decode("utf-8", errors="ignore"), newline=None).read()
+
+    @staticmethod
+    def hash_content(content: bytes) -> str:
+        """Хеш содержимого файла для манифеста source_files."""
+        return hashlib.blake2b(content, digest_size=16).hexdigest()
+
+    async def _skip_known(self, post_id: int | None) -> bool:
+        if post_id is None or self._known_post_ids is None or post_id not in self._known_post_ids:
+            return False
+
+        await self._skipped_callback()
+        return True
+
+    def is_known_filename(self, filename: str) -> bool:
+        """Есть ли пост с id из имени файла среди сохранённых, без учёта в счётчиках. Можно вызывать из потока чтения."""
+        if self._known_post_ids is None:
+            return False
+
+        post_id = sniff_post_id_from_filename(filename)
+        return post_id is not None and post_id in self._known_post_ids
+
+    async def skip_known_filename(self, filename: str) -> bool:
+        """Пропускает файл по id из имени, не читая его."""
+        if self._known_post_ids is None:
+            return False
+
+        return await self._skip_known(sniff_post_id_from_filename(filename))
+
+    async def skip_known_html(self, html: bytes | str) -> bool:
+        """Пропускает файл по id из ссылки на печатную версию, не разбирая его."""
+        if self._known_post_ids is None:
+            return False
+
+        return await self._skip_known(sniff_post_id_from_html(html, self._sniff_window))
+
+    @property
+    @abstractmethod
+    def source(self) -> str:
+        """Источник файлов (директория или архив), сохраняется в запуске парсинга."""
+
     @abstractmethod
     async def discover(self) -> None:
         ...
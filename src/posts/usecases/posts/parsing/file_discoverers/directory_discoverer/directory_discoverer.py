@@ -1,7 +1,13 @@
+import asyncio
+import itertools
 import os
+import time
+from collections.abc import Awaitable, Callable, Iterator
+from pathlib import Path
 
 import aiofiles  # type: ignore
 
+from posts.dto.parse_posts import DiscoveredFileDTO, SourceFileDTO
 from posts.usecases.posts.parsing.file_discoverers.base import FileDiscoverer
 from posts.usecases.posts.parsing.file_discoverers.directory_discoverer.config import (
     DirectoryDiscovererConfig,
@@ -9,22 +15,188 @@ from posts.usecases.posts.parsing.file_discoverers.directory_discoverer.config i
 
 
 class DirectoryDiscoverer(FileDiscoverer):
-    def __init__(self, config: DirectoryDiscovererConfig, n_parser_workers: int) -> None:
+    """
+    Обходит DATA_DIR и отправляет HTML-файлы в file_q.
+
+    При read_in_workers=True в очередь попадают только пути (Path), а файлы читают ParserWorker в пуле
+    вместе с парсингом: чтение масштабируется вместе с пулом, а очередь хранит маленькие элементы.
+    Иначе файлы читаются здесь через aiofiles и в очередь попадает их содержимое.
+    Файл в очереди именуется путём относительно DATA_DIR: по этому имени он попадает в манифест запуска парсинга.
+    Обход (scandir и stat) выполняется в потоке пачками по SCAN_BATCH файлов, на event loop остаются только
+    проверки по манифестам.
+
+    С манифестом директории (bind_source_files) в очередь попадают только новые и изменённые файлы.
+    Файл с теми же mtime и размером, что в манифесте, пропускается без чтения. Файл с другими mtime или размером
+    читается здесь и пропускается, если хеш содержимого совпал. Хеш нового файла считается там, где он читается:
+    здесь или, при read_in_workers=True, в ParserWorker вместе с парсингом.
+
+    В режиме watch директория обходится каждые interval секунд до сигнала stop. Файл, отправленный в file_q,
+    добавляется в манифест в памяти только после коммита его батча (files_committed), а до тех пор ждёт в _queued:
+    следующие обходы не отправляют его повторно, а файл, не дошедший до базы, не считается обработанным.
+    Пропущенные без парсинга файлы добавляются в манифест сразу. Файлы, изменённые меньше interval секунд назад,
+    откладываются до следующего обхода: их ещё могут дописывать.
+
+    Attributes:
+        unchanged (int): Количество файлов, пропущенных по манифесту директории за последний обход.
+        touched (list[SourceFileDTO]): Файлы с новым mtime, но прежним содержимым: их mtime обновляется в манифесте
+            после парсинга, чтобы следующий обход не читал их снова.
+    """
+
+    # количество файлов, которое обходится и stat'ится в потоке за один переход с event loop
+    SCAN_BATCH = 1024
+
+    def __init__(self, config: DirectoryDiscovererConfig, n_parser_workers: int, read_in_workers: bool = False) -> None:
         super().__init__()
         self._config = config
         self._N_PARSER_WORKERS = n_parser_workers
+        self._read_in_workers = read_in_workers
+        self._source_files: dict[str, SourceFileDTO] | None = None
+        # файлы, отправленные в file_q, батч которых ещё не закоммичен
+        self._queued: dict[str, SourceFileDTO] = {}
+        self.unchanged = 0
+        self.touched: list[SourceFileDTO] = []
 
-    async def discover(self) -> None:
-        for dirpath, _, filenames in os.walk(self._config.DATA_DIR):
-            for fn in filenames:
-                if not fn.lower().endswith((".html", ".htm", "-")):
-                    continue
-                path = os.path.join(dirpath, fn)
+    def bind_source_files(self, source_files: dict[str, SourceFileDTO] | None) -> None:
+        """Манифест директории по абсолютному пути файла. None - обрабатывать все файлы."""
+        self._source_files = source_files
+
+    async def files_committed(self, files: list[SourceFileDTO]) -> None:
+        if self._source_files is None:
+            return
+
+        for file in files:
+            if self._queued.get(file.path) is file:
+                del self._queued[file.path]
+            self._source_files[file.path] = file
+
+    async def file_not_read(self, file: SourceFileDTO) -> None:
+        # файл снова отправится на парсинг при следующем обходе watch
+        if self._queued.get(file.path) is file:
+            del self._queued[file.path]
+
+    def _remember(self, file: SourceFileDTO) -> None:
+        if self._source_files is not None:
+            self._source_files[file.path] = file
+
+    async def _put_source_file(self, file: SourceFileDTO, source: Path | str) -> None:
+        if self._source_files is not None:
+            self._queued[file.path] = file
+        await self.put_file(DiscoveredFileDTO(file=file, source=source))
+
+    @property
+    def source(self) -> str:
+        return os.path.abspath(self._config.DATA_DIR)
+
+    @staticmethod
+    def _walk(root: str) -> Iterator[os.DirEntry]:
+        """Обход директории через os.scandir: тип файла берётся из записи каталога без лишнего stat."""
+        stack = [root]
+        while stack:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.name.lower().endswith((".html", ".htm", "-")) and entry.is_file():
+                        yield entry
+
+    def _scan(self, entries: Iterator[os.DirEntry]) -> tuple[list[tuple[os.DirEntry, SourceFileDTO]], bool]:
+        """
+        Следующие SCAN_BATCH файлов обхода с их mtime и размером и признак конца обхода. Выполняется в потоке:
+        на деревьях из миллионов файлов scandir и stat надолго заняли бы event loop.
+        """
+        files = []
+        scanned = 0
+        for entry in itertools.islice(entries, self.SCAN_BATCH):
+            scanned += 1
+            name = os.path.relpath(entry.path, self._config.DATA_DIR)
+            if self.skip_processed(name):
+                continue
+
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                # файл удалён во время обхода
+                continue
+            file = SourceFileDTO(
+                name=name, path=os.path.abspath(entry.path), mtime_ns=stat.st_mtime_ns, size=stat.st_size
+            )
+            files.append((entry, file))
 
-                async with aiofiles.open(path, "r", encoding="utf-8", errors="ignore") as f:
-                    html = await f.read()
-                print(fn)
-                await self.file_q.put(html)
+        return files, scanned < self.SCAN_BATCH
 
+    async def _discover_once(self, min_age: float = 0) -> None:
+        self.unchanged = 0
+        newer_than = time.time_ns() - int(min_age * 1e9)
+        entries = self._walk(self._config.DATA_DIR)
+        done = False
+        while not done:
+            files, done = await asyncio.to_thread(self._scan, entries)
+            for entry, file in files:
+                await self._discover_file(entry, file, newer_than if min_age else None)
+
+    async def _discover_file(self, entry: os.DirEntry, file: SourceFileDTO, newer_than: int | None) -> None:
+        known = self._source_files.get(file.path) if self._source_files is not None else None
+        if known is not None and (known.mtime_ns, known.size) == (file.mtime_ns, file.size):
+            self.unchanged += 1
+            return
+
+        queued = self._queued.get(file.path)
+        if queued is not None and (queued.mtime_ns, queued.size) == (file.mtime_ns, file.size):
+            return
+
+        if newer_than is not None and file.mtime_ns > newer_than:
+            return
+
+        if await self.skip_known_filename(entry.name):
+            self._remember(file)
+            return
+
+        # изменённый файл читаем здесь и в режиме read_in_workers, чтобы сравнить хеш
+        if self._read_in_workers and known is None:
+            await self._put_source_file(file, Path(entry.path))
+            return
+
+        async with aiofiles.open(entry.path, "rb") as f:
+            content = await f.read()
+
+        file.hash = self.hash_content(content)
+        if known is not None and known.hash == file.hash:
+            self.unchanged += 1
+            self.touched.append(file)
+            self._remember(file)
+            return
+
+        if await self.skip_known_html(content):
+            self._remember(file)
+            return
+
+        await self._put_source_file(file, self.decode_html(content))
+
+    async def _stop_workers(self) -> None:
         for _ in range(self._N_PARSER_WORKERS):
             await self.file_q.put(None)
+
+    async def discover(self) -> None:
+        self.touched = []
+        await self._discover_once()
+        await self._stop_workers()
+
+    async def watch(
+        self, interval: float, stop: asyncio.Event, after_poll: Callable[[], Awaitable[None]] | None = None
+    ) -> None:
+        """Обходит директорию каждые interval секунд, пока не установлен stop. after_poll вызывается после обхода."""
+        self.touched = []
+        if self._source_files is None:
+            self._source_files = {}
+
+        while not stop.is_set():
+            await self._discover_once(min_age=interval)
+            if after_poll is not None:
+                await after_poll()
+
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=interval)
+            except asyncio.TimeoutError:
+                pass
+
+        await self._stop_workers()
@@ -0,0 +1,101 @@
+import asyncio
+import contextlib
+import tarfile
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO
+
+from posts.dto.parse_posts import DiscoveredFileDTO, SourceFileDTO
+from posts.usecases.posts.parsing.file_discoverers.archive_format import ZSTD_MAGIC
+from posts.usecases.posts.parsing.file_discoverers.base import FileDiscoverer
+
+
+class TarDiscoverer(FileDiscoverer):
+    """
+    Отправляет HTML-файлы из tar, tar.gz, tar.bz2, tar.xz или tar.zst архива в file_q без распаковки на диск.
+
+    Архив читается последовательно в потоковом режиме tarfile ("r|*"): распаковка и чтение файлов выполняются
+    в отдельном потоке чанками по chunk_size файлов, не блокируя event loop, а в памяти держится не больше чанка.
+    Для tar.zst нужен пакет zstandard.
+    Архив задаётся путём или открытым файлом с произвольным доступом (например, загрузкой, которую уже сохранил
+    Starlette): открытый файл не закрывается, он принадлежит вызывающему коду.
+    """
+
+    def __init__(self, n_parser_workers: int, chunk_size: int = 16) -> None:
+        super().__init__()
+        self._N_PARSER_WORKERS = n_parser_workers
+        self._chunk_size = chunk_size
+
+    def set_file(self, file: str | BinaryIO) -> None:
+        self._file = file
+
+    @property
+    def source(self) -> str:
+        return self._file if isinstance(self._file, str) else "tar"
+
+    def _open(self, file: BinaryIO) -> tarfile.TarFile:
+        if file.read(len(ZSTD_MAGIC)) != ZSTD_MAGIC:
+            file.seek(0)
+            return tarfile.open(fileobj=file, mode="r|*")
+
+        try:
+            import zstandard  # type: ignore
+        except ImportError as e:
+            raise ValueError("для чтения tar.zst установите пакет zstandard") from e
+
+        file.seek(0)
+        return tarfile.open(fileobj=zstandard.ZstdDecompressor().stream_reader(file), mode="r|")
+
+    def _read_members(
+        self, tar: tarfile.TarFile, members: Iterator[tarfile.TarInfo]
+    ) -> tuple[list[tuple[str, str]], int, bool]:
+        """
+        Следующие chunk_size HTML-файлов архива, количество файлов уже сохранённых постов, пропущенных по имени
+        без распаковки, и признак конца архива.
+        """
+        contents = []
+        known = 0
+        for member in members:
+            if not member.isfile() or not member.name.lower().endswith((".html", ".htm", "-")):
+                continue
+
+            if self.skip_processed(member.name):
+                continue
+
+            if self.is_known_filename(member.name.rsplit("/", 1)[-1]):
+                known += 1
+                continue
+
+            with tar.extractfile(member) as f:
+                contents.append((member.name, self.decode_html(f.read())))
+
+            if len(contents) >= self._chunk_size:
+                return contents, known, False
+
+        return contents, known, True
+
+    async def discover(self) -> None:
+        loop = asyncio.get_running_loop()
+
+        # один поток: потоковый tarfile читается строго последовательно
+        opened = open(self._file, "rb") if isinstance(self._file, str) else contextlib.nullcontext(self._file)
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="tar-reader") as pool, opened as file:
+            tar = await loop.run_in_executor(pool, self._open, file)
+            members = iter(tar)
+            try:
+                done = False
+                while not done:
+                    contents, known, done = await loop.run_in_executor(pool, self._read_members, tar, members)
+                    for _ in range(known):
+                        await self._skipped_callback()
+
+                    for name, content in contents:
+                        if await self.skip_known_html(content):
+                            continue
+
+                        await self.put_file(DiscoveredFileDTO(file=SourceFileDTO(name=name), source=content))
+            finally:
+                tar.close()
+
+        for _ in range(self._N_PARSER_WORKERS):
+            await self.file_q.put(None)
@@ -1,24 +1,80 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from zipfile import ZipFile
 
+from posts.dto.parse_posts import DiscoveredFileDTO, SourceFileDTO
 from posts.usecases.posts.parsing.file_discoverers.base import FileDiscoverer
 
 
 class ZIPDiscoverer(FileDiscoverer):
-    def __init__(self, n_parser_workers: int) -> None:
+    """
+    Отправляет HTML-файлы из ZIP архива в file_q.
+
+    Файлы распаковываются и декодируются в пуле из n_readers потоков (zlib отпускает GIL), не блокируя event loop.
+    Список файлов делится на n_readers частей, каждая часть читается чанками по chunk_size файлов через свой ZipFile,
+    открытый по пути к архиву: одним ZipFile нельзя читать из нескольких потоков одновременно.
+    Архив, открытый не из файла (например, из BytesIO), читается в одном потоке через переданный ZipFile.
+    """
+
+    def __init__(self, n_parser_workers: int, n_readers: int = 1, chunk_size: int = 16) -> None:
         super().__init__()
         self._N_PARSER_WORKERS = n_parser_workers
+        self._n_readers = n_readers
+        self._chunk_size = chunk_size
 
     def set_file(self, zip_file: ZipFile) -> None:
         self._zip_file = zip_file
 
+    @property
+    def source(self) -> str:
+        return self._zip_file.filename or "zip"
+
+    def _read_members(self, zip_file: ZipFile, names: list[str]) -> list[str]:
+        contents = []
+        for name in names:
+            with zip_file.open(name) as f:
+                contents.append(self.decode_html(f.read()))
+
+        return contents
+
+    async def _read_partition(self, pool: ThreadPoolExecutor, names: list[str]) -> None:
+        loop = asyncio.get_running_loop()
+        own_file = self._zip_file.filename is not None
+        zip_file = await loop.run_in_executor(pool, ZipFile, self._zip_file.filename) if own_file else self._zip_file
+        try:
+            for i in range(0, len(names), self._chunk_size):
+                chunk = names[i : i + self._chunk_size]
+                contents = await loop.run_in_executor(pool, self._read_members, zip_file, chunk)
+
+                for name, content in zip(chunk, contents):
+                    if await self.skip_known_html(content):
+                        continue
+
+                    await self.put_file(DiscoveredFileDTO(file=SourceFileDTO(name=name), source=content))
+        finally:
+            if own_file:
+                zip_file.close()
+
     async def discover(self) -> None:
+        names = []
         for filename in self._zip_file.namelist():
             if not filename.lower().endswith((".html", ".htm", "-")):
                 continue
 
-            with self._zip_file.open(filename) as f:
-                html = f.read().decode("utf-8")
-                await self.file_q.put(html)
+            if self.skip_processed(filename):
+                continue
+
+            if await self.skip_known_filename(filename):
+                continue
+
+            names.append(filename)
+
+        # непрерывные части: каждый поток читает архив последовательно
+        n_readers = self._n_readers if self._zip_file.filename is not None else 1
+        size = -(-len(names) // n_readers)
+        partitions = [names[i : i + size] for i in range(0, len(names), size)] if names else []
+        with ThreadPoolExecutor(max_workers=max(len(partitions), 1), thread_name_prefix="zip-reader") as pool:
+            await asyncio.gather(*(self._read_partition(pool, partition) for partition in partitions))
 
         for _ in range(self._N_PARSER_WORKERS):
             await self.file_q.put(None)
@@ -2,12 +2,18 @@
 import re
 import sys
 import traceback
+from collections.abc import Callable
 from dataclasses import dataclass
 from datetime import datetime
+from pathlib import Path
 
 from bs4 import BeautifulSoup, Comment
 
 from posts.dto.parse_posts import ParsedPostDTO, ParsedPostTagDTO
+from posts.usecases.posts.parsing.file_discoverers.base import FileDiscoverer
+
+# содержимое файла или путь к нему, если файл читает сам ParserWorker
+HtmlSource = str | Path
 
 
 @dataclass
@@ -15,6 +21,11 @@ class ParseHtmlResponse:
     success: bool
     data: ParsedPostDTO | int
     error_message: str | None = None
+    # файл не удалось прочитать (EACCES, файл удалён или переписывается): ошибка может быть временной,
+    # поэтому такой файл не записывается в манифесты и будет разобран снова
+    read_error: bool = False
+    # хеш содержимого файла, если его прочитал сам ParserWorker: записывается в манифест source_files
+    source_hash: str | None = None
 
 
 def remove_comments(soup: BeautifulSoup):
@@ -34,7 +45,8 @@ def parse_html(html: str) -> ParseHtmlResponse:
 
         post_id = int(print_button_href.split("/")[2].split("-")[0])
 
-        title = soup.title.string
+        # NavigableString держит ссылку на всё дерево, поэтому приводим к str
+        title = str(soup.title.string) if soup.title.string is not None else None
         image = soup.select_one('link[rel="image_src"]')["href"]
         h1 = soup.find("h1").text
         description = soup.find("meta", attrs={"name": "description"})["content"]
@@ -50,8 +62,6 @@ def parse_html(html: str) -> ParseHtmlResponse:
         except Exception as e:
             date = None
 
-        content = str(soup.select_one("#content"))
-
         img_wrap = soup.select_one(".img_wrap")
         parent = img_wrap.parent
         img_wrap.decompose()
@@ -85,3 +95,30 @@ def parse_html(html: str) -> ParseHtmlResponse:
         traceback_str = "".join(traceback.format_exception(type, value, tb))
 
         return ParseHtmlResponse(success=False, data=post_id, error_message=traceback_str)
+
+
+def parse_source(parse: Callable[[str], ParseHtmlResponse], source: HtmlSource) -> ParseHtmlResponse:
+    if isinstance(source, str):
+        return parse(source)
+
+    try:
+        content = source.read_bytes()
+    except OSError:
+        type, value, tb = sys.exc_info()
+        traceback_str = "".join(traceback.format_exception(type, value, tb))
+
+        return ParseHtmlResponse(
+            success=False, data=f"Не удалось прочитать файл {source}", error_message=traceback_str, read_error=True
+        )
+
+    response = parse(FileDiscoverer.decode_html(content))
+    response.source_hash = FileDiscoverer.hash_content(content)
+    return response
+
+
+def parse_html_batch(sources: list[HtmlSource]) -> list[ParseHtmlResponse]:
+    return [parse_source(parse_html, source) for source in sources]
+
+
+def warm_up_parser() -> None:
+    parse_html("<html><head><title></title></head><body></body></html>")
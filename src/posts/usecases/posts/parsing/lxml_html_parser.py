@@ -0,0 +1,174 @@
+"""
+Быстрый экстрактор постов на lxml.
+
+Дерево строится парсером libxml2 без BeautifulSoup, поиск элементов выполняется
+заранее скомпилированными XPath выражениями, а content и content2 сериализует сам lxml (method="html").
+
+Поля поста, кроме content и content2, совпадают с html_parser.parse_html. Разметка content и content2
+с выводом BeautifulSoup не эквивалентна: lxml выводит пустые элементы без "/" (<br>), не схлопывает пробельные
+строки между тегами, экранирует символы по правилам HTML и кодирует не-ASCII символы в ссылках (href, src)
+в %-последовательности. Эти отличия попадают в базу и на сайты, поэтому экстрактор по умолчанию - bs4 (ParseConfig).
+Как и BeautifulSoup, экстрактор удаляет комментарии и заменяет кодировку в <meta> на utf-8:
+content2 хранится строкой, а не байтами исходной кодировки.
+"""
+
+import re
+import sys
+import traceback
+from datetime import datetime
+
+from lxml import etree
+
+from posts.dto.parse_posts import ParsedPostDTO, ParsedPostTagDTO
+from posts.usecases.posts.parsing.html_parser import (
+    HtmlSource,
+    ParseHtmlResponse,
+    parse_source,
+)
+
+_PARSER = etree.HTMLParser(recover=True, remove_comments=True)
+
+_PRINT_BUTTON = etree.XPath("//*[@id='poteme']/following-sibling::*[1][self::hr]/following-sibling::*[1][self::a]")
+_TITLE = etree.XPath("//title")
+_IMAGE_LINKS = etree.XPath("//link[@rel]")
+_H1 = etree.XPath("//h1")
+_DESCRIPTION = etree.XPath("//meta[@name='description']")
+_TAG_LINKS = etree.XPath("//a[contains(@class, 'article-tag')]")
+_CALENDAR_ICONS = etree.XPath("//i[contains(@class, 'icon-calendar')]")
+_IMG_WRAPS = etree.XPath("//*[contains(@class, 'img_wrap')]")
+_CONTENT_TYPE_METAS = etree.XPath(
+    "//meta[translate(@http-equiv, 'CONTENT-TYPE', 'content-type')='content-type'][@content][not(@charset)]"
+)
+_CHARSET_METAS = etree.XPath("//meta[@charset]")
+
+_HREF_RE = re.compile(r'href="([^"]*)"')
+_SLUG_RE = re.compile(r"^\d+-")
+_NON_WHITESPACE_RE = re.compile(r"\S+")
+_CHARSET_RE = re.compile(r"((^|;)\s*charset=)([^;]*)", re.MULTILINE)
+
+
+def _serialize(element, with_tail: bool = True) -> str:
+    return etree.tostring(element, method="html", encoding="unicode", with_tail=with_tail)
+
+
+def _has_class(element, class_name: str) -> bool:
+    return class_name in _NON_WHITESPACE_RE.findall(element.get("class", ""))
+
+
+def _next_element_sibling(element):
+    for sibling in element.itersiblings():
+        if isinstance(sibling.tag, str):
+            return sibling
+
+    return None
+
+
+def _collapse(text: str) -> str:
+    """Пробельная строка схлопывается, как в BeautifulSoup: в перевод строки, если он в ней есть, иначе в пробел."""
+    if text.strip():
+        return text
+
+    return "\n" if "\n" in text else " "
+
+
+def _get_text(element) -> str:
+    return "".join(_collapse(text) for text in element.itertext())
+
+
+def _remove(element) -> None:
+    """Удаляет элемент из дерева, оставляя текст после него (tail), как Tag.decompose у BeautifulSoup."""
+    parent = element.getparent()
+    if element.tail:
+        previous = element.getprevious()
+        if previous is not None:
+            previous.tail = (previous.tail or "") + element.tail
+        else:
+            parent.text = (parent.text or "") + element.tail
+    parent.remove(element)
+
+
+def _declare_utf8(root) -> None:
+    for meta in _CHARSET_METAS(root):
+        meta.set("charset", "utf-8")
+    for meta in _CONTENT_TYPE_METAS(root):
+        meta.set("content", _CHARSET_RE.sub(lambda match: match.group(1) + "utf-8", meta.get("content")))
+
+
+def _first(elements, predicate=None):
+    for element in elements:
+        if predicate is None or predicate(element):
+            return element
+
+    return None
+
+
+def parse_html_lxml(html: str) -> ParseHtmlResponse:
+    post_id = "Неизвестный id (не получилосб извлечь из-за ошибки)"
+    try:
+        root = etree.fromstring(html, _PARSER)
+
+        print_button = _first(_PRINT_BUTTON(root))
+        match = _HREF_RE.search(_serialize(print_button, with_tail=False) if print_button is not None else "")
+
+        print_button_href = match.group(1)  # type: ignore
+
+        post_id = int(print_button_href.split("/")[2].split("-")[0])
+
+        title_element = _TITLE(root)[0]
+        title = _collapse(title_element.text) if title_element.text else None
+        image = _first(
+            _IMAGE_LINKS(root), lambda link: " ".join(_NON_WHITESPACE_RE.findall(link.get("rel"))) == "image_src"
+        ).attrib["href"]
+        h1 = _get_text(_H1(root)[0])
+        description = _DESCRIPTION(root)[0].attrib["content"]
+
+        tags = [
+            ParsedPostTagDTO(slug=tag_element.attrib["href"].split("/")[-1].lower(), name=_get_text(tag_element))
+            for tag_element in _TAG_LINKS(root)
+            if _has_class(tag_element, "article-tag")
+        ]
+
+        try:
+            calendar_link = _first(
+                (_next_element_sibling(icon) for icon in _CALENDAR_ICONS(root) if _has_class(icon, "icon-calendar")),
+                lambda link: link is not None and link.tag == "a",
+            )
+            date = datetime.strptime(calendar_link.attrib["href"].split("/")[-1], "%Y-%m-%d")
+        except Exception:
+            date = None
+
+        img_wrap = _first(_IMG_WRAPS(root), lambda element: _has_class(element, "img_wrap"))
+        parent = img_wrap.getparent()
+        _remove(img_wrap)
+        _declare_utf8(root)
+
+        content = ((parent.text or "") + "".join(_serialize(child) for child in parent)).strip()
+        content2 = _serialize(root.getroottree())
+
+        slug = _SLUG_RE.sub("", print_button_href.split("/")[2])
+
+        return ParseHtmlResponse(
+            success=True,
+            data=ParsedPostDTO(
+                title=title,
+                h1=h1,
+                image=image,
+                description=description,
+                tags=tags,
+                content=content,
+                content2=content2,
+                id=post_id,
+                slug=slug,
+                published=date,
+                active=True,
+            ),
+        )
+    except Exception:
+        type, value, tb = sys.exc_info()
+        traceback_str = "".join(traceback.format_exception(type, value, tb))
+
+        return ParseHtmlResponse(success=False, data=post_id, error_message=traceback_str)
+
+
+def parse_html_lxml_batch(sources: list[HtmlSource]) -> list[ParseHtmlResponse]:
+    return [parse_source(parse_html_lxml, source) for source in sources]
@@ -1,9 +1,16 @@
 import asyncio
 import logging
-from concurrent.futures import ThreadPoolExecutor
+from collections.abc import Callable
+from concurrent.futures import Executor
 
+from posts.dto.parse_posts import DiscoveredFileDTO, SourceFileDTO
 from posts.interfaces.logger import Logger
-from posts.usecases.posts.parsing.html_parser import parse_html
+from posts.usecases.posts.parsing.html_parser import (
+    HtmlSource,
+    ParseHtmlResponse,
+    parse_html_batch,
+)
+from posts.usecases.posts.parsing.post_ids_index import PostIdsIndex
 
 
 class ParserWorker:
@@ -11,20 +18,26 @@ class ParserWorker:
     Асинхронный воркер, выполняющий чтение и парсинг HTML-файлов.
 
     ParserWorker отвечает за обработку задач из очереди file_q:
-    он асинхронно читает HTML-файлы, выполняет их парсинг в пуле потоков (ThreadPoolExecutor),
+    он забирает HTML-файлы (содержимое или пути к файлам) чанками до chunk_size штук, выполняет их чтение и парсинг в пуле
+    (ThreadPoolExecutor или ProcessPoolExecutor) одной задачей на чанк
     и помещает результат в очередь parsed_q для дальнейшей обработки.
+    Для невалидных файлов и дубликатов в parsed_q попадает только описание файла (SourceFileDTO): DbWriterWorker
+    записывает его в манифесты вместе с ближайшим батчем. Файл, который не удалось прочитать, в parsed_q не попадает:
+    он считается невалидным, но остаётся вне манифестов, и unread_callback возвращает его FileDiscoverer.
+    Хеш файла, прочитанного в пуле, возвращается вместе с результатом и записывается в его SourceFileDTO.
 
-    Для предотвращения дубликатов используется общий parsed_ids set, доступ к которому синхронизирован
-    с помощью asyncio lock.
+    Для предотвращения дубликатов используется общий PostIdsIndex с id постов из базы и уже спарсенных постов,
+    доступ к которому синхронизирован с помощью asyncio lock.
 
     Args:
         name (str): Уникальное имя воркера.
-        executor (ThreadPoolExecutor): Пул потоков для выполнения CPU-блокирующих задач.
-        file_q (asyncio.Queue): Очередь с контентом файла в качестве строки для парсинга.
+        executor (Executor): Пул потоков или процессов для выполнения CPU-блокирующих задач.
+        file_q (asyncio.Queue): Очередь с файлами для парсинга (DiscoveredFileDTO с контентом или путём к файлу).
         parsed_q (asyncio.Queue): Очередь для результатов парсинга.
-        lock (asyncio.Lock): Замок для синхронизации работы с _parsed_ids.
-        parsed_ids (set[int]): Множество ID уже спарсенных постов.
-        skipped (int): Кол-во пропущенных постов(дубликаты)
+        lock (asyncio.Lock): Замок для синхронизации работы с _post_ids.
+        post_ids (PostIdsIndex): Индекс ID сохранённых в базе и уже спарсенных постов.
+        chunk_size (int): Максимальное кол-во файлов, отправляемых в пул одной задачей.
+        parse_batch (Callable): Функция разбора чанка (parse_html_batch или parse_html_lxml_batch).
     Methods:
         call(): Основной цикл воркера, извлекает задачи из очереди, парсит HTML и сохраняет результат.
     """
@@ -32,50 +45,101 @@ class ParserWorker:
     def __init__(
         self,
         name: str,
-        executor: ThreadPoolExecutor,
+        executor: Executor,
         file_q: asyncio.Queue,
         parsed_q: asyncio.Queue,
         lock: asyncio.Lock,
-        parsed_ids: set[int],
+        post_ids: PostIdsIndex,
         logger: Logger,
+        chunk_size: int = 1,
+        parse_batch: Callable[[list[HtmlSource]], list[ParseHtmlResponse]] = parse_html_batch,
     ) -> None:
         self._name = name
         self._executor = executor
         self._file_q = file_q
         self._parsed_q = parsed_q
         self._lock = lock
-        self._parsed_ids = parsed_ids
+        self._post_ids = post_ids
         self._logger = logger
+        self._chunk_size = chunk_size
+        self._parse_batch = parse_batch
+        # количество разобранных файлов, включая невалидные и дубликаты
+        self.parsed = 0
 
-    async def __call__(self, skipped_callback, invalid_callback) -> None:
-        loop = asyncio.get_running_loop()
+    async def _next_chunk(self) -> tuple[list[DiscoveredFileDTO], bool]:
+        """
+        Забирает из file_q до chunk_size файлов, не дожидаясь заполнения чанка.
+        Возвращает чанк и флаг того, что был получен сигнал завершения.
+        """
+        chunk: list[DiscoveredFileDTO] = []
+        file = await self._file_q.get()
 
         while True:
-            html = await self._file_q.get()
-            if html is None:
-                await self._parsed_q.put(None)
-                self._file_q.task_done()
-                logging.info("Parser %s got shutdown", self._name)
-                break
+            if file is None:
+                return chunk, True
 
-            parsed_response = await loop.run_in_executor(self._executor, parse_html, html)
+            chunk.append(file)
+            if len(chunk) >= self._chunk_size or self._file_q.empty():
+                return chunk, False
 
-            if not parsed_response.success:
-                await self._parsed_q.put(0)
-                await invalid_callback(in_lock=True)
-                await self._logger.log(
-                    title=f"Не удалось добавить пост с id {parsed_response.data}", message=parsed_response.error_message
-                )
-                self._file_q.task_done()
-                continue
+            file = self._file_q.get_nowait()
+
+    async def _handle_response(
+        self,
+        file: SourceFileDTO,
+        parsed_response: ParseHtmlResponse,
+        skipped_callback,
+        invalid_callback,
+        unread_callback,
+    ) -> None:
+        if parsed_response.read_error:
+            await invalid_callback(in_lock=True)
+            await unread_callback(file)
+            await self._logger.log(title=parsed_response.data, message=parsed_response.error_message)
+            return
+
+        if parsed_response.source_hash is not None:
+            file.hash = parsed_response.source_hash
+
+        if not parsed_response.success:
+            await self._parsed_q.put(file)
+            await invalid_callback(in_lock=True)
+            await self._logger.log(
+                title=f"Не удалось добавить пост с id {parsed_response.data}", message=parsed_response.error_message
+            )
+            return
 
-            parsed = parsed_response.data
+        parsed = parsed_response.data
+        parsed.source_file = file
 
-            async with self._lock:
-                if parsed.id not in self._parsed_ids:
-                    await self._parsed_q.put(parsed)
-                    self._parsed_ids.add(parsed.id)
-                else:
-                    await skipped_callback()
+        async with self._lock:
+            is_new = parsed.id not in self._post_ids
+            if is_new:
+                self._post_ids.add(parsed.id)
+            else:
+                await skipped_callback()
 
-            self._file_q.task_done()
+        # кладём вне замка: DbWriterWorker берёт тот же замок, и полная parsed_q под замком привела бы к deadlock
+        await self._parsed_q.put(parsed if is_new else file)
+
+    async def __call__(self, skipped_callback, invalid_callback, unread_callback) -> None:
+        loop = asyncio.get_running_loop()
+
+        while True:
+            chunk, shutdown = await self._next_chunk()
+
+            if chunk:
+                sources = [discovered.source for discovered in chunk]
+                parsed_responses = await loop.run_in_executor(self._executor, self._parse_batch, sources)
+                self.parsed += len(parsed_responses)
+
+                for discovered, parsed_response in zip(chunk, parsed_responses):
+                    await self._handle_response(
+                        discovered.file, parsed_response, skipped_callback, invalid_callback, unread_callback
+                    )
+                    self._file_q.task_done()
+
+            if shutdown:
+                self._file_q.task_done()
+                logging.info("Parser %s got shutdown", self._name)
+                break
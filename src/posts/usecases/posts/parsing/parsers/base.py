@@ -1,17 +1,26 @@
 import asyncio
 import logging
 import time
-from concurrent.futures import ThreadPoolExecutor
+from collections.abc import Awaitable, Callable
 from typing import Literal
 
-from posts.dto.parse_posts import ParseUsecaseResponse
+from posts.dto.parse_posts import ParseProgress, ParseUsecaseResponse
 from posts.interfaces.logger import Logger
 from posts.interfaces.transaction import Transaction
+from posts.persistence.data_mappers.parse_run_data_mapper import ParseRunDataMapper
+from posts.persistence.data_mappers.post_data_mapper import PostDataMapper
 from posts.persistence.data_mappers.tag_data_mapper import TagDataMapper
+from posts.usecases.posts.parsing.byte_budget_queue import ByteBudgetQueue
 from posts.usecases.posts.parsing.config import ParseConfig
 from posts.usecases.posts.parsing.db_writer_worker import DbWriterWorker
+from posts.usecases.posts.parsing.executor import (
+    create_parser_executor,
+    get_parse_batch,
+    warm_up_executor,
+)
 from posts.usecases.posts.parsing.file_discoverers.base import FileDiscoverer
 from posts.usecases.posts.parsing.parser_worker import ParserWorker
+from posts.usecases.posts.parsing.post_ids_index import PostIdsIndex
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
 
@@ -21,21 +30,31 @@ class ParsePosts:
     Асинхронный менеджер процесса парсинга HTML-постов и записи результатов в базу данных.
 
     Класс управляет всем жизненным циклом парсинга:
-    1. Сканирует HTML-файлы через FileDiscoverer.
+    1. Сканирует HTML-файлы через FileDiscoverer. Файлы уже сохранённых постов отбрасываются
+       по id из имени файла или ссылки на печать ещё до парсинга (ParseConfig.PRE_PARSE_DEDUP).
     2. Передаёт пути к файлам в очередь file_q.
     3. Несколько ParserWorker читают файлы и парсят их в структуры ParsedPostDTO.
     4. Готовые объекты помещаются в очередь parsed_q.
-    5. DbWriterWorker считывает данные из parsed_q и пакетно сохраняет их в базу данных через PostDataMapper.
+    5. DbWriterWorker (N_DB_WRITERS воркеров со своими сессиями) считывает данные из parsed_q
+       и пакетно сохраняет их в базу данных через PersistPosts, делая commit после каждого батча.
+
+    Каждый вызов - запуск парсинга (parse_runs) с источником файлов и манифестом обработанных файлов,
+    который пополняется в транзакциях батчей. Прерванный запуск продолжается вызовом с его run_id:
+    файлы из манифеста уже сохранены и пропускаются ещё до чтения.
 
     Attributes:
         _config (ParseConfig): Конфигурация процесса парсинга (размер батча, таймауты, пути и т.п.).
-        _file_q (asyncio.Queue[str]): Очередь с путями к HTML-файлам, которые нужно обработать.
-        _parsed_q (asyncio.Queue[ParsedPostDTO]): Очередь с готовыми результатами парсинга.
+        _file_q (ByteBudgetQueue[str]): Очередь с путями к HTML-файлам, которые нужно обработать.
+        _parsed_q (ByteBudgetQueue[ParsedPostDTO]): Очередь с готовыми результатами парсинга.
+            Обе очереди ограничены количеством элементов и суммарным размером в байтах (см. queue_bytes).
         _db_writer_worker (DbWriterWorker): Асинхронный воркер для записи результатов в базу.
-        _executor (ThreadPoolExecutor): Пул потоков для выполнения парсинга HTML.
+        _executor (Executor): Пул потоков или процессов для выполнения парсинга HTML (см. ParseConfig.PARSER_EXECUTOR).
         _parser_workers (list[ParserWorker]): Список воркеров, выполняющих парсинг HTML-файлов.
         _file_discoverer (FileDiscoverer): Объект, отвечающий за поиск HTML-файлов.
         _transaction (Transaction): Объект управляющий транзакцией бд
+        _post_data_mapper (PostDataMapper): Маппер для загрузки id уже сохранённых постов.
+        _post_ids (PostIdsIndex): Общий индекс id сохранённых и уже спарсенных постов.
+        _parse_run_data_mapper (ParseRunDataMapper): Маппер запусков парсинга и их манифестов.
 
     """
 
@@ -43,34 +62,47 @@ class ParsePosts:
         self,
         config: ParseConfig,
         tag_data_mapper: TagDataMapper,
+        post_data_mapper: PostDataMapper,
+        parse_run_data_mapper: ParseRunDataMapper,
         file_discoverer: FileDiscoverer,
         db_worker: DbWriterWorker,
         transaction: Transaction,
         logger: Logger,
     ) -> None:
         self._config = config
-        self._file_q: asyncio.Queue = asyncio.Queue(maxsize=config.FILE_QUEUE_MAX)
-        self._parsed_q: asyncio.Queue = asyncio.Queue(maxsize=config.PARSED_QUEUE_MAX)
+        self._file_q = ByteBudgetQueue(maxsize=config.FILE_QUEUE_MAX, max_bytes=config.FILE_QUEUE_MAX_BYTES)
+        self._parsed_q = ByteBudgetQueue(maxsize=config.PARSED_QUEUE_MAX, max_bytes=config.PARSED_QUEUE_MAX_BYTES)
         db_worker.set_parsed_q(self._parsed_q)
         self._db_writer_worker = db_worker
         self._logger = logger
-        self._executor = ThreadPoolExecutor(max_workers=self._config.N_PARSER_WORKERS)
+        self._executor = create_parser_executor(self._config)
         lock = asyncio.Lock()
         self._lock = lock
-        parsed_ids: set[int] = set()
+        self._post_ids = PostIdsIndex()
         self._parser_workers = [
             ParserWorker(
-                i, self._executor, self._file_q, self._parsed_q, lock=lock, parsed_ids=parsed_ids, logger=logger
+                i,
+                self._executor,
+                self._file_q,
+                self._parsed_q,
+                lock=lock,
+                post_ids=self._post_ids,
+                logger=logger,
+                chunk_size=self._config.PARSER_CHUNK_SIZE,
+                parse_batch=get_parse_batch(self._config),
             )
             for i in range(self._config.N_PARSER_WORKERS)
         ]
         self._file_discoverer = file_discoverer
         self._file_discoverer.bind_file_q(self._file_q)
         self._tag_data_mapper = tag_data_mapper
+        self._post_data_mapper = post_data_mapper
+        self._parse_run_data_mapper = parse_run_data_mapper
         self._transaction = transaction
         self._skipped = 0
         self._invalid = 0
         self._inserted = 0
+        self._committed_callback: Callable[[list[int]], Awaitable[None]] | None = None
 
     async def _increment_counter(
         self, counter: Literal["inserted", "skipped", "invalid"], in_lock: bool, value: int
@@ -91,35 +123,146 @@ class ParsePosts:
     async def increment_invalid(self, value: int = 1, in_lock=False):
         await self._increment_counter(counter="invalid", value=value, in_lock=in_lock)
 
-    async def __call__(self) -> ParseUsecaseResponse:
-        start = time.time()
+    def bind_committed_callback(self, committed_callback: Callable[[list[int]], Awaitable[None]]) -> None:
+        """Включает передачу id постов, вставленных каждым закоммиченным батчем, например для отправки на сайты."""
+        self._committed_callback = committed_callback
 
-        exist_tags = await self._tag_data_mapper.all()
+    def queue_bytes(self) -> dict[str, int]:
+        """Текущий и максимальный размер очередей в байтах."""
+        return {
+            "file_q": self._file_q.current_bytes,
+            "file_q_peak": self._file_q.peak_bytes,
+            "parsed_q": self._parsed_q.current_bytes,
+            "parsed_q_peak": self._parsed_q.peak_bytes,
+        }
+
+    async def _start_run(self, run_id: int | None) -> int:
+        """Создаёт запуск парсинга или продолжает существующий, пропуская файлы из его манифеста."""
+        if run_id is None:
+            run_id = await self._parse_run_data_mapper.create(source=self._file_discoverer.source)
+        else:
+            run = await self._parse_run_data_mapper.get(run_id)
+            if run is None:
+                raise ValueError(f"parse run {run_id} not found")
+            if run.source != self._file_discoverer.source:
+                raise ValueError(f"parse run {run_id} was started for '{run.source}'")
+
+            processed_files = await self._parse_run_data_mapper.processed_files(run_id)
+            self._file_discoverer.bind_processed_files(processed_files)
+            logging.info("Resuming parse run %d, %d files already processed", run_id, len(processed_files))
+
+        # запуск виден сразу, а сессия не держит транзакцию открытой всё время парсинга
+        await self._transaction.commit()
+        logging.info("Parse run %d started (resume after a failure with --resume %d)", run_id, run_id)
 
-        tags_dict = {tag.slug: tag.id for tag in exist_tags}
+        return run_id
 
-        discover_task = asyncio.create_task(self._file_discoverer.discover())
+    async def _run(self, tags_dict: dict[str, int], run_id: int, discover: Callable[[], Awaitable[None]]) -> None:
+        await warm_up_executor(self._executor, self._config)
+
+        discover_task = asyncio.create_task(discover())
         parser_tasks = [
             asyncio.create_task(
-                parser_worker(skipped_callback=self.increment_skipped, invalid_callback=self.increment_invalid)
+                parser_worker(
+                    skipped_callback=self.increment_skipped,
+                    invalid_callback=self.increment_invalid,
+                    unread_callback=self._file_discoverer.file_not_read,
+                )
             )
             for parser_worker in self._parser_workers
         ]
         db_writer = asyncio.create_task(
             self._db_writer_worker(
-                tags_dict=tags_dict, skipped_callback=self.increment_skipped, inserted_callback=self.increment_inserted
+                tags_dict=tags_dict,
+                skipped_callback=self.increment_skipped,
+                inserted_callback=self.increment_inserted,
+                run_id=run_id,
+                committed_callback=self._committed_callback,
+                files_callback=self._file_discoverer.files_committed,
             )
         )
-        await discover_task
-        await self._file_q.join()
-        await asyncio.gather(*parser_tasks)
-        await self._parsed_q.join()
-        await db_writer
-        await self._transaction.commit()
 
-        self._executor.shutdown(wait=True)
+        async def drain() -> None:
+            await discover_task
+            await self._file_q.join()
+            await asyncio.gather(*parser_tasks)
+            await self._db_writer_worker.stop()
+            await self._parsed_q.join()
+
+        drain_task = asyncio.create_task(drain())
+        tasks = [discover_task, *parser_tasks, drain_task, db_writer]
+        try:
+            # упавшая стадия больше не читает свою очередь, и остальные ждали бы её вечно:
+            # ошибка любой стадии, в том числе записи в базу, сразу завершает запуск
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+            for task in done:
+                task.result()
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+
+    @property
+    def inserted(self) -> int:
+        """Количество постов, уже записанных в базу текущим запуском."""
+        return self._inserted
+
+    @property
+    def progress(self) -> ParseProgress:
+        """Счётчики текущего запуска, их можно читать во время парсинга."""
+        return ParseProgress(
+            discovered=self._file_discoverer.discovered,
+            parsed=sum(parser_worker.parsed for parser_worker in self._parser_workers),
+            inserted=self._inserted,
+            skipped=self._skipped,
+            invalid=self._invalid,
+        )
+
+    async def __call__(self, run_id: int | None = None) -> ParseUsecaseResponse:
+        return await self._parse(run_id, discover=self._file_discoverer.discover)
+
+    async def _parse(self, run_id: int | None, discover: Callable[[], Awaitable[None]]) -> ParseUsecaseResponse:
+        """Запуск парсинга: discover наполняет file_q и отправляет воркерам сигнал завершения."""
+        start = time.time()
+
+        # пул парсинга закрывается при любой ошибке, в том числе до начала запуска (например, неверный --resume)
+        try:
+            exist_tags = await self._tag_data_mapper.all()
+
+            tags_dict = {tag.slug: tag.id for tag in exist_tags}
+
+            if self._config.PRELOAD_POST_IDS:
+                await self._post_ids.load(self._post_data_mapper.iter_id_chunks(self._config.POST_IDS_CHUNK_SIZE))
+                logging.info("Loaded %d post ids (%d bytes)", len(self._post_ids), self._post_ids.nbytes)
+
+            if self._config.PRELOAD_POST_IDS and self._config.PRE_PARSE_DEDUP:
+                self._file_discoverer.bind_known_post_ids(
+                    self._post_ids,
+                    skipped_callback=self.increment_skipped,
+                    sniff_window=self._config.SNIFF_WINDOW_BYTES,
+                )
+
+            run_id = await self._start_run(run_id)
+
+            try:
+                await self._run(tags_dict, run_id=run_id, discover=discover)
+            except Exception:
+                await self._transaction.rollback()
+                await self._parse_run_data_mapper.finish(
+                    run_id, status="failed", skipped=self._skipped, inserted=self._inserted, invalid=self._invalid
+                )
+                await self._transaction.commit()
+                raise
+        finally:
+            self._executor.shutdown(wait=True)
+
+        await self._parse_run_data_mapper.finish(
+            run_id, status="finished", skipped=self._skipped, inserted=self._inserted, invalid=self._invalid
+        )
+        await self._transaction.commit()
 
-        print(time.time() - start)
+        logging.info("Parse run %d finished in %.3f s", run_id, time.time() - start)
+        logging.info("Queue bytes: %s", self.queue_bytes())
         logging.info("All done")
 
         return ParseUsecaseResponse(skipped=self._skipped, inserted=self._inserted, invalid=self._invalid)
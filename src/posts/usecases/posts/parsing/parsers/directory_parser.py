@@ -1,5 +1,14 @@
+import asyncio
+import logging
+import os
+from collections.abc import Awaitable, Callable
+
+from posts.dto.parse_posts import ParseUsecaseResponse
 from posts.interfaces.logger import Logger
 from posts.interfaces.transaction import Transaction
+from posts.persistence.data_mappers.parse_run_data_mapper import ParseRunDataMapper
+from posts.persistence.data_mappers.post_data_mapper import PostDataMapper
+from posts.persistence.data_mappers.source_file_data_mapper import SourceFileDataMapper
 from posts.persistence.data_mappers.tag_data_mapper import TagDataMapper
 from posts.usecases.posts.parsing.config import ParseConfig
 from posts.usecases.posts.parsing.db_writer_worker import DbWriterWorker
@@ -12,6 +21,12 @@ from posts.usecases.posts.parsing.parsers.base import ParsePosts
 class ParsePostsFromDirectory(ParsePosts):
     """
     Асинхронный менеджер процесса парсинга HTML-постов из директории на сервере и записи результатов в базу данных.
+
+    По умолчанию парсятся только файлы, которых нет в манифесте директории source_files или которые изменились
+    с прошлого запуска. full=True обрабатывает все файлы, манифест при этом обновляется.
+
+    watch() держит воркеры, пул парсинга и сессии записи живыми и обрабатывает файлы по мере появления
+    в DATA_DIR (см. DirectoryDiscoverer.watch), пока не установлен stop.
     """
 
     def __init__(
@@ -20,14 +35,60 @@ class ParsePostsFromDirectory(ParsePosts):
         directory_discoverer: DirectoryDiscoverer,
         db_worker: DbWriterWorker,
         tag_data_mapper: TagDataMapper,
+        post_data_mapper: PostDataMapper,
+        parse_run_data_mapper: ParseRunDataMapper,
+        source_file_data_mapper: SourceFileDataMapper,
         transaction: Transaction,
         logger: Logger,
     ) -> None:
         super().__init__(
             config=config,
             tag_data_mapper=tag_data_mapper,
+            post_data_mapper=post_data_mapper,
+            parse_run_data_mapper=parse_run_data_mapper,
             file_discoverer=directory_discoverer,
             db_worker=db_worker,
             transaction=transaction,
             logger=logger,
         )
+        self._source_file_data_mapper = source_file_data_mapper
+
+    async def _bind_manifest(self, full: bool) -> None:
+        if full:
+            self._file_discoverer.bind_source_files(None)
+            return
+
+        manifest = await self._source_file_data_mapper.manifest(prefix=self._file_discoverer.source + os.sep)
+        self._file_discoverer.bind_source_files(manifest)
+        logging.info("Loaded directory manifest with %d files", len(manifest))
+
+    async def _save_touched(self) -> None:
+        await self._source_file_data_mapper.upsert(self._file_discoverer.touched)
+        await self._transaction.commit()
+        logging.info("Unchanged files skipped: %d", self._file_discoverer.unchanged)
+
+    async def __call__(self, run_id: int | None = None, full: bool = False) -> ParseUsecaseResponse:
+        await self._bind_manifest(full)
+        response = await super().__call__(run_id=run_id)
+        await self._save_touched()
+
+        return response
+
+    async def watch(
+        self,
+        stop: asyncio.Event,
+        run_id: int | None = None,
+        after_poll: Callable[[], Awaitable[None]] | None = None,
+    ) -> ParseUsecaseResponse:
+        """
+        Парсит новые файлы DATA_DIR каждые WATCH_INTERVAL секунд, пока не установлен stop.
+        after_poll вызывается после каждого обхода, например для отправки новых постов на сайты.
+        """
+        await self._bind_manifest(full=False)
+        response = await self._parse(
+            run_id,
+            discover=lambda: self._file_discoverer.watch(self._config.WATCH_INTERVAL, stop, after_poll=after_poll),
+        )
+        await self._save_touched()
+
+        return response
@@ -0,0 +1,46 @@
+from typing import BinaryIO
+
+from posts.dto.parse_posts import ParseUsecaseResponse
+from posts.interfaces.logger import Logger
+from posts.interfaces.transaction import Transaction
+from posts.persistence.data_mappers.parse_run_data_mapper import ParseRunDataMapper
+from posts.persistence.data_mappers.post_data_mapper import PostDataMapper
+from posts.persistence.data_mappers.tag_data_mapper import TagDataMapper
+from posts.usecases.posts.parsing.config import ParseConfig
+from posts.usecases.posts.parsing.db_writer_worker import DbWriterWorker
+from posts.usecases.posts.parsing.file_discoverers.tar_archive_discoverer import (
+    TarDiscoverer,
+)
+from posts.usecases.posts.parsing.parsers.base import ParsePosts
+
+
+class ParsePostsFromTar(ParsePosts):
+    """
+    Асинхронный менеджер процесса парсинга HTML-постов из tar архива (в том числе сжатого) и записи результатов в базу данных.
+    """
+
+    def __init__(
+        self,
+        config: ParseConfig,
+        db_worker: DbWriterWorker,
+        tar_discoverer: TarDiscoverer,
+        transaction: Transaction,
+        tag_data_mapper: TagDataMapper,
+        post_data_mapper: PostDataMapper,
+        parse_run_data_mapper: ParseRunDataMapper,
+        logger: Logger,
+    ) -> None:
+        super().__init__(
+            config=config,
+            db_worker=db_worker,
+            tag_data_mapper=tag_data_mapper,
+            post_data_mapper=post_data_mapper,
+            parse_run_data_mapper=parse_run_data_mapper,
+            file_discoverer=tar_discoverer,
+            transaction=transaction,
+            logger=logger,
+        )
+
+    async def __call__(self, file: str | BinaryIO, run_id: int | None = None) -> ParseUsecaseResponse:
+        self._file_discoverer.set_file(file)
+        return await super().__call__(run_id=run_id)
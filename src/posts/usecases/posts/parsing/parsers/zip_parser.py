@@ -1,6 +1,9 @@
 from zipfile import ZipFile
 
+from posts.dto.parse_posts import ParseUsecaseResponse
 from posts.interfaces.transaction import Transaction
+from posts.persistence.data_mappers.parse_run_data_mapper import ParseRunDataMapper
+from posts.persistence.data_mappers.post_data_mapper import PostDataMapper
 from posts.persistence.data_mappers.tag_data_mapper import TagDataMapper
 from posts.services.logger import DbLogger
 from posts.usecases.posts.parsing.config import ParseConfig
@@ -23,17 +26,21 @@ class ParsePostsFromZIP(ParsePosts):
         zip_discoverer: ZIPDiscoverer,
         transaction: Transaction,
         tag_data_mapper: TagDataMapper,
+        post_data_mapper: PostDataMapper,
+        parse_run_data_mapper: ParseRunDataMapper,
         logger: DbLogger,
     ) -> None:
         super().__init__(
             config=config,
             db_worker=db_worker,
             tag_data_mapper=tag_data_mapper,
+            post_data_mapper=post_data_mapper,
+            parse_run_data_mapper=parse_run_data_mapper,
             file_discoverer=zip_discoverer,
             transaction=transaction,
             logger=logger,
         )
 
-    async def __call__(self, zip_file: ZipFile) -> None:
+    async def __call__(self, zip_file: ZipFile) -> ParseUsecaseResponse:
         self._file_discoverer.set_file(zip_file)
         return await super().__call__()
@@ -0,0 +1,30 @@
+import re
+
+# 2015-01-4162-.html, 2015-01-4162-slug.html
+_FILENAME_RE = re.compile(r"^\d{4}-\d{2}-(\d{1,18})-")
+_PRINT_BUTTON_ANCHOR_RE = re.compile(rb"""id=["']poteme["']""")
+_PRINT_HREF_RE = re.compile(rb"""href=["']/articles/(\d{1,18})-[^"'<>]{0,1024}/print["']""")
+
+
+def sniff_post_id_from_filename(filename: str) -> int | None:
+    """Id поста из имени файла вида 2015-01-4162-.html (путь внутри архива допускается)."""
+    match = _FILENAME_RE.match(filename.replace("\\", "/").rsplit("/", 1)[-1])
+    return int(match.group(1)) if match else None
+
+
+def sniff_post_id_from_html(html: bytes | str, window: int = 4096) -> int | None:
+    """
+    Id поста из ссылки на печатную версию, не разбирая документ.
+
+    Ссылка ищется только в окне window байт после блока #poteme,
+    за которым в шаблоне сайта идёт кнопка печати (см. html_parser.parse_html).
+    """
+    if isinstance(html, str):
+        html = html.encode("utf-8", errors="ignore")
+
+    anchor = _PRINT_BUTTON_ANCHOR_RE.search(html)
+    if anchor is None:
+        return None
+
+    match = _PRINT_HREF_RE.search(html, anchor.end(), anchor.end() + window)
+    return int(match.group(1)) if match else None
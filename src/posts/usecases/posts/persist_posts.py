@@ -26,9 +26,12 @@ class PersistPosts:
             Словарь {slug: id}, содержащий все известные теги.
             Используется для связывания новых постов с уже существующими тегами.
             Обновляется на месте при добавлении новых тегов.
-        exist_tag_slugs (set[str]):
-            Множество slug'ов уже существующих тегов.
-            Также обновляется на месте при добавлении новых тегов.
+            Теги, уже созданные другой транзакцией, не вызывают ошибку уникальности.
+
+    ---
+    Возвращает:
+        list[int]: Id вставленных постов. Посты, уже существующие в базе, пропускаются (ON CONFLICT DO NOTHING),
+        поэтому батч можно записывать параллельно с другими импортами.
 
     ---
     Примечания:
@@ -40,22 +43,26 @@ class PersistPosts:
         self._post_data_mapper = post_data_mapper
         self._tag_data_mapper = tag_data_mapper
 
-    async def __call__(self, posts: list[ParsedPostDTO], tags_dict: dict[str, int]) -> None:
+    async def __call__(self, posts: list[ParsedPostDTO], tags_dict: dict[str, int]) -> list[int]:
         parsed_tags = list({tag for post in posts for tag in post.tags})
 
         new_tags = [tag for tag in parsed_tags if tag.slug not in tags_dict]
 
-        flushed_tags = await self._tag_data_mapper.bulk_save(new_tags)
+        saved_tags = await self._tag_data_mapper.bulk_upsert(new_tags)
 
-        for tag in flushed_tags:
+        for tag in saved_tags:
             tags_dict[tag.slug] = tag.id
 
-        saved_posts = await self._post_data_mapper.bulk_save(posts)
+        inserted_ids = await self._post_data_mapper.bulk_insert(posts)
+        inserted_set = set(inserted_ids)
+
+        post_tag_relations = [
+            PostTagRelation(post_id=post.id, tag_id=tags_dict[tag.slug])
+            for post in posts
+            if post.id in inserted_set
+            for tag in post.tags
+        ]
 
-        post_tag_relations: list[PostTagRelation] = []
-        for post, saved_post in zip(posts, saved_posts):
-            post_tag_relations.extend(
-                [PostTagRelation(post_id=saved_post.id, tag_id=tags_dict[tag.slug]) for tag in post.tags]
-            )
+        await self._tag_data_mapper.bulk_insert_post_relations(post_tag_relations)
 
-        await self._tag_data_mapper.bulk_save_post_relations(post_tag_relations)
+        return inserted_ids
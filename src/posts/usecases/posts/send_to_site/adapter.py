@@ -1,7 +1,8 @@
 from datetime import date, datetime, timedelta, timezone
 
-from posts.dto.post import PostWithTags, Tag
+from posts.dto.post import PostWithTags
 from posts.dto.wordpress_post import WordpressPostDTO
+from posts.services.wordpress_service.tag_catalog import TagCatalog
 
 
 class WordpressPostAdapter:
@@ -12,9 +13,8 @@ class WordpressPostAdapter:
         dt = datetime.combine(d, datetime.min.time().replace(hour=hour, minute=minute, second=second), tzinfo=tz)
         return dt.isoformat()
 
-    def execute(self, post: PostWithTags, wp_tags: list[Tag], featured_media: int) -> WordpressPostDTO:
-        wp_tags_dict = {wp_tag.slug: wp_tag.id for wp_tag in wp_tags}
-        tags = [wp_tags_dict[tag.slug] for tag in post.tags if tag.slug in wp_tags_dict]
+    def execute(self, post: PostWithTags, wp_tags: TagCatalog, featured_media: int) -> WordpressPostDTO:
+        tags = wp_tags.ids(post.tags)
         return WordpressPostDTO(
             title=post.h1,
             content=post.content,
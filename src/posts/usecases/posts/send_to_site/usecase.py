@@ -1,15 +1,26 @@
 import asyncio
 
-from posts.dto.post import PostWithTags, Tag
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from posts.dto.post import PostWithTags
 from posts.dto.site import Site
 from posts.interfaces.transaction import Transaction
 from posts.persistence.data_mappers.site_post_data_mapper import SitePostDataMapper
 from posts.services.get_site_access_token import GetSiteAccessToken
 from posts.services.posts_sender.posts_sender import PostsSender
 from posts.services.wordpress_service.fetch_tags import FetchWordpressTags
+from posts.services.wordpress_service.tag_catalog import TagCatalog
 
 
 class SendPostsToSites:
+    """
+    Отправка постов на WordPress сайты.
+
+    Вызов отправляет на каждый сайт все посты, ещё не отправленные на него. В режиме потока (open_stream/close_stream)
+    отправка идёт во время парсинга: по отправителю на сайт получают id постов через publish после коммита
+    каждого батча, и публикация на сайтах перекрывается с парсингом.
+    """
+
     def __init__(
         self,
         site_post_data_mapper: SitePostDataMapper,
@@ -17,47 +28,72 @@ class SendPostsToSites:
         transaction: Transaction,
         fetch_wordpress_tags: FetchWordpressTags,
         get_site_access_token: GetSiteAccessToken,
+        session_maker: async_sessionmaker[AsyncSession],
     ) -> None:
         self._get_site_access_token = get_site_access_token
         self._data_mapper = site_post_data_mapper
         self._posts_sender = posts_sender
         self._transaction = transaction
         self._fetch_wordpress_tags = fetch_wordpress_tags
+        self._session_maker = session_maker
+        self._site_queues: list[asyncio.Queue] = []
+        self._stream_tasks: list[asyncio.Task] = []
+
+    @property
+    def sent(self) -> int:
+        """Количество постов, уже отправленных на сайты."""
+        return self._posts_sender.sent
 
     async def _send_task(
-        self, site: Site, posts: list[PostWithTags], access_token: str, wordpress_tags: list[Tag]
+        self, site: Site, posts: list[PostWithTags], access_token: str, wordpress_tags: TagCatalog
     ) -> None:
         await self._posts_sender(site, posts, wordpress_tags, access_token)
 
-    async def __call__(self, site_ids: list[int] | None = None):
-        import time
-
-        start = time.time()
-
+    async def _get_sites(self, site_ids: list[int] | None) -> list[Site]:
         if site_ids is None:
             sites = await self._data_mapper.all_sites()
         else:
             sites = await self._data_mapper.filter_sites(ids=site_ids)
         print(sites, "sites")
 
-        send_tasks = []
-
-        wordpress_tags = await self._fetch_wordpress_tags(sites)
+        return sites
 
+    async def _get_access_tokens(self, sites: list[Site]) -> dict[str, str]:
         access_tokens = dict()
         for site in sites:
             access_token = await self._get_site_access_token(site)
             access_tokens[site.address] = access_token
 
-        for site in sites:
-            posts_without_site = await self._data_mapper.filter_posts_without_site(site_id=site.id)
+        return access_tokens
+
+    async def _reserve_unsent_posts(self, site: Site) -> list[PostWithTags]:
+        """Привязывает к сайту новые посты и возвращает все посты, ещё не отправленные на него."""
+        posts_without_site = await self._data_mapper.filter_posts_without_site(site_id=site.id)
+
+        await self._data_mapper.bulk_create_site_posts_relation(site_id=site.id, posts=posts_without_site)
+        await self._transaction.commit()
+        posts = await self._data_mapper.filter_posts(site_id=site.id)
+        print(len(posts), len(posts_without_site), "posts")
+        posts = list(set(posts) | set(posts_without_site))
+        print(len(posts), "posts")
+
+        return posts
+
+    async def __call__(self, site_ids: list[int] | None = None):
+        import time
+
+        start = time.time()
+
+        sites = await self._get_sites(site_ids)
 
-            await self._data_mapper.bulk_create_site_posts_relation(site_id=site.id, posts=posts_without_site)
-            await self._transaction.commit()
-            posts = await self._data_mapper.filter_posts(site_id=site.id)
-            print(len(posts), len(posts_without_site), "posts")
-            posts = list(set(posts) | set(posts_without_site))
-            print(len(posts), "posts")
+        send_tasks = []
+
+        wordpress_tags = await self._fetch_wordpress_tags(sites)
+
+        access_tokens = await self._get_access_tokens(sites)
+
+        for site in sites:
+            posts = await self._reserve_unsent_posts(site)
 
             send_tasks.append(
                 self._send_task(
@@ -67,3 +103,87 @@ class SendPostsToSites:
 
         await asyncio.gather(*send_tasks)
         print(time.time() - start, "time sended")
+
+    async def _reserve_posts(self, site: Site, post_ids: list[int]) -> list[PostWithTags]:
+        """Привязывает к сайту только что записанные посты в своей сессии: сессия запроса занята парсингом."""
+        async with self._session_maker() as session:
+            data_mapper = SitePostDataMapper(session=session)
+            posts = await data_mapper.filter_posts_by_ids(post_ids)
+            await data_mapper.bulk_create_site_posts_relation(site_id=site.id, posts=posts)
+            await session.commit()
+
+        return posts
+
+    async def _site_stream(
+        self,
+        site: Site,
+        queue: asyncio.Queue,
+        unsent_posts: list[PostWithTags],
+        access_token: str,
+        wordpress_tags: TagCatalog,
+    ) -> None:
+        if unsent_posts:
+            await self._send_task(site, unsent_posts, access_token=access_token, wordpress_tags=wordpress_tags)
+
+        done = False
+        while not done:
+            post_ids: list[int] = []
+            # батчи, записанные за время отправки предыдущих, отправляются вместе
+            item = await queue.get()
+            while True:
+                if item is None:
+                    done = True
+                else:
+                    post_ids.extend(item)
+                if done or queue.empty():
+                    break
+                item = queue.get_nowait()
+
+            if post_ids:
+                posts = await self._reserve_posts(site, post_ids)
+                await self._send_task(site, posts, access_token=access_token, wordpress_tags=wordpress_tags)
+
+    async def open_stream(self, site_ids: list[int] | None = None) -> None:
+        """
+        Запускает отправку во время парсинга. Посты, ещё не отправленные на сайты, привязываются к ним до начала
+        парсинга, чтобы не пересечься с постами, которые придут через publish.
+        """
+        sites = await self._get_sites(site_ids)
+        wordpress_tags = await self._fetch_wordpress_tags(sites)
+        access_tokens = await self._get_access_tokens(sites)
+
+        for site in sites:
+            unsent_posts = await self._reserve_unsent_posts(site)
+            queue: asyncio.Queue = asyncio.Queue()
+            self._site_queues.append(queue)
+            self._stream_tasks.append(
+                asyncio.create_task(
+                    self._site_stream(
+                        site,
+                        queue,
+                        unsent_posts,
+                        access_token=access_tokens[site.address],
+                        wordpress_tags=wordpress_tags[site.address],
+                    )
+                )
+            )
+
+    async def publish(self, post_ids: list[int]) -> None:
+        """Передаёт отправителям сайтов id постов из закоммиченного батча."""
+        for queue in self._site_queues:
+            queue.put_nowait(post_ids)
+
+    async def close_stream(self) -> None:
+        """Дожидается отправки всех переданных постов и останавливает отправителей сайтов."""
+        for queue in self._site_queues:
+            queue.put_nowait(None)
+
+        try:
+            await asyncio.gather(*self._stream_tasks)
+        except BaseException:
+            for task in self._stream_tasks:
+                task.cancel()
+            raise
+        finally:
+            self._site_queues = []
+            self._stream_tasks = []
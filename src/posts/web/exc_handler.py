@@ -5,6 +5,7 @@ from posts.exceptions import (
     AccessDeniedError,
     PostAlreadyHasTagError,
     RecordNotFoundError,
+    UnsupportedArchiveError,
     UserWithUsernameAlreadyExistError,
 )
 
@@ -27,8 +28,13 @@ async def post_already_has_tag_exc_handler(request: Request, exc: PostAlreadyHas
     return JSONResponse(status_code=400, content={"error": str(exc)})
 
 
+async def unsupported_archive_exc_handler(request: Request, exc: UnsupportedArchiveError) -> JSONResponse:
+    return JSONResponse(status_code=400, content={"error": str(exc)})
+
+
 def init_exc_handlers(app: FastAPI) -> None:
     app.add_exception_handler(AccessDeniedError, access_denied_exc_handler)
     app.add_exception_handler(UserWithUsernameAlreadyExistError, user_with_username_already_exist_exc_handler)
     app.add_exception_handler(RecordNotFoundError, record_not_found_exc_handler)
     app.add_exception_handler(PostAlreadyHasTagError, post_already_has_tag_exc_handler)
+    app.add_exception_handler(UnsupportedArchiveError, unsupported_archive_exc_handler)
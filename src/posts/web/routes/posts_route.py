@@ -1,14 +1,21 @@
-from io import BytesIO
-from zipfile import ZipFile
+import io
+import os
+import shutil
+import tempfile
+from typing import BinaryIO
 
 from dishka import FromDishka
 from dishka.integrations.fastapi import inject
 from fastapi import APIRouter, UploadFile
+from starlette.concurrency import run_in_threadpool
 
+from posts.dto.parse_job import ParseJob
+from posts.exceptions import RecordNotFoundError
 from posts.usecases.posts.activate import ActivatePost
 from posts.usecases.posts.deavtivate import DeactivatePost
-from posts.usecases.posts.parse_and_send.parse_from_zip import (
-    ParsePostsFromZIPAndSendToSites,
+from posts.usecases.posts.parse_and_send.job_runner import ParseJobRunner
+from posts.usecases.posts.parsing.file_discoverers.archive_format import (
+    detect_archive_file_format,
 )
 from posts.web.routes.base import UserAnnotation, admin_required
 
@@ -17,19 +24,55 @@ from posts.web.routes.base import UserAnnotation, admin_required
 router = APIRouter(prefix="/posts", tags=["posts"])
 
 
-async def get_zip_file(file: UploadFile) -> ZipFile:
-    content = await file.read()
-    return ZipFile(BytesIO(content))
+async def spool_upload(file: UploadFile) -> str:
+    """
+    Копирует загрузку во временный файл частями в пуле потоков, не держа архив в памяти, и возвращает путь к нему.
+    Нужен только для ZIP: ZIPDiscoverer открывает архив по пути в нескольких потоках, а у файла, в который
+    Starlette сохранил загрузку, пути нет. Файл удаляет задача импорта после завершения.
+    """
+    with tempfile.NamedTemporaryFile(delete=False) as tmp:
+        try:
+            await run_in_threadpool(shutil.copyfileobj, file.file, tmp, 1024 * 1024)
+        except BaseException:
+            os.unlink(tmp.name)
+            raise
 
+    return tmp.name
 
-@router.post("/parse", status_code=200)
+
+def detach_upload(file: UploadFile) -> BinaryIO:
+    """
+    Забирает у UploadFile файл, в который Starlette уже сохранил загрузку, без копирования: после ответа
+    Starlette закрывает только подставленный пустой буфер. Файл закрывает задача импорта после завершения.
+    """
+    spooled = file.file
+    file.file = io.BytesIO()
+    return spooled
+
+
+@router.post("/parse", status_code=202)
 @inject
 @admin_required
 async def parse_posts_handler(
-    file: UploadFile, user: UserAnnotation, usecase: FromDishka[ParsePostsFromZIPAndSendToSites]
-):
-    zip_file = await get_zip_file(file)
-    return await usecase(zip_file)
+    file: UploadFile, user: UserAnnotation, job_runner: FromDishka[ParseJobRunner]
+) -> ParseJob:
+    archive_format = await run_in_threadpool(detect_archive_file_format, file.file)
+    # tar читается потоком, и его задача читает сохранённую загрузку напрямую
+    if archive_format == "tar":
+        return job_runner.submit(detach_upload(file), archive_format)
+
+    return job_runner.submit(await spool_upload(file), archive_format)
+
+
+@router.get("/jobs/{id}")
+@inject
+@admin_required
+async def parse_job_handler(id: str, user: UserAnnotation, job_runner: FromDishka[ParseJobRunner]) -> ParseJob:
+    job = job_runner.get(id)
+    if job is None:
+        raise RecordNotFoundError(f"задача импорта {id} не найдена")
+
+    return job
 
 
 @router.post("/active")
@@ -5,8 +5,9 @@ from posts.persistence.models import Model
 
 
 @pytest.fixture
-def engine():
-    return create_async_engine("sqlite+aiosqlite:///:memory:", echo=False)
+def engine(tmp_path):
+    # файловая база, чтобы у каждой сессии было своё соединение, как в PostgreSQL
+    return create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}", echo=False)
 
 
 async def create_tables(engine) -> None:
@@ -1,8 +1,10 @@
 import pytest
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from posts.persistence.data_mappers.error_log_data_mapper import ErrorLogDataMapper
+from posts.persistence.data_mappers.parse_run_data_mapper import ParseRunDataMapper
 from posts.persistence.data_mappers.post_data_mapper import PostDataMapper
+from posts.persistence.data_mappers.source_file_data_mapper import SourceFileDataMapper
 from posts.persistence.data_mappers.tag_data_mapper import TagDataMapper
 from posts.services.logger import DbLogger
 from posts.usecases.posts.parsing.config import ParseConfig
@@ -10,14 +12,17 @@ from posts.usecases.posts.parsing.db_writer_worker import DbWriterWorker
 from posts.usecases.posts.parsing.file_discoverers.directory_discoverer.directory_discoverer import (
     DirectoryDiscoverer,
 )
+from posts.usecases.posts.parsing.file_discoverers.tar_archive_discoverer import (
+    TarDiscoverer,
+)
 from posts.usecases.posts.parsing.file_discoverers.zip_archive_discoverer import (
     ZIPDiscoverer,
 )
 from posts.usecases.posts.parsing.parsers.directory_parser import (
     ParsePostsFromDirectory,
 )
+from posts.usecases.posts.parsing.parsers.tar_parser import ParsePostsFromTar
 from posts.usecases.posts.parsing.parsers.zip_parser import ParsePostsFromZIP
-from posts.usecases.posts.persist_posts import PersistPosts
 
 
 @pytest.fixture
@@ -36,25 +41,46 @@ def tag_data_mapper(db: AsyncSession) -> TagDataMapper:
 
 
 @pytest.fixture
-def persist_posts(post_data_mapper: PostDataMapper, tag_data_mapper: TagDataMapper) -> PersistPosts:
-    return PersistPosts(post_data_mapper=post_data_mapper, tag_data_mapper=tag_data_mapper)
+def parse_run_data_mapper(db: AsyncSession) -> ParseRunDataMapper:
+    return ParseRunDataMapper(db)
+
+
+@pytest.fixture
+def source_file_data_mapper(db: AsyncSession) -> SourceFileDataMapper:
+    return SourceFileDataMapper(db)
+
+
+@pytest.fixture
+def session_maker(db: AsyncSession) -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(db.bind, expire_on_commit=False, class_=AsyncSession)
 
 
 @pytest.fixture
-def db_worker(
-    parse_config: ParseConfig, persist_posts: PersistPosts, post_data_mapper: PostDataMapper
-) -> DbWriterWorker:
-    return DbWriterWorker(config=parse_config, persist_posts=persist_posts, post_data_mapper=post_data_mapper)
+def db_worker(parse_config: ParseConfig, session_maker: async_sessionmaker[AsyncSession]) -> DbWriterWorker:
+    return DbWriterWorker(config=parse_config, session_maker=session_maker)
 
 
 @pytest.fixture
 def zip_discoverer(parse_config: ParseConfig) -> ZIPDiscoverer:
-    return ZIPDiscoverer(n_parser_workers=parse_config.N_PARSER_WORKERS)
+    return ZIPDiscoverer(
+        n_parser_workers=parse_config.N_PARSER_WORKERS,
+        n_readers=parse_config.N_ZIP_READERS,
+        chunk_size=parse_config.PARSER_CHUNK_SIZE,
+    )
+
+
+@pytest.fixture
+def tar_discoverer(parse_config: ParseConfig) -> TarDiscoverer:
+    return TarDiscoverer(n_parser_workers=parse_config.N_PARSER_WORKERS, chunk_size=parse_config.PARSER_CHUNK_SIZE)
 
 
 @pytest.fixture
 def directory_discoverer(parse_config: ParseConfig) -> DirectoryDiscoverer:
-    return DirectoryDiscoverer(config=parse_config, n_parser_workers=parse_config.N_PARSER_WORKERS)
+    return DirectoryDiscoverer(
+        config=parse_config,
+        n_parser_workers=parse_config.N_PARSER_WORKERS,
+        read_in_workers=parse_config.READ_FILES_IN_WORKERS,
+    )
 
 
 @pytest.fixture
@@ -64,7 +90,7 @@ def error_log_data_mapper(db: AsyncSession) -> ErrorLogDataMapper:
 
 @pytest.fixture
 def logger(error_log_data_mapper: ErrorLogDataMapper, db: AsyncSession) -> DbLogger:
-    return DbLogger(error_log_data_mapper=error_log_data_mapper, transaction=db)
+    return DbLogger(error_log_data_mapper=error_log_data_mapper, session_maker=async_sessionmaker(db.bind))
 
 
 @pytest.fixture
@@ -74,6 +100,8 @@ def parse_posts_from_zip(
     zip_discoverer: ZIPDiscoverer,
     db: AsyncSession,
     tag_data_mapper: TagDataMapper,
+    post_data_mapper: PostDataMapper,
+    parse_run_data_mapper: ParseRunDataMapper,
     logger: DbLogger,
 ) -> ParsePostsFromZIP:
     return ParsePostsFromZIP(
@@ -82,6 +110,8 @@ def parse_posts_from_zip(
         zip_discoverer=zip_discoverer,
         transaction=db,
         tag_data_mapper=tag_data_mapper,
+        post_data_mapper=post_data_mapper,
+        parse_run_data_mapper=parse_run_data_mapper,
         logger=logger,
     )
 
@@ -93,6 +123,9 @@ def parse_posts_from_directory(
     directory_discoverer: DirectoryDiscoverer,
     db: AsyncSession,
     tag_data_mapper: TagDataMapper,
+    post_data_mapper: PostDataMapper,
+    parse_run_data_mapper: ParseRunDataMapper,
+    source_file_data_mapper: SourceFileDataMapper,
     logger: DbLogger,
 ) -> ParsePostsFromDirectory:
     return ParsePostsFromDirectory(
@@ -101,5 +134,31 @@ def parse_posts_from_directory(
         directory_discoverer=directory_discoverer,
         transaction=db,
         tag_data_mapper=tag_data_mapper,
+        post_data_mapper=post_data_mapper,
+        parse_run_data_mapper=parse_run_data_mapper,
+        source_file_data_mapper=source_file_data_mapper,
+        logger=logger,
+    )
+
+
+@pytest.fixture
+def parse_posts_from_tar(
+    parse_config: ParseConfig,
+    db_worker: DbWriterWorker,
+    tar_discoverer: TarDiscoverer,
+    db: AsyncSession,
+    tag_data_mapper: TagDataMapper,
+    post_data_mapper: PostDataMapper,
+    parse_run_data_mapper: ParseRunDataMapper,
+    logger: DbLogger,
+) -> ParsePostsFromTar:
+    return ParsePostsFromTar(
+        config=parse_config,
+        db_worker=db_worker,
+        tar_discoverer=tar_discoverer,
+        transaction=db,
+        tag_data_mapper=tag_data_mapper,
+        post_data_mapper=post_data_mapper,
+        parse_run_data_mapper=parse_run_data_mapper,
         logger=logger,
     )
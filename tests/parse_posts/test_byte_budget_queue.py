@@ -0,0 +1,32 @@
+import asyncio
+
+import pytest
+
+from posts.usecases.posts.parsing.byte_budget_queue import ByteBudgetQueue
+
+
+async def test_byte_budget_queue_blocks_until_bytes_are_released():
+    queue = ByteBudgetQueue(max_bytes=10, item_size=len)
+    await queue.put("a" * 6)
+    await queue.put("b" * 6)
+
+    assert queue.full()
+    assert queue.current_bytes == 12
+
+    put_task = asyncio.create_task(queue.put("c" * 6))
+    await asyncio.sleep(0)
+    assert not put_task.done()
+
+    assert await queue.get() == "a" * 6
+    await asyncio.wait_for(put_task, timeout=1)
+
+    assert queue.current_bytes == 12
+    assert queue.peak_bytes == 12
+
+
+async def test_byte_budget_queue_accepts_oversized_item_when_empty():
+    queue = ByteBudgetQueue(max_bytes=10, item_size=len)
+    await asyncio.wait_for(queue.put("a" * 100), timeout=1)
+
+    with pytest.raises(asyncio.QueueFull):
+        queue.put_nowait("b")
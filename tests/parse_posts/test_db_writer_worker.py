@@ -0,0 +1,58 @@
+import asyncio
+from pathlib import Path
+
+import pytest
+from parse_posts.fixtures import *  # type: ignore
+
+from posts.usecases.posts.parsing.html_parser import parse_html
+
+
+async def test_db_writer_flushes_incomplete_batch_after_max_wait(db_worker, parse_config):
+    parse_config.BATCH_MAX_WAIT = 10
+    parse_config.N_DB_WRITERS = 1
+    html = (Path(__file__).parent.parent / "data" / "articles" / "2014-06-48-.html").read_text(encoding="utf-8")
+
+    parsed_q: asyncio.Queue = asyncio.Queue()
+    db_worker.set_parsed_q(parsed_q)
+    inserted = asyncio.Event()
+
+    async def inserted_callback(value, in_lock):
+        inserted.set()
+
+    async def skipped_callback(value=1, in_lock=False):
+        ...
+
+    writer = asyncio.create_task(
+        db_worker(tags_dict={}, skipped_callback=skipped_callback, inserted_callback=inserted_callback)
+    )
+    await parsed_q.put(parse_html(html).data)
+
+    await asyncio.wait_for(inserted.wait(), timeout=1)
+    assert db_worker.flushes == 1
+
+    await db_worker.stop()
+    await writer
+
+
+async def test_db_writer_raises_when_shutdown_flush_fails(db_worker, parse_config):
+    parse_config.BATCH_MAX_WAIT = 60_000
+    parse_config.N_DB_WRITERS = 1
+    html = (Path(__file__).parent.parent / "data" / "articles" / "2014-06-48-.html").read_text(encoding="utf-8")
+
+    parsed_q: asyncio.Queue = asyncio.Queue()
+    db_worker.set_parsed_q(parsed_q)
+
+    async def inserted_callback(value, in_lock):
+        raise RuntimeError("flush failed")
+
+    async def skipped_callback(value=1, in_lock=False):
+        ...
+
+    writer = asyncio.create_task(
+        db_worker(tags_dict={}, skipped_callback=skipped_callback, inserted_callback=inserted_callback)
+    )
+    await parsed_q.put(parse_html(html).data)
+    await db_worker.stop()
+
+    with pytest.raises(RuntimeError, match="flush failed"):
+        await writer
@@ -0,0 +1,41 @@
+import hashlib
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+
+from posts.usecases.posts.parsing.html_parser import parse_html, parse_html_batch
+from posts.usecases.posts.parsing.lxml_html_parser import (
+    parse_html_lxml,
+    parse_html_lxml_batch,
+)
+
+HTML_FILES = sorted((Path(__file__).parent.parent / "data").rglob("*.html"))
+
+
+@pytest.mark.parametrize("path", HTML_FILES, ids=lambda path: f"{path.parent.name}/{path.name}")
+def test_lxml_parser_extracts_same_fields_as_bs4_parser(path: Path):
+    html = path.read_text(encoding="utf-8", errors="ignore")
+
+    expected = parse_html(html)
+    response = parse_html_lxml(html)
+
+    # разметка content и content2 у экстракторов не эквивалентна (см. lxml_html_parser), сравниваются остальные поля
+    assert response.success == expected.success
+    if expected.success:
+        assert replace(response.data, content="", content2="") == replace(expected.data, content="", content2="")
+    else:
+        assert response.data == expected.data
+
+
+@pytest.mark.parametrize("parse_batch", [parse_html_batch, parse_html_lxml_batch])
+def test_parse_batch_reads_paths(parse_batch, tmp_path: Path):
+    path = HTML_FILES[0]
+
+    responses = parse_batch([path, path.read_text(encoding="utf-8"), tmp_path / "missing.html"])
+
+    assert responses[0].data == responses[1].data
+    assert responses[0].success
+    assert responses[0].source_hash == hashlib.blake2b(path.read_bytes(), digest_size=16).hexdigest()
+    assert responses[1].source_hash is None
+    assert not responses[2].success
@@ -0,0 +1,157 @@
+import asyncio
+import io
+import os
+import tarfile
+import zipfile
+from collections.abc import AsyncIterable
+from pathlib import Path
+
+import httpx
+import pytest
+from dishka import AsyncContainer, Provider, Scope, make_async_container, provide
+from dishka.integrations.fastapi import setup_dishka
+from fastapi import FastAPI
+
+from posts.dto.parse_posts import ParseProgress
+from posts.usecases.posts.parse_and_send.job_runner import ParseJobRunner
+from posts.usecases.posts.parse_and_send.parse_from_tar import (
+    ParsePostsFromTarAndSendToSites,
+)
+from posts.usecases.posts.parse_and_send.parse_from_zip import (
+    ParsePostsFromZIPAndSendToSites,
+)
+from posts.user.model import User
+from posts.web.exc_handler import init_exc_handlers
+from posts.web.routes.base import get_user
+from posts.web.routes.posts_route import router as posts_router
+
+HTML_FILE = sorted((Path(__file__).parent.parent / "data" / "articles").glob("*.html"))[0]
+
+
+class FakeParseAndSend:
+    """Юзкейс импорта, который ждёт release и запоминает полученный архив."""
+
+    def __init__(self) -> None:
+        self.progress = ParseProgress()
+        self.started = asyncio.Event()
+        self.release = asyncio.Event()
+        self.error: Exception | None = None
+        self.archive = None
+
+    async def __call__(self, archive, send: bool = True) -> None:
+        self.archive = archive
+        self.progress = ParseProgress(discovered=1)
+        self.started.set()
+        await self.release.wait()
+        if self.error is not None:
+            raise self.error
+        self.progress = ParseProgress(discovered=1, parsed=1, inserted=1, sent=1)
+
+
+class JobsProvider(Provider):
+    def __init__(self, usecase: FakeParseAndSend) -> None:
+        super().__init__()
+        self._usecase = usecase
+
+    @provide(scope=Scope.APP)
+    async def get_parse_job_runner(self, container: AsyncContainer) -> AsyncIterable[ParseJobRunner]:
+        job_runner = ParseJobRunner(container=container, max_jobs=1, history_size=10)
+        yield job_runner
+        await job_runner.close()
+
+    @provide(scope=Scope.REQUEST)
+    def get_parse_from_tar(self) -> ParsePostsFromTarAndSendToSites:
+        return self._usecase
+
+    @provide(scope=Scope.REQUEST)
+    def get_parse_from_zip(self) -> ParsePostsFromZIPAndSendToSites:
+        return self._usecase
+
+
+@pytest.fixture
+def usecase() -> FakeParseAndSend:
+    return FakeParseAndSend()
+
+
+@pytest.fixture
+async def client(usecase) -> AsyncIterable[httpx.AsyncClient]:
+    container = make_async_container(JobsProvider(usecase))
+    app = FastAPI()
+    app.include_router(router=posts_router)
+    init_exc_handlers(app)
+    setup_dishka(container, app)
+    app.dependency_overrides[get_user] = lambda: User(username="admin", hash_password="", is_superuser=True)
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+    await container.close()
+
+
+def make_tar() -> bytes:
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as tar:
+        tar.add(HTML_FILE, arcname=f"posts/{HTML_FILE.name}")
+
+    return buffer.getvalue()
+
+
+def make_zip() -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zip_file:
+        zip_file.write(HTML_FILE, arcname=f"posts/{HTML_FILE.name}")
+
+    return buffer.getvalue()
+
+
+async def wait_status(client: httpx.AsyncClient, id: str, status: str) -> dict:
+    while True:
+        response = await client.get(f"/posts/jobs/{id}")
+        assert response.status_code == 200
+        job = response.json()
+        if job["status"] == status:
+            return job
+        await asyncio.sleep(0.01)
+
+
+async def test_parse_job_runs_tar_upload_and_closes_it(client, usecase):
+    response = await client.post("/posts/parse", files={"file": ("posts.tar.gz", make_tar())})
+
+    assert response.status_code == 202
+    job = response.json()
+    assert job["status"] == "queued"
+
+    await asyncio.wait_for(usecase.started.wait(), timeout=5)
+    running = await asyncio.wait_for(wait_status(client, job["id"], "running"), timeout=5)
+    assert running["progress"]["discovered"] == 1
+
+    usecase.release.set()
+    finished = await asyncio.wait_for(wait_status(client, job["id"], "finished"), timeout=5)
+
+    assert finished["progress"] == {"discovered": 1, "parsed": 1, "inserted": 1, "skipped": 0, "invalid": 0, "sent": 1}
+    assert finished["error"] is None
+    assert usecase.archive.closed
+
+
+async def test_parse_job_records_error_and_deletes_zip_copy(client, usecase):
+    usecase.error = RuntimeError("database is gone")
+    usecase.release.set()
+
+    response = await client.post("/posts/parse", files={"file": ("posts.zip", make_zip())})
+    assert response.status_code == 202
+
+    failed = await asyncio.wait_for(wait_status(client, response.json()["id"], "failed"), timeout=5)
+
+    assert failed["error"] == "database is gone"
+    assert not os.path.exists(usecase.archive.filename)
+
+
+async def test_parse_rejects_unknown_archive_format(client):
+    response = await client.post("/posts/parse", files={"file": ("posts.html", b"<html></html>")})
+
+    assert response.status_code == 400
+
+
+async def test_parse_job_unknown_id_returns_404(client):
+    response = await client.get("/posts/jobs/unknown")
+
+    assert response.status_code == 404
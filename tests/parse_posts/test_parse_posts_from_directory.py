@@ -1,7 +1,15 @@
+import asyncio
+import hashlib
+import os
+import shutil
+import threading
+from pathlib import Path
+
 import pytest
 from parse_posts.fixtures import *  # type: ignore
 
-from posts.dto.parse_posts import ParseUsecaseResponse
+from posts.dto.parse_posts import ParseUsecaseResponse, SourceFileDTO
+from posts.persistence.models import PostOrm
 
 
 @pytest.mark.parametrize(
@@ -17,3 +25,222 @@ async def test_parse_posts_from_directory(parse_posts_from_directory, path, expe
     response = await parse_posts_from_directory()
 
     assert response == expected_result
+
+
+async def test_parse_posts_from_directory_publishes_committed_post_ids(parse_posts_from_directory, parse_config):
+    parse_config.BATCH_SIZE = 1
+    parse_config.DATA_DIR = "data/articles_with_repeats"
+    committed: list[list[int]] = []
+
+    async def committed_callback(post_ids: list[int]) -> None:
+        committed.append(post_ids)
+
+    parse_posts_from_directory.bind_committed_callback(committed_callback)
+    await parse_posts_from_directory()
+
+    assert len(committed) == 3
+    assert sorted(post_id for post_ids in committed for post_id in post_ids) == [48, 2356, 4162]
+
+
+@pytest.mark.parametrize("preload_post_ids", [True, False])
+async def test_parse_posts_from_directory_skips_known_posts(parse_posts_from_directory, db, preload_post_ids):
+    parse_posts_from_directory._config.PRELOAD_POST_IDS = preload_post_ids
+    db.add_all([PostOrm(id=48, title="48"), PostOrm(id=4162, title="4162")])
+    await db.commit()
+
+    parse_posts_from_directory._config.DATA_DIR = "data/articles_with_repeats"
+    response = await parse_posts_from_directory()
+
+    assert response == ParseUsecaseResponse(skipped=3, inserted=1, invalid=0)
+
+
+async def test_parse_posts_from_directory_records_run_manifest(parse_posts_from_directory, parse_run_data_mapper, db):
+    parse_posts_from_directory._config.DATA_DIR = "data/articles_with_invalid"
+    await parse_posts_from_directory()
+
+    run = await parse_run_data_mapper.get(1)
+    assert run.status == "finished"
+    assert (run.inserted, run.invalid) == (2, 1)
+    assert await parse_run_data_mapper.processed_files(run.id) == {
+        "2014-06-48-.html",
+        "2014-12-2356-.html",
+        "50-.html",
+    }
+
+
+async def test_parse_posts_from_directory_resumes_run(parse_posts_from_directory, parse_run_data_mapper, db):
+    parse_posts_from_directory._config.DATA_DIR = "data/articles"
+    run_id = await parse_run_data_mapper.create(source=os.path.abspath("data/articles"))
+    await parse_run_data_mapper.add_files(run_id, ["2014-06-48-.html"])
+    await db.commit()
+
+    response = await parse_posts_from_directory(run_id=run_id)
+
+    assert response == ParseUsecaseResponse(skipped=0, inserted=2, invalid=0)
+    assert await db.get(PostOrm, 48) is None
+    assert len(await parse_run_data_mapper.processed_files(run_id)) == 3
+
+
+async def test_parse_posts_from_directory_skips_unchanged_files(
+    parse_posts_from_directory, source_file_data_mapper, db, tmp_path
+):
+    for file_path in Path("data/articles").glob("*.html"):
+        shutil.copy(file_path, tmp_path / file_path.name)
+    unchanged, touched, new = (
+        str(tmp_path / name) for name in ("2014-06-48-.html", "2014-12-2356-.html", "2015-01-4162-.html")
+    )
+    touched_hash = hashlib.blake2b(Path(touched).read_bytes(), digest_size=16).hexdigest()
+    await source_file_data_mapper.upsert(
+        [
+            SourceFileDTO(
+                name="", path=unchanged, mtime_ns=os.stat(unchanged).st_mtime_ns, size=os.stat(unchanged).st_size
+            ),
+            SourceFileDTO(name="", path=touched, mtime_ns=1, size=os.stat(touched).st_size, hash=touched_hash),
+        ]
+    )
+    await db.commit()
+
+    parse_posts_from_directory._config.DATA_DIR = str(tmp_path)
+    response = await parse_posts_from_directory()
+
+    assert response == ParseUsecaseResponse(skipped=0, inserted=1, invalid=0)
+    assert await db.get(PostOrm, 4162) is not None
+    manifest = await source_file_data_mapper.manifest(prefix=str(tmp_path) + os.sep)
+    assert set(manifest) == {unchanged, touched, new}
+    assert manifest[touched].mtime_ns == os.stat(touched).st_mtime_ns
+    # новый файл читает ParserWorker, и хеш считается там
+    assert manifest[new].hash == hashlib.blake2b(Path(new).read_bytes(), digest_size=16).hexdigest()
+
+
+async def test_parse_posts_from_directory_keeps_unreadable_file_out_of_manifests(
+    parse_posts_from_directory, parse_run_data_mapper, source_file_data_mapper, tmp_path, monkeypatch
+):
+    for file_path in Path("data/articles").glob("*.html"):
+        shutil.copy(file_path, tmp_path / file_path.name)
+    unreadable = tmp_path / "2014-06-48-.html"
+    path_open = Path.open
+
+    def failing_open(self, *args, **kwargs):
+        if self == unreadable:
+            raise PermissionError(13, "Permission denied", str(self))
+        return path_open(self, *args, **kwargs)
+
+    monkeypatch.setattr(Path, "open", failing_open)
+    parse_posts_from_directory._config.DATA_DIR = str(tmp_path)
+    response = await parse_posts_from_directory()
+
+    assert response == ParseUsecaseResponse(skipped=0, inserted=2, invalid=1)
+    assert await parse_run_data_mapper.processed_files(1) == {"2014-12-2356-.html", "2015-01-4162-.html"}
+    manifest = await source_file_data_mapper.manifest(prefix=str(tmp_path) + os.sep)
+    assert str(unreadable) not in manifest
+    assert len(manifest) == 2
+
+
+async def test_parse_posts_from_directory_watch_ingests_new_files(parse_posts_from_directory, tmp_path):
+    parse_posts_from_directory._config.DATA_DIR = str(tmp_path)
+    parse_posts_from_directory._config.WATCH_INTERVAL = 0.05
+    parse_posts_from_directory._config.BATCH_MAX_WAIT = 10
+    files = sorted(Path("data/articles").glob("*.html"))
+    shutil.copy2(files[0], tmp_path / files[0].name)
+
+    async def wait_inserted(count: int) -> None:
+        while parse_posts_from_directory.inserted < count:
+            await asyncio.sleep(0.01)
+
+    stop = asyncio.Event()
+    watch = asyncio.create_task(parse_posts_from_directory.watch(stop))
+    await asyncio.wait_for(wait_inserted(1), timeout=5)
+
+    shutil.copy2(files[1], tmp_path / files[1].name)
+    await asyncio.wait_for(wait_inserted(2), timeout=5)
+
+    stop.set()
+    response = await asyncio.wait_for(watch, timeout=5)
+
+    assert response == ParseUsecaseResponse(skipped=0, inserted=2, invalid=0)
+
+
+async def test_parse_posts_from_directory_fails_run_when_db_writer_dies(
+    parse_posts_from_directory, parse_run_data_mapper, parse_config, db_worker, db
+):
+    parse_config.BATCH_SIZE = 1
+    parse_config.DATA_DIR = "data/articles_with_repeats"
+
+    async def failing_flush(*args, **kwargs):
+        raise RuntimeError("database is gone")
+
+    db_worker._flush = failing_flush
+
+    with pytest.raises(RuntimeError, match="database is gone"):
+        await asyncio.wait_for(parse_posts_from_directory(), timeout=10)
+
+    db.expire_all()
+    run = await parse_run_data_mapper.get(1)
+    assert run.status == "failed"
+
+
+async def test_parse_posts_from_directory_shuts_executor_down_on_unknown_run(parse_posts_from_directory):
+    parse_posts_from_directory._config.DATA_DIR = "data/articles"
+
+    with pytest.raises(ValueError, match="parse run 999 not found"):
+        await parse_posts_from_directory(run_id=999)
+
+    assert parse_posts_from_directory._executor._shutdown
+
+
+async def test_directory_discoverer_watch_records_files_in_manifest_after_commit(directory_discoverer, tmp_path):
+    directory_discoverer._config.DATA_DIR = str(tmp_path)
+    source = sorted(Path("data/articles").glob("*.html"))[0]
+    shutil.copy2(source, tmp_path / source.name)
+    file_q: asyncio.Queue = asyncio.Queue()
+    manifest: dict[str, SourceFileDTO] = {}
+    directory_discoverer.bind_file_q(file_q)
+    directory_discoverer.bind_source_files(manifest)
+
+    stop = asyncio.Event()
+    polls = 0
+
+    async def after_poll() -> None:
+        nonlocal polls
+        polls += 1
+        if polls == 2:
+            stop.set()
+
+    await asyncio.wait_for(directory_discoverer.watch(0.01, stop, after_poll=after_poll), timeout=5)
+
+    queued = list(iter(file_q.get_nowait, None))
+    assert [discovered.file.name for discovered in queued] == [source.name]
+    assert manifest == {}
+
+    await directory_discoverer.files_committed([queued[0].file])
+
+    assert set(manifest) == {str(tmp_path / source.name)}
+
+
+async def test_directory_discoverer_walks_directory_in_batches_off_event_loop(
+    directory_discoverer, tmp_path, monkeypatch
+):
+    directory_discoverer._config.DATA_DIR = str(tmp_path)
+    source = sorted(Path("data/articles").glob("*.html"))[0]
+    for i in range(5):
+        (tmp_path / str(i)).mkdir()
+        shutil.copy2(source, tmp_path / str(i) / source.name)
+    file_q: asyncio.Queue = asyncio.Queue()
+    directory_discoverer.bind_file_q(file_q)
+    monkeypatch.setattr(directory_discoverer, "SCAN_BATCH", 2)
+
+    loop_thread = threading.get_ident()
+    scan_threads = set()
+    scan = directory_discoverer._scan
+
+    def tracked_scan(entries):
+        scan_threads.add(threading.get_ident())
+        return scan(entries)
+
+    monkeypatch.setattr(directory_discoverer, "_scan", tracked_scan)
+
+    await directory_discoverer.discover()
+
+    queued = list(iter(file_q.get_nowait, None))
+    assert sorted(discovered.file.name for discovered in queued) == [f"{i}/{source.name}" for i in range(5)]
+    assert scan_threads and loop_thread not in scan_threads
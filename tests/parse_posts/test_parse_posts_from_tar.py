@@ -0,0 +1,99 @@
+import importlib.util
+import tarfile
+import tempfile
+from pathlib import Path
+
+import pytest
+from parse_posts.fixtures import *  # type: ignore
+
+from posts.dto.parse_posts import ParseUsecaseResponse
+from posts.exceptions import UnsupportedArchiveError
+from posts.persistence.models import PostOrm
+from posts.usecases.posts.parsing.file_discoverers.archive_format import (
+    ZSTD_MAGIC,
+    detect_archive_file_format,
+    detect_archive_format,
+)
+
+
+def make_tar(tmp_path: Path, data_dir: str, mode: str) -> str:
+    path = tmp_path / "posts.tar"
+    with tarfile.open(path, mode) as tar:
+        for file_path in (Path(__file__).parent.parent / "data" / data_dir).glob("*.html"):
+            tar.add(file_path, arcname=f"posts/{file_path.name}")
+
+    return str(path)
+
+
+@pytest.mark.parametrize(
+    "data_dir, mode, expected_result",
+    [
+        ("articles", "w:gz", ParseUsecaseResponse(skipped=0, inserted=3, invalid=0)),
+        ("articles_with_repeats", "w", ParseUsecaseResponse(skipped=1, inserted=3, invalid=0)),
+        ("articles_with_invalid", "w:xz", ParseUsecaseResponse(skipped=0, inserted=2, invalid=1)),
+    ],
+)
+async def test_parse_posts_from_tar(parse_posts_from_tar, tmp_path, data_dir, mode, expected_result):
+    path = make_tar(tmp_path, data_dir, mode)
+
+    assert detect_archive_file_format(path) == "tar"
+    response = await parse_posts_from_tar(path)
+
+    assert response == expected_result
+    progress = parse_posts_from_tar.progress
+    assert (progress.inserted, progress.skipped, progress.invalid) == (
+        expected_result.inserted,
+        expected_result.skipped,
+        expected_result.invalid,
+    )
+    assert progress.parsed == progress.discovered
+
+
+async def test_parse_posts_from_tar_reads_open_upload(parse_posts_from_tar, tmp_path):
+    path = make_tar(tmp_path, "articles", "w:gz")
+    with open(path, "rb") as f, tempfile.SpooledTemporaryFile(max_size=1024) as upload:
+        upload.write(f.read())
+        upload.seek(0)
+
+        assert detect_archive_file_format(upload) == "tar"
+        response = await parse_posts_from_tar(upload)
+
+        assert not upload.closed
+
+    assert response == ParseUsecaseResponse(skipped=0, inserted=3, invalid=0)
+
+
+def test_detect_archive_file_format_rejects_unknown_files(tmp_path):
+    path = tmp_path / "posts.html"
+    path.write_text("<html></html>")
+
+    with pytest.raises(UnsupportedArchiveError):
+        detect_archive_file_format(str(path))
+
+
+def test_detect_archive_format_rejects_zstd_without_zstandard(monkeypatch):
+    monkeypatch.setattr(importlib.util, "find_spec", lambda name: None)
+
+    with pytest.raises(UnsupportedArchiveError, match="zstandard"):
+        detect_archive_format(ZSTD_MAGIC + b"\x00" * 60)
+
+
+async def test_parse_posts_from_tar_skips_known_files_without_extracting(
+    parse_posts_from_tar, db, tmp_path, monkeypatch
+):
+    db.add_all([PostOrm(id=48, title="48"), PostOrm(id=4162, title="4162")])
+    await db.commit()
+    path = make_tar(tmp_path, "articles_with_repeats", "w:gz")
+
+    extracted: list[str] = []
+    extractfile = tarfile.TarFile.extractfile
+
+    def recording_extractfile(self, member):
+        extracted.append(member.name.rsplit("/", 1)[-1])
+        return extractfile(self, member)
+
+    monkeypatch.setattr(tarfile.TarFile, "extractfile", recording_extractfile)
+    response = await parse_posts_from_tar(path)
+
+    assert response == ParseUsecaseResponse(skipped=3, inserted=1, invalid=0)
+    assert not [name for name in extracted if name.startswith(("2014-06-48-", "2015-01-4162-"))]
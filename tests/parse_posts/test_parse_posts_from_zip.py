@@ -58,3 +58,18 @@ async def test_parse_posts_from_zip(parse_posts_from_zip, zip_data, expected_res
     response = await parse_posts_from_zip(zip_data)
 
     assert response == expected_result
+
+
+async def test_parse_posts_from_zip_file_reads_members_in_threads(parse_posts_from_zip, zip_discoverer, tmp_path):
+    zip_discoverer._n_readers = 2
+    zip_discoverer._chunk_size = 1
+    zip_path = tmp_path / "posts.zip"
+    with ZipFile(zip_path, "w") as zip_file:
+        for file_path in (Path(__file__).parent.parent / "data" / "articles").glob("*.html"):
+            # невалидный UTF-8 не ломает декодирование
+            zip_file.writestr(file_path.name, file_path.read_bytes() + b"\xff")
+
+    with ZipFile(zip_path) as zip_file:
+        response = await parse_posts_from_zip(zip_file)
+
+    assert response == ParseUsecaseResponse(skipped=0, inserted=3, invalid=0)
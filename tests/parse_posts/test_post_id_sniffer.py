@@ -0,0 +1,34 @@
+from pathlib import Path
+
+import pytest
+
+from posts.usecases.posts.parsing.html_parser import parse_html
+from posts.usecases.posts.parsing.post_id_sniffer import (
+    sniff_post_id_from_filename,
+    sniff_post_id_from_html,
+)
+
+HTML_FILES = sorted((Path(__file__).parent.parent / "data").rglob("*.html"))
+
+
+@pytest.mark.parametrize(
+    "filename, expected_id",
+    [
+        ("2015-01-4162-.html", 4162),
+        ("articles/2014-06-48-rabinovich.html", 48),
+        ("2015-01-4162_repeat.html", None),
+        ("50-.html", None),
+        ("0.html", None),
+    ],
+)
+def test_sniff_post_id_from_filename(filename: str, expected_id: int | None):
+    assert sniff_post_id_from_filename(filename) == expected_id
+
+
+@pytest.mark.parametrize("path", HTML_FILES, ids=lambda path: f"{path.parent.name}/{path.name}")
+def test_sniff_post_id_from_html_matches_parser(path: Path):
+    html = path.read_bytes()
+    parsed = parse_html(html.decode("utf-8", errors="ignore"))
+
+    expected_id = parsed.data.id if parsed.success else parsed.data
+    assert sniff_post_id_from_html(html) == expected_id
@@ -0,0 +1,44 @@
+import pytest
+
+from posts.usecases.posts.parsing.post_ids_index import PostIdsIndex
+
+
+async def id_chunks(*chunks: list[int]):
+    for chunk in chunks:
+        yield chunk
+
+
+async def test_post_ids_index_contains_loaded_and_added_ids():
+    post_ids = PostIdsIndex()
+    await post_ids.load(id_chunks([1, 5, 7], [10, 42]))
+    post_ids.add(100)
+    post_ids.add(5)
+
+    assert [post_id in post_ids for post_id in (0, 1, 5, 6, 42, 43, 100)] == [
+        False,
+        True,
+        True,
+        False,
+        True,
+        False,
+        True,
+    ]
+    assert len(post_ids) == 6
+    assert post_ids.nbytes == 5 * 8
+
+
+async def test_post_ids_index_rejects_unsorted_chunks():
+    with pytest.raises(ValueError):
+        await PostIdsIndex().load(id_chunks([1, 5], [3]))
+
+
+async def test_post_ids_index_merges_added_ids_into_array():
+    post_ids = PostIdsIndex.from_ids([2, 4])
+    added = range(1, 2 * PostIdsIndex.MERGE_MIN, 2)
+    for post_id in added:
+        post_ids.add(post_id)
+
+    assert all(post_id in post_ids for post_id in (2, 4, *added))
+    assert 6 not in post_ids
+    assert len(post_ids) == 2 + len(added)
+    assert post_ids.nbytes == (2 + len(added)) * 8
@@ -0,0 +1,44 @@
+import asyncio
+
+from posts.services.wordpress_service.adaptive_limiter import AdaptiveLimiter
+
+
+async def test_adaptive_limiter_ramps_up_on_fast_responses():
+    limiter = AdaptiveLimiter(name="site", floor=1, ceiling=4, target_latency=1.0)
+
+    for _ in range(20):
+        await limiter.record(200, latency=0.01)
+
+    assert limiter.window == 4
+
+
+async def test_adaptive_limiter_backs_off_on_overload_once_per_cooldown():
+    limiter = AdaptiveLimiter(name="site", floor=2, ceiling=16, target_latency=1.0, cooldown=60)
+    limiter._window = 16.0
+
+    await limiter.record(429, latency=0.01)
+    await limiter.record(503, latency=0.01)
+    assert limiter.window == 8
+
+    limiter._last_decrease = 0.0
+    await limiter.record(200, latency=2.0)
+    assert limiter.window == 4
+
+
+async def test_adaptive_limiter_limits_concurrent_requests():
+    limiter = AdaptiveLimiter(name="site", floor=2, ceiling=2, target_latency=1.0)
+    running = 0
+    peak = 0
+
+    async def request():
+        nonlocal running, peak
+        async with limiter:
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+    await asyncio.gather(*(request() for _ in range(10)))
+
+    assert peak == 2
+    assert limiter.in_flight == 0
@@ -0,0 +1,93 @@
+import httpx
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from posts.dto.post import Tag
+from posts.dto.site import Site
+from posts.persistence.models import SiteOrm, SiteTagOrm
+from posts.services.wordpress_service.clients import WordpressClients
+from posts.services.wordpress_service.config import WordpressClientsConfig
+from posts.services.wordpress_service.fetch_tags import FetchWordpressTags
+from posts.services.wordpress_service.retry import RetryPolicy
+from posts.services.wordpress_service.service import WordpressService
+
+SITE = Site(id=1, username="user", password="password", address="http://wordpress.test")
+
+
+async def test_fetch_tags_syncs_mirror_fully_then_incrementally(db, engine):
+    db.add(SiteOrm(id=SITE.id, username=SITE.username, password=SITE.password, address=SITE.address))
+    await db.commit()
+
+    site_tags = [{"id": id, "name": f"tag {id}", "slug": f"tag-{id}"} for id in range(1, 251)]
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        per_page, page = int(request.url.params["per_page"]), int(request.url.params["page"])
+        tags = site_tags if request.url.params["order"] == "asc" else site_tags[::-1]
+        total_pages = (len(tags) + per_page - 1) // per_page
+        if page > total_pages:
+            return httpx.Response(400, json={"code": "rest_post_invalid_page_number"})
+        return httpx.Response(
+            200, json=tags[(page - 1) * per_page : page * per_page], headers={"X-WP-TotalPages": str(total_pages)}
+        )
+
+    config = WordpressClientsConfig()
+    clients = WordpressClients(config, transport=httpx.MockTransport(handler))
+    wordpress_service = WordpressService(
+        clients=clients, retry_policy=RetryPolicy(attempts=1, base_delay=0, max_delay=0)
+    )
+    session_maker = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+    fetch_wordpress_tags = FetchWordpressTags(wordpress_service, session_maker=session_maker, config=config)
+
+    catalog = (await fetch_wordpress_tags([SITE]))[SITE.address]
+    assert len(catalog) == 250
+    assert len(requests) == 3
+
+    site_tags.append({"id": 251, "name": "tag 251", "slug": "tag-251"})
+    requests.clear()
+    catalog = (await fetch_wordpress_tags([SITE]))[SITE.address]
+    await clients.aclose()
+
+    assert len(requests) == 1
+    assert len(catalog) == 251
+    assert catalog.ids([Tag(id=0, name="tag 251", slug="tag-251")]) == [251]
+    async with session_maker() as session:
+        assert await session.scalar(select(func.count()).select_from(SiteTagOrm)) == 251
+
+
+async def test_fetch_tags_keeps_mirror_when_full_sync_page_fails(db, engine):
+    db.add(SiteOrm(id=SITE.id, username=SITE.username, password=SITE.password, address=SITE.address))
+    await db.commit()
+
+    site_tags = [{"id": id, "name": f"tag {id}", "slug": f"tag-{id}"} for id in range(1, 251)]
+    failing_page: int | None = None
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        page = int(request.url.params["page"])
+        if page == failing_page:
+            return httpx.Response(500, json={"code": "internal_server_error"})
+        if page > 3:
+            return httpx.Response(400, json={"code": "rest_post_invalid_page_number"})
+        return httpx.Response(200, json=site_tags[(page - 1) * 100 : page * 100], headers={"X-WP-TotalPages": "3"})
+
+    config = WordpressClientsConfig(WORDPRESS_TAGS_FULL_SYNC_INTERVAL=0)
+    clients = WordpressClients(config, transport=httpx.MockTransport(handler))
+    wordpress_service = WordpressService(
+        clients=clients, retry_policy=RetryPolicy(attempts=1, base_delay=0, max_delay=0)
+    )
+    session_maker = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+    fetch_wordpress_tags = FetchWordpressTags(wordpress_service, session_maker=session_maker, config=config)
+
+    assert len((await fetch_wordpress_tags([SITE]))[SITE.address]) == 250
+    async with session_maker() as session:
+        synced_at = await session.scalar(select(SiteOrm.tags_synced_at))
+
+    failing_page = 2
+    catalog = (await fetch_wordpress_tags([SITE]))[SITE.address]
+    await clients.aclose()
+
+    assert len(catalog) == 250
+    async with session_maker() as session:
+        assert await session.scalar(select(func.count()).select_from(SiteTagOrm)) == 250
+        assert await session.scalar(select(SiteOrm.tags_synced_at)) == synced_at
@@ -0,0 +1,20 @@
+import os
+
+from posts.services.images_loader.config import PostsImagsLoaderConfig
+from posts.services.images_loader.images_loader import PostImagesLoader
+
+
+async def test_images_loader_finds_images_by_post_id(tmp_path):
+    for post_id in (1, 2):
+        (tmp_path / f"{post_id}.jpg").write_bytes(b"image")
+    (tmp_path / "readme.txt").write_text("not an image")
+    images_loader = PostImagesLoader(PostsImagsLoaderConfig(POST_IMAGES_DIR=str(tmp_path), POST_IMAGES_INDEX_TTL=60))
+
+    assert await images_loader.path(1) == os.path.join(tmp_path, "1.jpg")
+    assert await images_loader.path(3) is None
+
+    # промах не перечитывает директорию чаще раза в POST_IMAGES_INDEX_TTL
+    (tmp_path / "3.png").write_bytes(b"image")
+    assert await images_loader.path(3) is None
+    images_loader._indexed_at = None
+    assert await images_loader.path(3) == os.path.join(tmp_path, "3.png")
@@ -0,0 +1,132 @@
+import json
+from datetime import date
+
+import httpx
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from posts.dto.post import PostWithTags, Tag
+from posts.dto.site import Site
+from posts.persistence.data_mappers.error_log_data_mapper import ErrorLogDataMapper
+from posts.persistence.models import PostOrm, SiteOrm, SitePostOrm
+from posts.services.images_loader.config import PostsImagsLoaderConfig
+from posts.services.images_loader.images_loader import PostImagesLoader
+from posts.services.logger import DbLogger
+from posts.services.posts_sender.config import PostsSenderConfig
+from posts.services.posts_sender.posts_sender import PostsSender
+from posts.services.posts_sender.send_single_post import SendSinglePostToSite
+from posts.services.wordpress_service.clients import WordpressClients
+from posts.services.wordpress_service.config import WordpressClientsConfig
+from posts.services.wordpress_service.retry import RetryPolicy
+from posts.services.wordpress_service.service import WordpressService
+from posts.services.wordpress_service.tag_catalog import TagCatalog
+from posts.usecases.posts.send_to_site.adapter import WordpressPostAdapter
+
+SITE = Site(id=1, username="user", password="password", address="http://wordpress.test", max_connections_limit=3)
+FAILED_POST_ID = 3
+
+
+def make_post(id: int, tags: list[Tag]) -> PostWithTags:
+    return PostWithTags(
+        id=id,
+        title=f"post {id}",
+        description="description",
+        published=date(2015, 1, 1),
+        h1=f"post {id}",
+        image="",
+        content="content",
+        content2="",
+        slug=f"post-{id}",
+        active=True,
+        tags=tags,
+    )
+
+
+def images_config(images_dir) -> PostsImagsLoaderConfig:
+    return PostsImagsLoaderConfig(POST_IMAGES_DIR=str(images_dir))
+
+
+def make_posts_sender(db, engine, images_loader, handler) -> tuple[PostsSender, WordpressClients]:
+    session_maker = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+    clients = WordpressClients(WordpressClientsConfig(), transport=httpx.MockTransport(handler))
+    wordpress_service = WordpressService(
+        clients=clients, retry_policy=RetryPolicy(attempts=1, base_delay=0, max_delay=0)
+    )
+    logger = DbLogger(error_log_data_mapper=ErrorLogDataMapper(db), session_maker=session_maker)
+    posts_sender = PostsSender(
+        images_loader=images_loader,
+        send_single_post=SendSinglePostToSite(wordpress_service, adapter=WordpressPostAdapter(), logger=logger),
+        logger=logger,
+        wordpress_service=wordpress_service,
+        session_maker=session_maker,
+        config=PostsSenderConfig(SENDER_COMMIT_BATCH_SIZE=2),
+    )
+
+    return posts_sender, clients
+
+
+async def test_posts_sender_pipeline_creates_tags_once_and_commits_sended(db, engine, tmp_path):
+    posts = [make_post(id, tags=[Tag(id=1, name="tag", slug="tag")]) for id in range(1, 7)]
+    db.add(SiteOrm(id=SITE.id, username=SITE.username, password=SITE.password, address=SITE.address))
+    db.add_all(PostOrm(id=post.id, title=post.title, active=True) for post in posts)
+    db.add_all(SitePostOrm(site_id=SITE.id, post_id=post.id) for post in posts)
+    await db.commit()
+    for post_id in (1, 2, FAILED_POST_ID):
+        (tmp_path / f"{post_id}.jpg").write_bytes(b"image")
+
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.url.path.endswith("/tags"):
+            return httpx.Response(201, json={"id": 10, "slug": "tag", "name": "tag"})
+        if request.url.path.endswith("/media"):
+            return httpx.Response(201, json={"id": 20})
+        if json.loads(request.content)["title"] == f"post {FAILED_POST_ID}":
+            return httpx.Response(400, json={"code": "rest_invalid_param"})
+        return httpx.Response(201, json={"id": 30})
+
+    posts_sender, clients = make_posts_sender(db, engine, PostImagesLoader(images_config(tmp_path)), handler)
+    session_maker = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+
+    wordpress_tags = TagCatalog()
+    response = await posts_sender(SITE, posts, wordpress_tags=wordpress_tags, access_token="token")
+    await clients.aclose()
+
+    paths = [request.url.path for request in requests]
+    assert paths.count("/wp-json/wp/v2/tags") == 1
+    assert paths.count("/wp-json/wp/v2/media") == 3
+    assert wordpress_tags.ids(posts[0].tags) == [10]
+    assert sorted(response.success_sended_posts_ids) == [1, 2, 4, 5, 6]
+    assert response.error_sended_posts_ids == [FAILED_POST_ID]
+    assert posts_sender.sent == 5
+
+    async with session_maker() as session:
+        sended = await session.execute(select(SitePostOrm.post_id).where(SitePostOrm.sended.is_(True)))
+        assert sorted(sended.scalars().all()) == [1, 2, 4, 5, 6]
+
+
+async def test_posts_sender_sends_post_without_image_deleted_after_indexing(db, engine, tmp_path):
+    post = make_post(1, tags=[])
+    db.add(SiteOrm(id=SITE.id, username=SITE.username, password=SITE.password, address=SITE.address))
+    db.add(PostOrm(id=post.id, title=post.title, active=True))
+    db.add(SitePostOrm(site_id=SITE.id, post_id=post.id))
+    await db.commit()
+    (tmp_path / "1.jpg").write_bytes(b"image")
+    images_loader = PostImagesLoader(images_config(tmp_path))
+    assert await images_loader.path(1) is not None
+    (tmp_path / "1.jpg").unlink()
+
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(201, json={"id": 30})
+
+    posts_sender, clients = make_posts_sender(db, engine, images_loader, handler)
+    response = await posts_sender(SITE, [post], wordpress_tags=TagCatalog(), access_token="token")
+    await clients.aclose()
+
+    assert response.success_sended_posts_ids == [1]
+    assert [request.url.path for request in requests] == ["/wp-json/wp/v2/posts"]
+    assert await images_loader.path(1) is None
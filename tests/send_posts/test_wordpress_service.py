@@ -0,0 +1,109 @@
+import httpx
+import pytest
+
+from posts.dto.site import Site
+from posts.dto.wordpress_post import WordpressPostDTO
+from posts.services.wordpress_service.clients import WordpressClients
+from posts.services.wordpress_service.config import WordpressClientsConfig
+from posts.services.wordpress_service.retry import RetryPolicy
+from posts.services.wordpress_service.service import WordpressService
+
+SITE = Site(id=1, username="user", password="password", address="http://wordpress.test")
+
+
+def make_service(handler) -> tuple[WordpressService, WordpressClients]:
+    config = WordpressClientsConfig(WORDPRESS_BREAKER_THRESHOLD=2, WORDPRESS_BREAKER_RESET_TIMEOUT=60)
+    clients = WordpressClients(config, transport=httpx.MockTransport(handler))
+    retry_policy = RetryPolicy(attempts=3, base_delay=0, max_delay=0)
+    return WordpressService(clients=clients, retry_policy=retry_policy), clients
+
+
+def make_post() -> WordpressPostDTO:
+    return WordpressPostDTO(
+        title="post",
+        content="content",
+        description="description",
+        featured_media=None,
+        image_name="1.jpg",
+        tags=[],
+        date="2015-01-01T00:00:00",
+        h1="post",
+        slug="1-post",
+        meta={},
+    )
+
+
+@pytest.mark.parametrize("already_created, expected_posts", [(False, 2), (True, 1)])
+async def test_send_post_retries_bad_gateway_unless_post_was_created(already_created, expected_posts):
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.method == "GET":
+            return httpx.Response(200, json=[{"id": 1}] if already_created else [])
+        if len([r for r in requests if r.method == "POST"]) == 1:
+            return httpx.Response(502, json={})
+        return httpx.Response(201, json={"id": 1})
+
+    wordpress_service, clients = make_service(handler)
+    result = await wordpress_service.send_post(SITE, make_post(), access_token="token")
+    await clients.aclose()
+
+    assert result.success
+    assert len([request for request in requests if request.method == "POST"]) == expected_posts
+
+
+async def test_circuit_breaker_fast_fails_down_site():
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        raise httpx.ConnectError("connection refused", request=request)
+
+    wordpress_service, clients = make_service(handler)
+    for _ in range(2):
+        result = await wordpress_service.send_post(SITE, make_post(), access_token="token")
+        assert not result.success
+    assert len(requests) == 6
+    assert clients.breaker(SITE).state == "open"
+
+    result = await wordpress_service.send_post(SITE, make_post(), access_token="token")
+    await clients.aclose()
+
+    assert not result.success
+    assert "недоступен" in result.error_message
+    assert len(requests) == 6
+
+
+async def test_send_post_image_streams_file_again_on_retry(tmp_path):
+    path = tmp_path / "1.jpg"
+    path.write_bytes(b"image" * 100_000)
+    bodies: list[bytes] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        bodies.append(request.read())
+        return httpx.Response(503 if len(bodies) == 1 else 201, json={"id": 1})
+
+    wordpress_service, clients = make_service(handler)
+    with open(path, "rb") as image:
+        result = await wordpress_service.send_post_image(SITE, "1.jpg", image, access_token="token")
+    await clients.aclose()
+
+    assert result.success
+    assert len(bodies) == 2
+    assert all(b"image" * 100_000 in body for body in bodies)
+
+
+async def test_transport_errors_shrink_concurrency_window():
+    def handler(request: httpx.Request) -> httpx.Response:
+        raise httpx.ReadTimeout("timed out", request=request)
+
+    wordpress_service, clients = make_service(handler)
+    limiter = clients.limiter(SITE)
+    limiter._window = 4.0
+
+    result = await wordpress_service.send_post(SITE, make_post(), access_token="token")
+    await clients.aclose()
+
+    assert not result.success
+    assert limiter.window == 2